@@ -1,6 +1,56 @@
-from flask_restplus import Api as App_wrapper
-from kubernetes import config
+from flask import current_app, g, make_response, request
+from flask_restplus import Api as App_wrapper, marshal
+from flask_restplus.utils import merge, unpack
+from functools import wraps
+from http import HTTPStatus
+from common.compact_codec import CompactCodec
+from common.compression import COMPRESSIBLE_MIMETYPES, compress, get_supported_encodings
+from common.json_codec import JsonCodec
+from common.metrics import Metrics
+from common.model_compiler import compile_model
+from common.swagger_spec import SwaggerSpec
 import os
+import socket
+import threading
+import time
+
+
+class InstrumentedApi(App_wrapper):
+    def marshal_with(self, fields, as_list=False, code=HTTPStatus.OK, description=None, **kwargs):
+        """
+        FlaskRestPlus marshal_with decorator which marshals responses with model compiled into projection
+        function and records DTO marshaling time. Requests with X-Fields mask header are marshaled
+        by FlaskRestPlus.
+        """
+        # Model is compiled on first response, so app startup does not pay for models of unused routes.
+        project = None
+        model_name = getattr(fields, 'name', 'unknown')
+
+        def wrapper(func):
+            doc = {
+                'responses': {code: (description, [fields]) if as_list else (description, fields)},
+                '__mask__': kwargs.get('mask', True)
+            }
+            func.__apidoc__ = merge(getattr(func, '__apidoc__', {}), doc)
+
+            @wraps(func)
+            def view(*view_args, **view_kwargs):
+                nonlocal project
+                data, status, headers = unpack(func(*view_args, **view_kwargs))
+                start = time.perf_counter()
+                mask = request.headers.get(current_app.config['RESTPLUS_MASK_HEADER'])
+                if mask:
+                    data = marshal(data, fields, mask=mask)
+                else:
+                    if project is None:
+                        project = compile_model(fields)
+                    data = [project(item) for item in data] if isinstance(data, (list, tuple)) else project(data)
+                Metrics.get_instance().observe_marshal(model_name, time.perf_counter() - start)
+                return data, status, headers
+
+            return view
+
+        return wrapper
 
 
 class AppConfiguration:
@@ -17,6 +67,8 @@ class AppConfiguration:
             raise Exception('This class is a singleton!')
         else:
             AppConfiguration._instance = self
+        self._k8s_connectivity_configured = False
+        self._k8s_connectivity_lock = threading.Lock()
 
     def get_api_configuration(self, app):
         """
@@ -28,8 +80,125 @@ class AppConfiguration:
         # disable default 404 error msg provided by Flask
         app.config['ERROR_404_HELP'] = False
 
-        return App_wrapper(app, title='CRUD operations on Kubernetes Resources',
-                           description='App performs CRUD operations on Kubernetes cluster')
+        api = InstrumentedApi(app, title='CRUD operations on Kubernetes Resources',
+                              description='App performs CRUD operations on Kubernetes cluster')
+
+        @api.representation('application/json')
+        def output_json(data, code, headers=None):
+            # Marshaled responses are serialized straight into bytes by JsonCodec.
+            response = make_response(JsonCodec.dumps(data), code)
+            response.headers.extend(headers or {})
+            return response
+
+        for media_type in CompactCodec.get_media_types():
+            api.representation(media_type)(self.get_compact_representation(media_type))
+
+        return api
+
+    def get_compact_representation(self, media_type):
+        """
+        Get FlaskRestPlus representation serializing responses with compact binary encoding
+
+        :param media_type: Media type of encoding
+        :return: Representation function
+        """
+        def output_compact(data, code, headers=None):
+            response = make_response(CompactCodec.dumps(data, media_type), code)
+            response.headers.extend(headers or {})
+            return response
+
+        return output_compact
+
+    def configure_response_compression(self, app):
+        """
+        Compress responses larger than RESPONSE_COMPRESSION_MIN_SIZE bytes with encoding negotiated
+        from Accept-Encoding request header. Streamed responses are sent uncompressed.
+
+        :param app: Flask app
+        """
+        if os.environ.get('RESPONSE_COMPRESSION', 'True') != 'True':
+            return
+        min_size = int(os.environ.get('RESPONSE_COMPRESSION_MIN_SIZE', '1024'))
+        supported_encodings = get_supported_encodings()
+
+        @app.after_request
+        def compress_response(response):
+            if response.is_streamed or response.direct_passthrough or 'Content-Encoding' in response.headers:
+                return response
+            if not 200 <= response.status_code < 300 or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+                return response
+            response.vary.add('Accept-Encoding')
+            encoding = request.accept_encodings.best_match(supported_encodings)
+            data = response.get_data()
+            if encoding is None or len(data) < min_size:
+                return response
+            response.set_data(compress(data, encoding))
+            response.headers['Content-Encoding'] = encoding
+            return response
+
+    def get_swagger_spec_path(self):
+        """
+        Get path of Swagger specification pre-rendered into static artifact
+
+        :return: Path set by SWAGGER_SPEC_PATH environment variable, spec/swagger.json in app directory by default
+        """
+        default_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'spec', 'swagger.json')
+        return os.environ.get('SWAGGER_SPEC_PATH', default_path)
+
+    def configure_swagger_spec(self, app, api):
+        """
+        Serve Swagger specification from static artifact built by `flask build-swagger-spec` command together
+        with its compressed variants, so specification is not rendered from api models on every replica.
+        Specification is rendered once on first request when artifact does not exist.
+
+        :param app: Flask app
+        :param api: FlaskRestPlus api
+        """
+        spec_path = self.get_swagger_spec_path()
+        swagger_spec = None
+        swagger_spec_lock = threading.Lock()
+
+        def get_swagger_spec():
+            nonlocal swagger_spec
+            if swagger_spec is None:
+                with swagger_spec_lock:
+                    if swagger_spec is None:
+                        swagger_spec = SwaggerSpec.load(spec_path) or SwaggerSpec.render(api)
+            return swagger_spec
+
+        def serve_swagger_spec():
+            return get_swagger_spec().get_response()
+
+        # Replaces view of FlaskRestPlus rendering specification from api models.
+        app.view_functions['specs'] = serve_swagger_spec
+
+        @app.cli.command('build-swagger-spec')
+        def build_swagger_spec():
+            """
+            Render Swagger specification and its compressed variants into static artifact served by the app
+            """
+            with app.test_request_context():
+                SwaggerSpec.render(api).save(spec_path)
+            print(f'Swagger specification written to {spec_path}')
+
+    def configure_request_metrics(self, app):
+        """
+        Record count and latency of every handled request per route and method
+
+        :param app: Flask app
+        """
+        @app.before_request
+        def start_request_timer():
+            g.request_start = time.perf_counter()
+
+        @app.after_request
+        def observe_request(response):
+            if 'request_start' in g:
+                route = request.url_rule.rule if request.url_rule else 'unmatched'
+                Metrics.get_instance().observe_request(
+                    route, request.method, response.status_code, time.perf_counter() - g.request_start
+                )
+            return response
 
     def get_api_namespace(self, api, name, path):
         """
@@ -45,9 +214,249 @@ class AppConfiguration:
     def configure_k8s_connectivity(self):
         """
         Configure Kubernetes connectivity if app is deployed on K8s environment.
+        Outside of K8s environment kubeconfig is loaded when KUBECONFIG environment variable is set.
+        Connectivity is configured once, when first Kubernetes client is created, as importing
+        Kubernetes client package is the largest part of app startup time.
+        """
+        if self._k8s_connectivity_configured:
+            return
+        with self._k8s_connectivity_lock:
+            if self._k8s_connectivity_configured:
+                return
+            from kubernetes import config
+            try:
+                if os.environ.get('K8S_ENVIRONMENT') == 'True':
+                    config.load_incluster_config()
+                elif os.environ.get('KUBECONFIG'):
+                    config.load_kube_config()
+            except AttributeError:
+                pass
+            self._k8s_connectivity_configured = True
+
+    def get_k8s_client_configuration(self):
+        """
+        Get Kubernetes client configuration used by the shared Api client.
+        Connection pool size and TCP keep-alive can be tuned with K8S_CONNECTION_POOL_MAXSIZE
+        and K8S_TCP_KEEPALIVE environment variables.
+
+        :return: Kubernetes client configuration
+        """
+        from kubernetes import client
+        from urllib3.connection import HTTPConnection
+        from urllib3.util.retry import Retry
+
+        self.configure_k8s_connectivity()
+        configuration = client.Configuration.get_default_copy()
+        configuration.connection_pool_maxsize = int(os.environ.get('K8S_CONNECTION_POOL_MAXSIZE', '10'))
+        if os.environ.get('K8S_TCP_KEEPALIVE', 'True') == 'True':
+            configuration.socket_options = HTTPConnection.default_socket_options + [
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            ]
+        # Timed out reads are not retried by urllib3, so latency of every call stays bounded by its timeout.
+        configuration.retries = Retry(total=3, read=0)
+        return configuration
+
+    def get_kube_api_timeout(self):
+        """
+        Get timeout of Kubernetes Api calls
+
+        :return: Tuple of connect and read timeout in seconds
+        """
+        return (
+            float(os.environ.get('K8S_API_CONNECT_TIMEOUT', '5')),
+            float(os.environ.get('K8S_API_READ_TIMEOUT', '30'))
+        )
+
+    def is_circuit_breaker_enabled(self):
+        """
+        Check if Kubernetes Api calls should fail fast while Api server is degraded
+
+        :return: False if K8S_CIRCUIT_BREAKER environment variable is set to False
+        """
+        return os.environ.get('K8S_CIRCUIT_BREAKER', 'True') == 'True'
+
+    def get_circuit_breaker_configuration(self):
+        """
+        Get configuration of circuit breaker around Kubernetes Api calls: failure rate opening circuit,
+        duration after which call is counted as failure, size of sliding window, min number of calls
+        in window, open duration and number of probe calls
+
+        :return: Tuple of failure rate threshold, slow call duration in seconds, window size, min calls,
+            open duration in seconds and number of half-open calls
+        """
+        return (
+            float(os.environ.get('K8S_CIRCUIT_BREAKER_FAILURE_RATE', '0.5')),
+            float(os.environ.get('K8S_CIRCUIT_BREAKER_SLOW_CALL_DURATION', '10')),
+            int(os.environ.get('K8S_CIRCUIT_BREAKER_WINDOW_SIZE', '20')),
+            int(os.environ.get('K8S_CIRCUIT_BREAKER_MIN_CALLS', '10')),
+            float(os.environ.get('K8S_CIRCUIT_BREAKER_OPEN_DURATION', '30')),
+            int(os.environ.get('K8S_CIRCUIT_BREAKER_HALF_OPEN_CALLS', '3'))
+        )
+
+    def is_resource_cache_enabled(self):
+        """
+        Check if reads should be served from informer-backed resource cache
+
+        :return: True if K8S_RESOURCE_CACHE environment variable is set to True
+        """
+        return os.environ.get('K8S_RESOURCE_CACHE') == 'True'
+
+    def get_resource_cache_max_staleness(self):
+        """
+        Get number of seconds after which cached resources are no longer served
+
+        :return: Max staleness in seconds
+        """
+        return float(os.environ.get('K8S_RESOURCE_CACHE_MAX_STALENESS', '120'))
+
+    def get_resource_cache_watch_timeout(self):
+        """
+        Get number of seconds after which informer watch is reopened
+
+        :return: Watch timeout in seconds
+        """
+        return int(os.environ.get('K8S_RESOURCE_CACHE_WATCH_TIMEOUT', '60'))
+
+    def get_list_page_size(self):
+        """
+        Get number of resources fetched from Api server in one page while streaming lists
+
+        :return: List page size
+        """
+        return int(os.environ.get('K8S_LIST_PAGE_SIZE', '500'))
+
+    def is_kube_api_compression_enabled(self):
+        """
+        Check if gzip compressed responses should be requested from Kubernetes Api server
+
+        :return: False if K8S_API_COMPRESSION environment variable is set to False
+        """
+        return os.environ.get('K8S_API_COMPRESSION', 'True') == 'True'
+
+    def get_rate_limit(self, verb):
+        """
+        Get client-side rate limit of Kubernetes Api calls with provided verb. Limits set by
+        K8S_RATE_LIMIT_<VERB>_QPS and K8S_RATE_LIMIT_<VERB>_BURST environment variables take precedence
+        over K8S_RATE_LIMIT_QPS and K8S_RATE_LIMIT_BURST shared by all verbs.
+
+        :param verb: Verb of Kubernetes Api call, e.g. read, list, create, patch or delete
+        :return: Tuple of QPS and burst, QPS <= 0 disables limiting
+        """
+        qps = os.environ.get(f'K8S_RATE_LIMIT_{verb.upper()}_QPS', os.environ.get('K8S_RATE_LIMIT_QPS', '50'))
+        burst = os.environ.get(f'K8S_RATE_LIMIT_{verb.upper()}_BURST', os.environ.get('K8S_RATE_LIMIT_BURST', '100'))
+        return float(qps), int(burst)
+
+    def get_retry_configuration(self):
+        """
+        Get retry policy of throttled and failed Kubernetes Api calls
+
+        :return: Tuple of max number of retries, base delay and max delay in seconds
+        """
+        return (
+            int(os.environ.get('K8S_RETRY_MAX_ATTEMPTS', '3')),
+            float(os.environ.get('K8S_RETRY_BASE_DELAY', '0.1')),
+            float(os.environ.get('K8S_RETRY_MAX_DELAY', '5'))
+        )
+
+    def is_read_coalescing_enabled(self):
+        """
+        Check if identical concurrent reads should be collapsed into one Kubernetes Api call
+
+        :return: False if K8S_READ_COALESCING environment variable is set to False
+        """
+        return os.environ.get('K8S_READ_COALESCING', 'True') == 'True'
+
+    def get_field_manager(self):
+        """
+        Get default name of field manager owning fields patched by the app
+
+        :return: Field manager name
+        """
+        return os.environ.get('K8S_FIELD_MANAGER', 'k8s-crud-app')
+
+    def get_bulk_max_workers(self):
+        """
+        Get max number of Kubernetes Api calls run concurrently by one bulk operation
+
+        :return: Max number of bulk workers
+        """
+        return int(os.environ.get('K8S_BULK_MAX_WORKERS', '16'))
+
+    def get_snapshot_max_workers(self):
+        """
+        Get max number of lists fetched concurrently by all snapshot requests
+
+        :return: Max number of snapshot workers
+        """
+        return int(os.environ.get('K8S_SNAPSHOT_MAX_WORKERS', '6'))
+
+    def is_async_write_enabled(self):
+        """
+        Check if writes should be queued and run in background for all requests, otherwise only requests
+        sent with Prefer: respond-async header are queued
+
+        :return: True if K8S_ASYNC_WRITES environment variable is set to True
+        """
+        return os.environ.get('K8S_ASYNC_WRITES') == 'True'
+
+    def get_write_pipeline_configuration(self):
+        """
+        Get configuration of background write pipeline: number of workers, max number of pending operations,
+        number of seconds finished operations are kept and directory shared by workers for operation states
+
+        :return: Tuple of max workers, max pending operations, retention in seconds and directory or None
+        """
+        return (
+            int(os.environ.get('K8S_WRITE_WORKERS', '8')),
+            int(os.environ.get('K8S_WRITE_QUEUE_SIZE', '10000')),
+            float(os.environ.get('K8S_WRITE_OPERATION_RETENTION', '600')),
+            os.environ.get('K8S_WRITE_OPERATIONS_DIR') or None
+        )
+
+    def get_wait_max_timeout(self):
+        """
+        Get max number of seconds request can wait for resource condition
+
+        :return: Max wait timeout in seconds
+        """
+        return float(os.environ.get('K8S_WAIT_MAX_TIMEOUT', '300'))
+
+    def get_long_lived_request_limit(self):
+        """
+        Get max number of long-lived requests, watch streams and waits together, held by worker process at once.
+        Each of them holds Gunicorn thread, so threads reserved by K8S_RESERVED_THREADS are always left for other
+        requests.
+
+        :return: Max number of long-lived requests
+        """
+        threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+        return max(threads - int(os.environ.get('K8S_RESERVED_THREADS', '2')), 1)
+
+    def get_max_concurrent_waits(self):
+        """
+        Get max number of requests waiting for resource condition in worker process at once
+
+        :return: Max number of concurrent waits, all threads not reserved for other requests by default
+        """
+        return int(os.environ.get('K8S_WAIT_MAX_CONCURRENT') or self.get_long_lived_request_limit())
+
+    def get_watch_max_streams(self):
+        """
+        Get max number of watch streams served by worker process at once, every stream holds a server thread
+
+        :return: Max number of watch streams, all threads not reserved for other requests by default
+        """
+        return int(os.environ.get('K8S_WATCH_MAX_STREAMS') or self.get_long_lived_request_limit())
+
+    def get_watch_configuration(self):
+        """
+        Get configuration of watch broadcasters: subscriber queue size, number of events kept for resuming
+        and upstream watch timeout
+
+        :return: Tuple of subscriber queue size, history size and watch timeout in seconds
         """
-        try:
-            if os.environ.get('K8S_ENVIRONMENT') == 'True':
-                config.load_incluster_config()
-        except AttributeError:
-            pass
+        return (
+            int(os.environ.get('K8S_WATCH_SUBSCRIBER_QUEUE_SIZE', '1000')),
+            int(os.environ.get('K8S_WATCH_HISTORY_SIZE', '1000')),
+            int(os.environ.get('K8S_WATCH_TIMEOUT', '300'))
+        )
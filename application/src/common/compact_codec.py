@@ -0,0 +1,46 @@
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+MSGPACK_MEDIA_TYPE = 'application/msgpack'
+CBOR_MEDIA_TYPE = 'application/cbor'
+
+
+class CompactCodec:
+    """
+    Compact binary encodings of HTTP responses selected by Accept header.
+    MessagePack is offered when msgpack is installed and CBOR when cbor2 is installed.
+    """
+
+    @staticmethod
+    def get_media_types():
+        """
+        Get media types of encodings whose packages are installed
+
+        :return: List of media types
+        """
+        media_types = []
+        if msgpack is not None:
+            media_types.append(MSGPACK_MEDIA_TYPE)
+        if cbor2 is not None:
+            media_types.append(CBOR_MEDIA_TYPE)
+        return media_types
+
+    @staticmethod
+    def dumps(obj, media_type):
+        """
+        Serialize Python object with encoding of provided media type
+
+        :param obj: Python object
+        :param media_type: One of media types returned by get_media_types
+        :return: Encoded document as bytes
+        """
+        if media_type == MSGPACK_MEDIA_TYPE:
+            return msgpack.packb(obj, use_bin_type=True)
+        return cbor2.dumps(obj)
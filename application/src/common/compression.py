@@ -0,0 +1,36 @@
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_COMPRESS_LEVEL = 5
+BROTLI_QUALITY = 4
+COMPRESSIBLE_MIMETYPES = (
+    'application/json', 'application/x-ndjson', 'application/msgpack', 'application/cbor', 'text/plain', 'text/html'
+)
+
+
+def get_supported_encodings():
+    """
+    Get content encodings in order of preference, brotli is offered when installed
+
+    :return: List of content encodings
+    """
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def compress(data, encoding, max_compression=False):
+    """
+    Compress response body. Fast compression levels are used, so compression costs less than sending
+    uncompressed bytes over the network.
+
+    :param data: Response body bytes
+    :param encoding: One of encodings returned by get_supported_encodings
+    :param max_compression: Use max compression level for bodies compressed once and served many times
+    :return: Compressed bytes
+    """
+    if encoding == 'br':
+        return brotli.compress(data, quality=11 if max_compression else BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=9 if max_compression else GZIP_COMPRESS_LEVEL)
@@ -0,0 +1,40 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JsonCodec:
+    """
+    JSON codec used for Kubernetes Api server payloads and HTTP responses.
+    orjson is used when installed, otherwise codec falls back to stdlib json.
+    """
+
+    @staticmethod
+    def loads(data):
+        """
+        Deserialize JSON document, bytes are parsed directly without decoding them into str first
+
+        :param data: JSON document as bytes or str
+        :return: Deserialized Python object
+        """
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+    @staticmethod
+    def dumps(obj, sort_keys=False):
+        """
+        Serialize Python object into JSON document
+
+        :param obj: Python object
+        :param sort_keys: Sort keys of objects, so equal objects are always serialized into the same bytes
+        :return: JSON document as bytes
+        """
+        if orjson is not None:
+            # Swagger specification uses integer response codes as keys.
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+            return orjson.dumps(obj, option=option)
+        return json.dumps(obj, sort_keys=sort_keys).encode('utf-8')
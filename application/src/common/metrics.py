@@ -0,0 +1,224 @@
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:
+    prometheus_client = None
+
+
+class Metrics:
+    """
+    Prometheus metrics of the app. Metrics are not collected when prometheus_client is not installed.
+    """
+    _instance = None
+
+    @staticmethod
+    def get_instance():
+        if Metrics._instance is None:
+            Metrics()
+        return Metrics._instance
+
+    def __init__(self):
+        if Metrics._instance is not None:
+            raise Exception('This class is a singleton!')
+        else:
+            Metrics._instance = self
+        self.enabled = prometheus_client is not None
+        if not self.enabled:
+            return
+        self.http_requests = prometheus_client.Counter(
+            'crud_app_http_requests_total', 'Number of handled HTTP requests',
+            ['route', 'method', 'status']
+        )
+        self.http_request_duration = prometheus_client.Histogram(
+            'crud_app_http_request_duration_seconds', 'Latency of handled HTTP requests',
+            ['route', 'method']
+        )
+        self.kube_api_call_duration = prometheus_client.Histogram(
+            'crud_app_kube_api_call_duration_seconds', 'Latency of Kubernetes Api server calls',
+            ['operation']
+        )
+        self.kube_api_call_errors = prometheus_client.Counter(
+            'crud_app_kube_api_call_errors_total', 'Number of failed Kubernetes Api server calls',
+            ['operation']
+        )
+        self.kube_api_rate_limiter_wait = prometheus_client.Histogram(
+            'crud_app_kube_api_rate_limiter_wait_seconds', 'Time Kubernetes Api calls waited for client-side '
+            'rate limiter', ['verb']
+        )
+        self.kube_api_retries = prometheus_client.Counter(
+            'crud_app_kube_api_retries_total', 'Number of retried Kubernetes Api calls by response status',
+            ['operation', 'status']
+        )
+        self.kube_api_circuit_breaker_rejections = prometheus_client.Counter(
+            'crud_app_kube_api_circuit_breaker_rejections_total', 'Number of Kubernetes Api calls rejected '
+            'by open circuit breaker', ['operation']
+        )
+        self.kube_api_reads = prometheus_client.Counter(
+            'crud_app_kube_api_reads_total', 'Number of reads by whether they were sent to Kubernetes Api server '
+            'or coalesced with identical in-flight read', ['operation', 'result']
+        )
+        self.write_operations = prometheus_client.Counter(
+            'crud_app_write_operations_total', 'Number of finished background write operations',
+            ['kind', 'action', 'status']
+        )
+        self.write_operation_queue_duration = prometheus_client.Histogram(
+            'crud_app_write_operation_queue_seconds', 'Time background write operations waited in queue',
+            ['kind', 'action']
+        )
+        self.condition_waits = prometheus_client.Counter(
+            'crud_app_condition_waits_total', 'Number of finished waits for resource condition by result',
+            ['kind', 'condition', 'result']
+        )
+        self.json_decode_duration = prometheus_client.Histogram(
+            'crud_app_json_decode_duration_seconds', 'Time spent decoding Kubernetes Api server responses'
+        )
+        self.marshal_duration = prometheus_client.Histogram(
+            'crud_app_marshal_duration_seconds', 'Time spent marshaling DTOs into responses',
+            ['model']
+        )
+        self.errors = prometheus_client.Counter(
+            'crud_app_errors_total', 'Number of errors returned to clients by exception type',
+            ['exception']
+        )
+
+    def observe_request(self, route, method, status, duration):
+        """
+        Record handled HTTP request
+
+        :param route: Matched URL rule
+        :param method: HTTP method
+        :param status: Response status code
+        :param duration: Request duration in seconds
+        """
+        if self.enabled:
+            self.http_requests.labels(route, method, status).inc()
+            self.http_request_duration.labels(route, method).observe(duration)
+
+    def observe_marshal(self, model, duration):
+        """
+        Record DTO marshaling time
+
+        :param model: Name of api model
+        :param duration: Marshaling duration in seconds
+        """
+        if self.enabled:
+            self.marshal_duration.labels(model).observe(duration)
+
+    def count_error(self, exception):
+        """
+        Record error returned to client
+
+        :param exception: Handled exception
+        """
+        if self.enabled:
+            self.errors.labels(type(exception).__name__).inc()
+
+    @contextmanager
+    def time_kube_api_call(self, operation):
+        """
+        Record latency and failures of Kubernetes Api server call
+
+        :param operation: Name of CoreV1Api operation
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            if self.enabled:
+                self.kube_api_call_errors.labels(operation).inc()
+            raise
+        finally:
+            if self.enabled:
+                self.kube_api_call_duration.labels(operation).observe(time.perf_counter() - start)
+
+    def observe_rate_limiter_wait(self, verb, duration):
+        """
+        Record time Kubernetes Api call waited for client-side rate limiter
+
+        :param verb: Verb of Kubernetes Api call
+        :param duration: Wait duration in seconds
+        """
+        if self.enabled:
+            self.kube_api_rate_limiter_wait.labels(verb).observe(duration)
+
+    def count_kube_api_retry(self, operation, status):
+        """
+        Record retried Kubernetes Api call
+
+        :param operation: Name of CoreV1Api operation
+        :param status: Response status code of failed attempt
+        """
+        if self.enabled:
+            self.kube_api_retries.labels(operation, status).inc()
+
+    def count_circuit_breaker_rejection(self, operation):
+        """
+        Record Kubernetes Api call rejected by open circuit breaker
+
+        :param operation: Name of CoreV1Api operation
+        """
+        if self.enabled:
+            self.kube_api_circuit_breaker_rejections.labels(operation).inc()
+
+    def count_kube_api_read(self, operation, coalesced):
+        """
+        Record read which was either sent to Kubernetes Api server or served by identical in-flight read
+
+        :param operation: Name of CoreV1Api operation
+        :param coalesced: True if result of in-flight read was reused
+        """
+        if self.enabled:
+            self.kube_api_reads.labels(operation, 'coalesced' if coalesced else 'executed').inc()
+
+    def observe_write_operation(self, operation):
+        """
+        Record finished background write operation
+
+        :param operation: Operation as Python dict
+        """
+        if self.enabled:
+            self.write_operations.labels(operation['kind'], operation['action'], operation['status']).inc()
+            self.write_operation_queue_duration.labels(operation['kind'], operation['action']).observe(
+                operation['started'] - operation['created'])
+
+    def count_condition_wait(self, kind, condition, result):
+        """
+        Record finished wait for resource condition
+
+        :param kind: Resource kind
+        :param condition: Wait condition
+        :param result: Wait result, e.g. met, unsatisfiable or timeout
+        """
+        if self.enabled:
+            self.condition_waits.labels(kind, condition, result).inc()
+
+    @contextmanager
+    def time_json_decode(self):
+        """
+        Record time spent decoding Kubernetes Api server response
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.enabled:
+                self.json_decode_duration.observe(time.perf_counter() - start)
+
+    def generate_latest(self):
+        """
+        Render metrics in Prometheus text format. Metrics of all Gunicorn workers are aggregated
+        when PROMETHEUS_MULTIPROC_DIR environment variable is set.
+
+        :return: Tuple of rendered metrics and content type
+        """
+        if not self.enabled:
+            return b'', 'text/plain'
+        registry = prometheus_client.REGISTRY
+        if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+            registry = prometheus_client.CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
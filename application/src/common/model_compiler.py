@@ -0,0 +1,64 @@
+from flask_restplus import fields
+
+
+def get_value_getter(source):
+    """
+    Get function reading values of source by key
+
+    :param source: Python dict or DTO object
+    :return: Function taking key and returning value or None if missing
+    """
+    if isinstance(source, dict):
+        return source.get
+    return lambda key: getattr(source, key, None)
+
+
+def compile_field(field):
+    """
+    Compile FlaskRestPlus field into function converting raw value the same way field output does
+
+    :param field: FlaskRestPlus field
+    :return: Function converting value
+    """
+    if isinstance(field, fields.Nested):
+        project = compile_model(field.nested)
+        if field.allow_null:
+            return lambda value: None if value is None else project(value)
+        return project
+    if isinstance(field, fields.List):
+        convert_item = compile_field(field.container)
+        return lambda value: None if value is None else [convert_item(item) for item in value]
+    if isinstance(field, fields.String):
+        return lambda value: None if value is None else str(value)
+    if isinstance(field, fields.Integer):
+        return lambda value: None if value is None else int(value)
+    if isinstance(field, fields.Float):
+        return lambda value: None if value is None else float(value)
+    if isinstance(field, fields.Boolean):
+        return lambda value: None if value is None else bool(value)
+    return lambda value: None if value is None else field.format(value)
+
+
+def compile_model(model):
+    """
+    Compile FlaskRestPlus api model into function projecting raw Kubernetes object or DTO object straight
+    into response dict. Source keys are taken from field attribute, so no intermediate DTO objects are built.
+    Missing values are rendered as None like in FlaskRestPlus marshal.
+
+    :param model: FlaskRestPlus api model
+    :return: Function projecting source into Python dict
+    """
+    compiled_fields = [
+        (name, field.attribute or name, compile_field(field), field.default)
+        for name, field in model.items()
+    ]
+
+    def project(source):
+        get_value = get_value_getter(source if source is not None else {})
+        result = {}
+        for name, key, convert, default in compiled_fields:
+            value = get_value(key)
+            result[name] = convert(value if value is not None else default)
+        return result
+
+    return project
@@ -0,0 +1,97 @@
+import hashlib
+import os
+
+from flask import Response, request
+
+from common.compression import compress, get_supported_encodings
+from common.json_codec import JsonCodec
+from controllers.utils.http_status_code import HttpStatusCode
+
+# File name suffixes of compressed variants of pre-rendered specification.
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+class SwaggerSpec:
+    """
+    Swagger specification rendered once into JSON bytes, kept together with its compressed variants and ETag
+    derived from its content, so every replica serves it with the same ETag.
+    """
+
+    def __init__(self, encoded_specs):
+        """
+        :param encoded_specs: Dict of content encodings and specification bytes, identity encoding is required
+        """
+        self._encoded_specs = encoded_specs
+        self.etag = hashlib.sha256(encoded_specs['identity']).hexdigest()[:32]
+
+    @staticmethod
+    def render(api):
+        """
+        Render Swagger specification from api models, has to be called within request context
+
+        :param api: FlaskRestPlus api
+        :return: Swagger specification
+        """
+        # Keys are sorted, as order of some of them depends on hash seed of the process rendering specification.
+        data = JsonCodec.dumps(api.__schema__, sort_keys=True)
+        return SwaggerSpec(dict(SwaggerSpec.compress_spec(data), identity=data))
+
+    @staticmethod
+    def compress_spec(data):
+        """
+        Compress specification with every supported encoding using max compression level
+
+        :param data: Specification bytes
+        :return: Dict of content encodings and compressed specification bytes
+        """
+        return {encoding: compress(data, encoding, max_compression=True) for encoding in get_supported_encodings()}
+
+    @staticmethod
+    def load(path):
+        """
+        Load pre-rendered specification and its compressed variants, missing variants are compressed
+
+        :param path: Path of specification JSON file
+        :return: Swagger specification or None if file does not exist
+        """
+        if not os.path.isfile(path):
+            return None
+        with open(path, 'rb') as spec_file:
+            data = spec_file.read()
+        encoded_specs = {'identity': data}
+        for encoding in get_supported_encodings():
+            encoded_path = path + ENCODING_SUFFIXES[encoding]
+            if os.path.isfile(encoded_path):
+                with open(encoded_path, 'rb') as spec_file:
+                    encoded_specs[encoding] = spec_file.read()
+            else:
+                encoded_specs[encoding] = compress(data, encoding, max_compression=True)
+        return SwaggerSpec(encoded_specs)
+
+    def save(self, path):
+        """
+        Write specification and its compressed variants next to each other
+
+        :param path: Path of specification JSON file
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        for encoding, data in self._encoded_specs.items():
+            with open(path + ENCODING_SUFFIXES.get(encoding, ''), 'wb') as spec_file:
+                spec_file.write(data)
+
+    def get_response(self):
+        """
+        Get response with specification encoded as negotiated from Accept-Encoding request header,
+        304 Not Modified is returned when If-None-Match request header matches ETag
+
+        :return: Flask response
+        """
+        headers = {'ETag': f'W/"{self.etag}"', 'Vary': 'Accept-Encoding', 'Cache-Control': 'no-cache'}
+        if request.if_none_match.contains_weak(self.etag):
+            return Response(status=HttpStatusCode.NotModified.value, headers=headers)
+        encoding = request.accept_encodings.best_match([
+            encoding for encoding in get_supported_encodings() if encoding in self._encoded_specs
+        ])
+        if encoding is not None:
+            headers['Content-Encoding'] = encoding
+        return Response(self._encoded_specs[encoding or 'identity'], mimetype='application/json', headers=headers)
@@ -0,0 +1,37 @@
+from flask import request
+from flask_restplus import Resource
+
+from controllers.utils.bulk_operation import run_bulk_apply
+from controllers.utils.http_status_code import HttpStatusCode
+from controllers.utils.patch_options import PATCH_OPTIONS_DOC, get_apply_options
+from dto.apply_result_dto import ApplyResultDto
+from main import api
+from services.crud_service_provider import CRUDServiceProvider
+
+
+@api.route('/apply')
+class ApplyController(Resource):
+    @api.marshal_with(ApplyResultDto.model, mask=None, code=HttpStatusCode.MultiStatus.value)
+    @api.doc(responses={
+        HttpStatusCode.MultiStatus.value: 'Result of server-side apply for every manifest.',
+        HttpStatusCode.BadRequest.value: 'Invalid request body. Check if provided values are correct.'
+    }, params={
+        'namespace': 'Namespace of namespaced resources whose manifest has no metadata.namespace, default by default',
+        **{name: PATCH_OPTIONS_DOC[name] for name in ('fieldManager', 'force', 'dryRun')}
+    })
+    def post(self):
+        """
+        Apply array of Pod, Service and Namespace manifests with server-side apply. Manifests are applied
+        concurrently and resources are returned as persisted by Api server.
+
+        :return: Apply result DTO
+        """
+        service = CRUDServiceProvider.get_instance()
+        default_namespace = request.args.get('namespace', 'default')
+        apply_options = get_apply_options()
+        apply_result = run_bulk_apply(
+            lambda manifest: service.apply_manifest(manifest, default_namespace, **apply_options),
+            request.get_json(),
+            apply_options['dry_run']
+        )
+        return apply_result, HttpStatusCode.MultiStatus.value
@@ -1,11 +1,16 @@
 from common.app_configuration import AppConfiguration
+from common.json_codec import JsonCodec
+from common.metrics import Metrics
 from controllers.utils.http_status_code import HttpStatusCode
 from dto.list_of_resources_dto import ListOfResourcesDto
 
-from exceptions.app_exceptions import ServiceUnavailable
+from exceptions.app_exceptions import ServiceUnavailable, ResourceNotModified
 from exceptions.kube_api_exceptions import ResourceNotFoundException, ResourceAlreadyExistException, \
     InvalidResourceManifestException
 from main import api
+from services.crud_service_provider import CRUDServiceProvider
+from services.field_projection import parse_fields
+from flask import Response, request, stream_with_context
 from flask_restplus import Resource
 
 pod_controller = AppConfiguration. \
@@ -20,29 +25,48 @@ namespace_controller = AppConfiguration. \
     get_instance(). \
     get_api_namespace(api, 'Namespace', '/namespace')
 
+diagnostics_controller = AppConfiguration. \
+    get_instance(). \
+    get_api_namespace(api, 'Diagnostics', '/diagnostics')
+
+operation_controller = AppConfiguration. \
+    get_instance(). \
+    get_api_namespace(api, 'Operation', '/operations')
+
 
 @api.errorhandler(ResourceNotFoundException)
 def handle_kube_api_not_found_error(error):
+    Metrics.get_instance().count_error(error)
     return {'message': str(error)}, HttpStatusCode.NotFound.value
 
 
 @api.errorhandler(ServiceUnavailable)
 def handle_internal_service_error(error):
-    return {'message': str(error)}, HttpStatusCode.ServiceUnavailable.value
+    Metrics.get_instance().count_error(error)
+    headers = {'Retry-After': str(error.retry_after)} if error.retry_after is not None else {}
+    return {'message': str(error)}, HttpStatusCode.ServiceUnavailable.value, headers
+
+
+@api.errorhandler(ResourceNotModified)
+def handle_resource_not_modified(error):
+    return {}, HttpStatusCode.NotModified.value, {'ETag': error.etag}
 
 
 @api.errorhandler(ResourceAlreadyExistException)
 def handle_resource_conflict_error(error):
+    Metrics.get_instance().count_error(error)
     return {'message': str(error)}, HttpStatusCode.Conflict.value
 
 
 @api.errorhandler(InvalidResourceManifestException)
 def handle_invalid_resource_manifest(error):
+    Metrics.get_instance().count_error(error)
     return {'message': str(error)}, HttpStatusCode.UnprocessableEntity.value
 
 
 @api.errorhandler(InvalidResourceManifestException)
 def handle_invalid_marshaling_error(error):
+    Metrics.get_instance().count_error(error)
     return {'message': str(error)}, HttpStatusCode.BadRequest.value
 
 
@@ -53,6 +77,12 @@ class GetResourceListController(Resource):
         HttpStatusCode.NotFound.value: 'Provided resource not found or namespace does not exist.',
         HttpStatusCode.ServiceUnavailable.value: 'The service is unavailable.',
         HttpStatusCode.NotFound.value: 'Provided kind is not supported.'
+    }, params={
+        'limit': 'Max number of resources returned in one page',
+        'continue': 'Continue token returned with previous page',
+        'labelSelector': 'Kubernetes label selector, e.g. app=web',
+        'fieldSelector': 'Kubernetes field selector, e.g. status.phase=Running',
+        'fields': 'Comma separated field paths returned in items, e.g. metadata.labels,status.podIP'
     })
     def get(self, namespace, kind):
         """
@@ -62,11 +92,61 @@ class GetResourceListController(Resource):
         :param kind: Kind name
         :return: List of Kubernetes resources DTO
         """
-        list_of_resources = CRUDService.get_instance().get_list_of_resources(kind, namespace)
-        return ListOfResourcesDto(list_of_resources)
+        fields = parse_fields(request.args.get('fields'))
+        list_of_resources = CRUDServiceProvider.get_instance().get_list_of_resources(
+            kind, namespace, limit=request.args.get('limit', type=int), _continue=request.args.get('continue'),
+            label_selector=request.args.get('labelSelector'), field_selector=request.args.get('fieldSelector'),
+            fields=fields
+        )
+        return ListOfResourcesDto(list_of_resources, with_items=fields is not None)
+
+
+@api.route('/list_resources/<string:namespace>/<string:kind>/stream')
+class StreamResourceListController(Resource):
+    @api.produces(['application/x-ndjson'])
+    @api.doc(responses={
+        HttpStatusCode.NotFound.value: 'Provided resource not found or namespace does not exist.',
+        HttpStatusCode.ServiceUnavailable.value: 'The service is unavailable.',
+        HttpStatusCode.NotFound.value: 'Provided kind is not supported.'
+    }, params={
+        'limit': 'Max number of resources fetched from Kubernetes Api server in one page'
+    })
+    def get(self, namespace, kind):
+        """
+        Stream names of Kubernetes resources as newline delimited JSON
+
+        :param namespace: Namespace name
+        :param kind: Kind name
+        :return: Chunked response with one resource name per line
+        """
+        page_size = request.args.get('limit', default=AppConfiguration.get_instance().get_list_page_size(), type=int)
+        resource_names = CRUDServiceProvider.get_instance().get_resource_names_stream(kind, namespace, page_size)
+
+        def generate():
+            for resource_name in resource_names:
+                yield JsonCodec.dumps({'name': resource_name}) + b'\n'
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@api.route('/metrics')
+class MetricsController(Resource):
+    @api.produces(['text/plain'])
+    def get(self):
+        """
+        Prometheus metrics
+
+        :return: Metrics in Prometheus text format
+        """
+        metrics, content_type = Metrics.get_instance().generate_latest()
+        return Response(metrics, content_type=content_type)
 
 
 # Required by Flask for splitting routes between many python modules
+from controllers.apply_controller import *
+from controllers.diagnostics_controller import *
 from controllers.namespace_controller import *
+from controllers.operation_controller import *
 from controllers.pod_controller import *
 from controllers.service_controller import *
+from controllers.watch_controller import *
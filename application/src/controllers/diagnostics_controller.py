@@ -0,0 +1,62 @@
+from flask_restplus import Resource
+
+from controllers.crud_controller import diagnostics_controller
+from controllers.utils.http_status_code import HttpStatusCode
+from dto.circuit_breaker_status_dto import CircuitBreakerStatusDto
+from dto.connection_pool_statistics_dto import ConnectionPoolStatisticsDto
+from dto.read_coalescing_statistics_dto import ReadCoalescingStatisticsDto
+from dto.resource_cache_status_dto import ResourceCacheStatusDto
+from main import api
+from services.crud_service_provider import CRUDServiceProvider
+
+
+@diagnostics_controller.route("/connection_pool")
+class ConnectionPoolController(Resource):
+    @api.marshal_with(ConnectionPoolStatisticsDto.model, mask=None, code=HttpStatusCode.OK.value)
+    def get(self):
+        """
+        Get statistics of connection pools used to communicate with Kubernetes Api server
+
+        :return: Connection pool statistics DTO
+        """
+        statistics = CRUDServiceProvider.get_instance().get_connection_pool_statistics()
+        return ConnectionPoolStatisticsDto(statistics)
+
+
+@diagnostics_controller.route("/resource_cache")
+class ResourceCacheController(Resource):
+    @api.marshal_with(ResourceCacheStatusDto.model, mask=None, code=HttpStatusCode.OK.value)
+    def get(self):
+        """
+        Get readiness and staleness of informer-backed resource cache
+
+        :return: Resource cache status DTO
+        """
+        status = CRUDServiceProvider.get_instance().get_resource_cache_status()
+        return ResourceCacheStatusDto(status)
+
+
+@diagnostics_controller.route("/read_coalescing")
+class ReadCoalescingController(Resource):
+    @api.marshal_with(ReadCoalescingStatisticsDto.model, mask=None, code=HttpStatusCode.OK.value)
+    def get(self):
+        """
+        Get number of Kubernetes Api reads executed and coalesced with identical in-flight reads
+
+        :return: Read coalescing statistics DTO
+        """
+        statistics = CRUDServiceProvider.get_instance().get_read_coalescing_statistics()
+        return ReadCoalescingStatisticsDto(statistics)
+
+
+@diagnostics_controller.route("/circuit_breaker")
+class CircuitBreakerController(Resource):
+    @api.marshal_with(CircuitBreakerStatusDto.model, mask=None, code=HttpStatusCode.OK.value)
+    def get(self):
+        """
+        Get state and failure rate of circuit breaker around Kubernetes Api calls
+
+        :return: Circuit breaker status DTO
+        """
+        status = CRUDServiceProvider.get_instance().get_circuit_breaker_status()
+        return CircuitBreakerStatusDto(status)
@@ -1,11 +1,23 @@
+import time
+
+from flask import request
 from flask_restplus import Resource
 
 from controllers.crud_controller import namespace_controller
+from controllers.utils.bulk_operation import run_bulk_operation, get_resource_name
+from controllers.utils.conditional_get import get_etag, get_etag_headers
 from controllers.utils.http_status_code import HttpStatusCode
+from controllers.utils.kind import Kind
+from controllers.utils.wait_condition import WaitCondition
+from controllers.utils.wait_options import WAIT_OPTIONS_DOC, get_wait_options
+from controllers.utils.write_operation import WRITE_OPERATION_DOC, run_write
+from dto.bulk_result_dto import BulkResultDto
 from dto.kube_api_response_dto import KubeApiResponseDto
 from dto.namespace_dto import NamespaceDto
+from dto.snapshot_dto import NamespaceSnapshotDto, ClusterSnapshotDto
+from dto.wait_result_dto import WaitResultDto
 from main import api
-from services.crud_service import CRUDService
+from services.crud_service_provider import CRUDServiceProvider
 
 
 @namespace_controller.route("/<string:name>/")
@@ -13,7 +25,8 @@ class NamespaceController(Resource):
     @api.marshal_with(NamespaceDto.model, mask=None, code=HttpStatusCode.OK.value)
     @api.doc(responses={
         HttpStatusCode.NotFound.value: 'Provided resource not found or namespace does not exist.',
-        HttpStatusCode.ServiceUnavailable.value: 'The service is unavailable.'
+        HttpStatusCode.ServiceUnavailable.value: 'The service is unavailable.',
+        HttpStatusCode.NotModified.value: 'Resource matches provided If-None-Match ETag.'
     })
     def get(self, name):
         """
@@ -22,15 +35,16 @@ class NamespaceController(Resource):
         :param name: Namespace name
         :return: Namespace manifest DTO
         """
-        namespace = CRUDService.get_instance().get_namespace(name)
-        return NamespaceDto(namespace)
+        namespace = CRUDServiceProvider.get_instance().get_namespace(name)
+        etag = get_etag(namespace)
+        return namespace, HttpStatusCode.OK.value, get_etag_headers(etag)
 
     @api.marshal_with(KubeApiResponseDto.model, mask=None, code=HttpStatusCode.Accepted.value)
     @api.doc(responses={
         HttpStatusCode.Conflict.value: 'Resource already exist.',
         HttpStatusCode.ServiceUnavailable.value: 'The service is unavailable.',
-        HttpStatusCode.Accepted.value: 'Resource created.'
-    })
+        HttpStatusCode.Accepted.value: 'Resource created or write operation queued.'
+    }, params=WRITE_OPERATION_DOC)
     def post(self, name):
         """
         Create Kubernetes Namespace resource
@@ -38,15 +52,17 @@ class NamespaceController(Resource):
         :param name: Namespace name
         :return: Kubernetes Api response DTO
         """
-        CRUDService.get_instance().create_namespace(name)
-        return KubeApiResponseDto('Resource created.'), HttpStatusCode.Accepted.value
+        service = CRUDServiceProvider.get_instance()
+        return run_write(
+            lambda: service.create_namespace(name), Kind.NAMESPACE, 'create', name, None, 'Resource created.'
+        )
 
     @api.marshal_with(KubeApiResponseDto.model, mask=None, code=HttpStatusCode.Accepted.value)
     @api.doc(responses={
         HttpStatusCode.NotFound.value: 'Provided resource not found or namespace does not exist.',
         HttpStatusCode.ServiceUnavailable.value: 'The service is unavailable.',
-        HttpStatusCode.Accepted.value: 'Resource deleted.'
-    })
+        HttpStatusCode.Accepted.value: 'Resource deleted or write operation queued.'
+    }, params=WRITE_OPERATION_DOC)
     def delete(self, name):
         """
         Delete Kubernetes Namespace resource
@@ -54,5 +70,104 @@ class NamespaceController(Resource):
         :param name: Namespace name
         :return: Kubernetes Api response DTO
         """
-        CRUDService.get_instance().delete_namespace(name)
-        return KubeApiResponseDto('Resource deleted.'), HttpStatusCode.Accepted.value
+        service = CRUDServiceProvider.get_instance()
+        return run_write(
+            lambda: service.delete_namespace(name), Kind.NAMESPACE, 'delete', name, None, 'Resource deleted.'
+        )
+
+
+@namespace_controller.route("/<string:name>/wait")
+class NamespaceWaitController(Resource):
+    @api.marshal_with(WaitResultDto.model, mask=None, code=HttpStatusCode.OK.value)
+    @api.doc(responses={
+        HttpStatusCode.OK.value: 'Namespace deleted or wait timed out.',
+        HttpStatusCode.BadRequest.value: 'Provided condition is not supported.',
+        HttpStatusCode.ServiceUnavailable.value: 'The service is unavailable or too many requests are waiting.'
+    }, params={'condition': 'Deleted (default)', **WAIT_OPTIONS_DOC})
+    def get(self, name):
+        """
+        Wait until deletion of Namespace and all its resources completes. All requests waiting for the same
+        Namespace are driven by single watch and released together.
+
+        :param name: Namespace name
+        :return: Wait result DTO
+        """
+        condition, timeout = get_wait_options(WaitCondition.DELETED)
+        start = time.monotonic()
+        result = CRUDServiceProvider.get_instance().wait_for_condition(
+            Kind.NAMESPACE, name, None, condition, timeout
+        )
+        return WaitResultDto(condition.value, result, time.monotonic() - start), HttpStatusCode.OK.value
+
+
+@namespace_controller.route("/<string:name>/snapshot")
+class NamespaceSnapshotController(Resource):
+    @api.marshal_with(NamespaceSnapshotDto.model, mask=None, code=HttpStatusCode.OK.value)
+    @api.doc(responses={
+        HttpStatusCode.NotFound.value: 'Provided resource not found or namespace does not exist.',
+        HttpStatusCode.ServiceUnavailable.value: 'The service is unavailable.'
+    })
+    def get(self, name):
+        """
+        Get Kubernetes Namespace resource together with its Pods and Services
+
+        :param name: Namespace name
+        :return: Namespace snapshot DTO
+        """
+        return CRUDServiceProvider.get_instance().get_namespace_snapshot(name), HttpStatusCode.OK.value
+
+
+@namespace_controller.route("/_snapshot")
+class ClusterSnapshotController(Resource):
+    @api.marshal_with(ClusterSnapshotDto.model, mask=None, code=HttpStatusCode.OK.value)
+    @api.doc(responses={
+        HttpStatusCode.ServiceUnavailable.value: 'The service is unavailable.'
+    })
+    def get(self):
+        """
+        Get all Kubernetes Namespace, Pod and Service resources of the cluster
+
+        :return: Cluster snapshot DTO
+        """
+        return CRUDServiceProvider.get_instance().get_cluster_snapshot(), HttpStatusCode.OK.value
+
+
+@namespace_controller.route("/_bulk")
+class NamespaceBulkController(Resource):
+    @api.marshal_with(BulkResultDto.model, mask=None, code=HttpStatusCode.MultiStatus.value)
+    @api.doc(responses={
+        HttpStatusCode.MultiStatus.value: 'Result of operation for every resource.',
+        HttpStatusCode.BadRequest.value: 'Invalid request body. Check if provided values are correct.'
+    })
+    def post(self):
+        """
+        Create many Kubernetes Namespace resources concurrently from array of Namespace names
+
+        :return: Bulk result DTO
+        """
+        service = CRUDServiceProvider.get_instance()
+        bulk_result = run_bulk_operation(
+            lambda name: service.create_namespace(get_resource_name(name)),
+            request.get_json(),
+            'Resource created.'
+        )
+        return bulk_result, HttpStatusCode.MultiStatus.value
+
+    @api.marshal_with(BulkResultDto.model, mask=None, code=HttpStatusCode.MultiStatus.value)
+    @api.doc(responses={
+        HttpStatusCode.MultiStatus.value: 'Result of operation for every resource.',
+        HttpStatusCode.BadRequest.value: 'Invalid request body. Check if provided values are correct.'
+    })
+    def delete(self):
+        """
+        Delete many Kubernetes Namespace resources concurrently from array of Namespace names
+
+        :return: Bulk result DTO
+        """
+        service = CRUDServiceProvider.get_instance()
+        bulk_result = run_bulk_operation(
+            lambda name: service.delete_namespace(get_resource_name(name)),
+            request.get_json(),
+            'Resource deleted.'
+        )
+        return bulk_result, HttpStatusCode.MultiStatus.value
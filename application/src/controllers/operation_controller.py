@@ -0,0 +1,27 @@
+from flask_restplus import Resource
+
+from controllers.crud_controller import operation_controller
+from controllers.utils.http_status_code import HttpStatusCode
+from dto.operation_dto import OperationDto
+from exceptions.kube_api_exceptions import ResourceNotFoundException
+from main import api
+from services.crud_service_provider import CRUDServiceProvider
+
+
+@operation_controller.route("/<string:operation_id>", endpoint='operation')
+class OperationController(Resource):
+    @api.marshal_with(OperationDto.model, mask=None, code=HttpStatusCode.OK.value)
+    @api.doc(responses={
+        HttpStatusCode.NotFound.value: 'Operation not found or expired.'
+    })
+    def get(self, operation_id):
+        """
+        Get progress of queued write operation
+
+        :param operation_id: Operation ID
+        :return: Operation DTO
+        """
+        operation = CRUDServiceProvider.get_instance().get_write_pipeline().get_operation(operation_id)
+        if operation is None:
+            raise ResourceNotFoundException('Operation not found or expired.')
+        return OperationDto(operation)
@@ -1,13 +1,25 @@
+import time
+
 from flask import request
 from flask_restplus import Resource
 from main import api
 from controllers.crud_controller import pod_controller
+from controllers.utils.bulk_operation import run_bulk_operation, get_manifest_name, get_resource_name
+from controllers.utils.conditional_get import get_etag, get_etag_headers
 from controllers.utils.http_status_code import HttpStatusCode
+from controllers.utils.kind import Kind
+from controllers.utils.patch_options import PATCH_OPTIONS_DOC, get_patch_options
+from controllers.utils.wait_condition import WaitCondition
+from controllers.utils.wait_options import WAIT_OPTIONS_DOC, get_wait_options
+from controllers.utils.write_operation import WRITE_OPERATION_DOC, run_write
+from dto.bulk_result_dto import BulkResultDto
 from dto.pod_dto import PodDto
 from dto.pod_input_dto import PodInputDto
 from dto.pod_update_dto import PodUpdateDto
 from dto.kube_api_response_dto import KubeApiResponseDto
-from services.crud_service import CRUDService
+from dto.patch_result_dto import PatchResultDto
+from dto.wait_result_dto import WaitResultDto
+from services.crud_service_provider import CRUDServiceProvider
 
 
 @pod_controller.route("/<string:name>/<string:namespace>/")
@@ -15,7 +27,8 @@ class PodController(Resource):
     @api.marshal_with(PodDto.model, mask=None, code=HttpStatusCode.OK.value)
     @api.doc(responses={
         HttpStatusCode.NotFound.value: 'Provided resource not found or namespace does not exist.',
-        HttpStatusCode.ServiceUnavailable.value: 'The service is unavailable.'
+        HttpStatusCode.ServiceUnavailable.value: 'The service is unavailable.',
+        HttpStatusCode.NotModified.value: 'Resource matches provided If-None-Match ETag.'
     })
     def get(self, name, namespace):
         """
@@ -25,8 +38,9 @@ class PodController(Resource):
         :param namespace: Namespace name
         :return: Pod manifest DTO
         """
-        pod = CRUDService.get_instance().get_pod(name, namespace)
-        return PodDto(pod)
+        pod = CRUDServiceProvider.get_instance().get_pod(name, namespace)
+        etag = get_etag(pod)
+        return pod, HttpStatusCode.OK.value, get_etag_headers(etag)
 
     @api.marshal_with(KubeApiResponseDto.model, mask=None, code=HttpStatusCode.Accepted.value)
     @api.expect(PodInputDto.model)
@@ -34,10 +48,10 @@ class PodController(Resource):
         HttpStatusCode.Conflict.value: 'Resource already exist.',
         HttpStatusCode.UnprocessableEntity.value: 'Invalid request body. Check if provided values are correct.',
         HttpStatusCode.ServiceUnavailable.value: 'The service is unavailable.',
-        HttpStatusCode.Accepted.value: 'Resource created.',
+        HttpStatusCode.Accepted.value: 'Resource created or write operation queued.',
         HttpStatusCode.NotFound.value: 'Provided resource not found or namespace does not exist.',
         HttpStatusCode.BadRequest.value: 'Invalid request body. Check if provided values are correct.'
-    })
+    }, params=WRITE_OPERATION_DOC)
     def post(self, name, namespace):
         """
         Create Kubernetes Pod resource
@@ -47,13 +61,13 @@ class PodController(Resource):
         :return: Kubernetes Api response DTO
         """
         pod_manifest = request.get_json()
-        CRUDService. \
-            get_instance(). \
-            create_pod(name, namespace, pod_manifest)
-        return KubeApiResponseDto('Resource created.'), \
-               HttpStatusCode.Accepted.value
+        service = CRUDServiceProvider.get_instance()
+        return run_write(
+            lambda: service.create_pod(name, namespace, pod_manifest),
+            Kind.POD, 'create', name, namespace, 'Resource created.'
+        )
 
-    @api.marshal_with(KubeApiResponseDto.model, mask=None, code=HttpStatusCode.Accepted.value)
+    @api.marshal_with(PatchResultDto.model, mask=None, code=HttpStatusCode.Accepted.value)
     @api.expect(PodUpdateDto.model)
     @api.doc(responses={
         HttpStatusCode.NotFound.value: 'Provided resource not found or namespace does not exist.',
@@ -61,25 +75,27 @@ class PodController(Resource):
         HttpStatusCode.ServiceUnavailable.value: 'The service is unavailable.',
         HttpStatusCode.Accepted.value: 'Resource updated.',
         HttpStatusCode.BadRequest.value: 'Invalid request body. Check if provided values are correct.'
-    })
+    }, params=PATCH_OPTIONS_DOC)
     def put(self, name, namespace):
         """
-        Update Kubernetes Pod resource
+        Update Kubernetes Pod resource with strategic merge patch, JSON merge patch or server-side apply
 
         :param name: Pod name
         :param namespace: Namespace name
-        :return: Kubernetes Api response DTO
+        :return: Patch result DTO with Pod as persisted by Api server
         """
         pod_manifest = request.get_json()
-        CRUDService.get_instance().update_pod(name, namespace, pod_manifest)
-        return KubeApiResponseDto('Resource updated.'), HttpStatusCode.Accepted.value
+        patch_options = get_patch_options()
+        pod = CRUDServiceProvider.get_instance().update_pod(name, namespace, pod_manifest, **patch_options)
+        message = 'Resource validated.' if patch_options['dry_run'] else 'Resource updated.'
+        return PatchResultDto(message, patch_options['dry_run'], pod), HttpStatusCode.Accepted.value
 
     @api.marshal_with(KubeApiResponseDto.model, mask=None, code=HttpStatusCode.Accepted.value)
     @api.doc(responses={
         HttpStatusCode.NotFound.value: 'Provided resource not found or namespace does not exist.',
         HttpStatusCode.ServiceUnavailable.value: 'The service is unavailable.',
-        HttpStatusCode.Accepted.value: 'Resource deleted.'
-    })
+        HttpStatusCode.Accepted.value: 'Resource deleted or write operation queued.'
+    }, params=WRITE_OPERATION_DOC)
     def delete(self, name, namespace):
         """
         Delete Kubernetes Pod resource
@@ -88,5 +104,76 @@ class PodController(Resource):
         :param namespace: Namespace name
         :return: Kubernetes Api response DTO
         """
-        CRUDService.get_instance().delete_pod(name, namespace)
-        return KubeApiResponseDto('Resource deleted.'), HttpStatusCode.Accepted.value
+        service = CRUDServiceProvider.get_instance()
+        return run_write(
+            lambda: service.delete_pod(name, namespace), Kind.POD, 'delete', name, namespace, 'Resource deleted.'
+        )
+
+
+@pod_controller.route("/<string:name>/<string:namespace>/wait")
+class PodWaitController(Resource):
+    @api.marshal_with(WaitResultDto.model, mask=None, code=HttpStatusCode.OK.value)
+    @api.doc(responses={
+        HttpStatusCode.OK.value: 'Condition met, Pod terminated before it became ready or wait timed out.',
+        HttpStatusCode.BadRequest.value: 'Provided condition is not supported.',
+        HttpStatusCode.ServiceUnavailable.value: 'The service is unavailable or too many requests are waiting.'
+    }, params={'condition': 'Ready (default) or Deleted', **WAIT_OPTIONS_DOC})
+    def get(self, name, namespace):
+        """
+        Wait until Pod is running with all containers ready or until it is deleted. Pod which does not exist yet
+        is waited for. All requests waiting for the same Pod are driven by single watch and released together.
+
+        :param name: Pod name
+        :param namespace: Namespace name
+        :return: Wait result DTO
+        """
+        condition, timeout = get_wait_options(WaitCondition.READY)
+        start = time.monotonic()
+        result = CRUDServiceProvider.get_instance().wait_for_condition(
+            Kind.POD, name, namespace, condition, timeout
+        )
+        return WaitResultDto(condition.value, result, time.monotonic() - start), HttpStatusCode.OK.value
+
+
+@pod_controller.route("/_bulk/<string:namespace>")
+class PodBulkController(Resource):
+    @api.marshal_with(BulkResultDto.model, mask=None, code=HttpStatusCode.MultiStatus.value)
+    @api.expect([PodInputDto.model])
+    @api.doc(responses={
+        HttpStatusCode.MultiStatus.value: 'Result of operation for every resource.',
+        HttpStatusCode.BadRequest.value: 'Invalid request body. Check if provided values are correct.'
+    })
+    def post(self, namespace):
+        """
+        Create many Kubernetes Pod resources concurrently from array of Pod manifests with metadata.name
+
+        :param namespace: Namespace name
+        :return: Bulk result DTO
+        """
+        service = CRUDServiceProvider.get_instance()
+        bulk_result = run_bulk_operation(
+            lambda manifest: service.create_pod(get_manifest_name(manifest), namespace, manifest),
+            request.get_json(),
+            'Resource created.'
+        )
+        return bulk_result, HttpStatusCode.MultiStatus.value
+
+    @api.marshal_with(BulkResultDto.model, mask=None, code=HttpStatusCode.MultiStatus.value)
+    @api.doc(responses={
+        HttpStatusCode.MultiStatus.value: 'Result of operation for every resource.',
+        HttpStatusCode.BadRequest.value: 'Invalid request body. Check if provided values are correct.'
+    })
+    def delete(self, namespace):
+        """
+        Delete many Kubernetes Pod resources concurrently from array of Pod names
+
+        :param namespace: Namespace name
+        :return: Bulk result DTO
+        """
+        service = CRUDServiceProvider.get_instance()
+        bulk_result = run_bulk_operation(
+            lambda name: service.delete_pod(get_resource_name(name), namespace),
+            request.get_json(),
+            'Resource deleted.'
+        )
+        return bulk_result, HttpStatusCode.MultiStatus.value
@@ -2,13 +2,21 @@ from flask import request
 from flask_restplus import Resource
 
 from controllers.crud_controller import service_controller
+from controllers.utils.bulk_operation import run_bulk_operation, get_manifest_name, get_resource_name
+from controllers.utils.conditional_get import get_etag, get_etag_headers
 from controllers.utils.http_status_code import HttpStatusCode
+from controllers.utils.kind import Kind
+from controllers.utils.patch_options import PATCH_OPTIONS_DOC, get_patch_options
+from controllers.utils.write_operation import WRITE_OPERATION_DOC, run_write
+from dto.bulk_result_dto import BulkResultDto
 from dto.kube_api_response_dto import KubeApiResponseDto
+from dto.patch_result_dto import PatchResultDto
 from dto.service_dto import ServiceDto
+from dto.service_endpoints_dto import ServiceEndpointsDto
 from dto.service_input_dto import ServiceInputDto
 from dto.service_update_dto import ServiceUpdateDto
 from main import api
-from services.crud_service import CRUDService
+from services.crud_service_provider import CRUDServiceProvider
 
 
 @service_controller.route("/<string:name>/<string:namespace>/")
@@ -16,7 +24,8 @@ class ServiceController(Resource):
     @api.marshal_with(ServiceDto.model, mask=None, code=HttpStatusCode.OK.value)
     @api.doc(responses={
         HttpStatusCode.NotFound.value: 'Provided resource not found or namespace does not exist.',
-        HttpStatusCode.ServiceUnavailable.value: 'The service is unavailable.'
+        HttpStatusCode.ServiceUnavailable.value: 'The service is unavailable.',
+        HttpStatusCode.NotModified.value: 'Resource matches provided If-None-Match ETag.'
     })
     def get(self, name, namespace):
         """
@@ -26,8 +35,9 @@ class ServiceController(Resource):
         :param namespace: Namespace name
         :return: Service manifest DTO
         """
-        service = CRUDService.get_instance().get_service(name, namespace)
-        return ServiceDto(service)
+        service = CRUDServiceProvider.get_instance().get_service(name, namespace)
+        etag = get_etag(service)
+        return service, HttpStatusCode.OK.value, get_etag_headers(etag)
 
     @api.marshal_with(KubeApiResponseDto.model, mask=None, code=HttpStatusCode.Accepted.value)
     @api.expect(ServiceInputDto.model)
@@ -35,10 +45,10 @@ class ServiceController(Resource):
         HttpStatusCode.Conflict.value: 'Resource already exist.',
         HttpStatusCode.UnprocessableEntity.value: 'Invalid request body. Check if provided values are correct.',
         HttpStatusCode.ServiceUnavailable.value: 'The service is unavailable.',
-        HttpStatusCode.Accepted.value: 'Resource created.',
+        HttpStatusCode.Accepted.value: 'Resource created or write operation queued.',
         HttpStatusCode.NotFound.value: 'Provided resource not found or namespace does not exist.',
         HttpStatusCode.BadRequest.value: 'Invalid request body. Check if provided values are correct.'
-    })
+    }, params=WRITE_OPERATION_DOC)
     def post(self, name, namespace):
         """
         Create Kubernetes Service resource
@@ -48,10 +58,13 @@ class ServiceController(Resource):
         :return: Kubernetes Api response DTO
         """
         service_manifest = request.get_json()
-        CRUDService.get_instance().create_service(name, namespace, service_manifest)
-        return KubeApiResponseDto('Resource created.'), HttpStatusCode.Accepted.value
+        service = CRUDServiceProvider.get_instance()
+        return run_write(
+            lambda: service.create_service(name, namespace, service_manifest),
+            Kind.SERVICE, 'create', name, namespace, 'Resource created.'
+        )
 
-    @api.marshal_with(KubeApiResponseDto.model, mask=None, code=HttpStatusCode.Accepted.value)
+    @api.marshal_with(PatchResultDto.model, mask=None, code=HttpStatusCode.Accepted.value)
     @api.expect(ServiceUpdateDto.model)
     @api.doc(responses={
         HttpStatusCode.NotFound.value: 'Provided resource not found or namespace does not exist.',
@@ -59,25 +72,27 @@ class ServiceController(Resource):
         HttpStatusCode.ServiceUnavailable.value: 'The service is unavailable.',
         HttpStatusCode.Accepted.value: 'Resource updated.',
         HttpStatusCode.BadRequest.value: 'Invalid request body. Check if provided values are correct.'
-    })
+    }, params=PATCH_OPTIONS_DOC)
     def put(self, name, namespace):
         """
-        Update Kubernetes Service resource
+        Update Kubernetes Service resource with strategic merge patch, JSON merge patch or server-side apply
 
         :param name: Service name
         :param namespace: Namespace name
-        :return: Kubernetes Api response DTO
+        :return: Patch result DTO with Service as persisted by Api server
         """
         service_manifest = request.get_json()
-        CRUDService.get_instance().update_service(name, namespace, service_manifest)
-        return KubeApiResponseDto('Resource updated.'), HttpStatusCode.Accepted.value
+        patch_options = get_patch_options()
+        service = CRUDServiceProvider.get_instance().update_service(name, namespace, service_manifest, **patch_options)
+        message = 'Resource validated.' if patch_options['dry_run'] else 'Resource updated.'
+        return PatchResultDto(message, patch_options['dry_run'], service), HttpStatusCode.Accepted.value
 
     @api.marshal_with(KubeApiResponseDto.model, mask=None, code=HttpStatusCode.Accepted.value)
     @api.doc(responses={
         HttpStatusCode.NotFound.value: 'Provided resource not found or namespace does not exist.',
         HttpStatusCode.ServiceUnavailable.value: 'The service is unavailable.',
-        HttpStatusCode.Accepted.value: 'Resource deleted.'
-    })
+        HttpStatusCode.Accepted.value: 'Resource deleted or write operation queued.'
+    }, params=WRITE_OPERATION_DOC)
     def delete(self, name, namespace):
         """
         Delete Kubernetes Service resource
@@ -86,5 +101,70 @@ class ServiceController(Resource):
         :param namespace: Namespace name
         :return: Kubernetes Api response DTO
         """
-        CRUDService.get_instance().delete_service(name, namespace)
-        return KubeApiResponseDto('Resource deleted.'), HttpStatusCode.Accepted.value
+        service = CRUDServiceProvider.get_instance()
+        return run_write(
+            lambda: service.delete_service(name, namespace),
+            Kind.SERVICE, 'delete', name, namespace, 'Resource deleted.'
+        )
+
+
+@service_controller.route("/<string:name>/<string:namespace>/endpoints")
+class ServiceEndpointsController(Resource):
+    @api.marshal_with(ServiceEndpointsDto.model, mask=None, code=HttpStatusCode.OK.value)
+    @api.doc(responses={
+        HttpStatusCode.NotFound.value: 'Provided resource not found or namespace does not exist.',
+        HttpStatusCode.ServiceUnavailable.value: 'The service is unavailable.'
+    })
+    def get(self, name, namespace):
+        """
+        Get ready Kubernetes Pods selected by Kubernetes Service
+
+        :param name: Service name
+        :param namespace: Namespace name
+        :return: Service endpoints DTO
+        """
+        return CRUDServiceProvider.get_instance().get_service_endpoints(name, namespace), HttpStatusCode.OK.value
+
+
+@service_controller.route("/_bulk/<string:namespace>")
+class ServiceBulkController(Resource):
+    @api.marshal_with(BulkResultDto.model, mask=None, code=HttpStatusCode.MultiStatus.value)
+    @api.expect([ServiceInputDto.model])
+    @api.doc(responses={
+        HttpStatusCode.MultiStatus.value: 'Result of operation for every resource.',
+        HttpStatusCode.BadRequest.value: 'Invalid request body. Check if provided values are correct.'
+    })
+    def post(self, namespace):
+        """
+        Create many Kubernetes Service resources concurrently from array of Service manifests with metadata.name
+
+        :param namespace: Namespace name
+        :return: Bulk result DTO
+        """
+        service = CRUDServiceProvider.get_instance()
+        bulk_result = run_bulk_operation(
+            lambda manifest: service.create_service(get_manifest_name(manifest), namespace, manifest),
+            request.get_json(),
+            'Resource created.'
+        )
+        return bulk_result, HttpStatusCode.MultiStatus.value
+
+    @api.marshal_with(BulkResultDto.model, mask=None, code=HttpStatusCode.MultiStatus.value)
+    @api.doc(responses={
+        HttpStatusCode.MultiStatus.value: 'Result of operation for every resource.',
+        HttpStatusCode.BadRequest.value: 'Invalid request body. Check if provided values are correct.'
+    })
+    def delete(self, namespace):
+        """
+        Delete many Kubernetes Service resources concurrently from array of Service names
+
+        :param namespace: Namespace name
+        :return: Bulk result DTO
+        """
+        service = CRUDServiceProvider.get_instance()
+        bulk_result = run_bulk_operation(
+            lambda name: service.delete_service(get_resource_name(name), namespace),
+            request.get_json(),
+            'Resource deleted.'
+        )
+        return bulk_result, HttpStatusCode.MultiStatus.value
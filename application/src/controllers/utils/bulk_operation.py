@@ -0,0 +1,102 @@
+from controllers.utils.http_status_code import HttpStatusCode
+from dto.apply_result_dto import ApplyItemResult, ApplyResultDto
+from dto.bulk_result_dto import BulkItemResult, BulkResultDto
+from exceptions.app_exceptions import ServiceUnavailable
+from exceptions.kube_api_exceptions import ResourceNotFoundException, ResourceAlreadyExistException, \
+    InvalidResourceManifestException
+from services.crud_service_provider import CRUDServiceProvider
+
+EXCEPTION_STATUS_CODES = {
+    ResourceNotFoundException: HttpStatusCode.NotFound,
+    ResourceAlreadyExistException: HttpStatusCode.Conflict,
+    InvalidResourceManifestException: HttpStatusCode.UnprocessableEntity,
+    ServiceUnavailable: HttpStatusCode.ServiceUnavailable
+}
+
+
+def get_manifest_name(manifest):
+    """
+    Get resource name from manifest passed to bulk create operation
+
+    :param manifest: Resource manifest body
+    :return: Resource name
+    """
+    metadata = manifest.get('metadata') if isinstance(manifest, dict) else None
+    if not isinstance(metadata, dict) or not metadata.get('name'):
+        raise InvalidResourceManifestException('Invalid request body. Check if provided values are correct.')
+    return metadata['name']
+
+
+def get_resource_name(name):
+    """
+    Get resource name passed to bulk delete operation
+
+    :param name: Resource name
+    :return: Resource name
+    """
+    if not isinstance(name, str) or not name:
+        raise InvalidResourceManifestException('Invalid request body. Check if provided values are correct.')
+    return name
+
+
+def run_bulk_operation(operation, items, success_message):
+    """
+    Run operation concurrently for every item and build per item result
+
+    :param operation: Function called with single item
+    :param items: List of resource names or manifests with metadata.name
+    :param success_message: Message returned for items which succeeded
+    :return: Bulk result DTO
+    """
+    if not isinstance(items, list):
+        raise InvalidResourceManifestException('Invalid request body. Check if provided values are correct.')
+    exceptions = CRUDServiceProvider.get_instance().execute_bulk_operation(operation, items)
+    results = []
+    for item, exception in zip(items, exceptions):
+        metadata = item.get('metadata') if isinstance(item, dict) else None
+        name = item if isinstance(item, str) else (metadata.get('name') if isinstance(metadata, dict) else None)
+        if exception is None:
+            results.append(BulkItemResult(name, HttpStatusCode.Accepted.value, success_message))
+        else:
+            status_code = EXCEPTION_STATUS_CODES.get(type(exception), HttpStatusCode.InternalServerError)
+            results.append(BulkItemResult(name, status_code.value, str(exception)))
+    return BulkResultDto(results)
+
+
+def run_bulk_apply(operation, manifests, dry_run):
+    """
+    Apply every manifest concurrently and build per manifest result carrying applied resource
+
+    :param operation: Function called with single manifest and returning applied resource
+    :param manifests: List of resource manifests with kind and metadata.name
+    :param dry_run: True if changes are not persisted
+    :return: Apply result DTO
+    """
+    if not isinstance(manifests, list):
+        raise InvalidResourceManifestException('Invalid request body. Check if provided values are correct.')
+
+    def apply(manifest):
+        try:
+            get_manifest_name(manifest)
+            return operation(manifest), None
+        except Exception as e:
+            return None, e
+
+    results = []
+    bulk_executor = CRUDServiceProvider.get_instance().get_bulk_executor()
+    for manifest, (resource, exception) in zip(manifests, bulk_executor.map(apply, manifests)):
+        if exception is None:
+            metadata = resource.get('metadata', {})
+            results.append(ApplyItemResult(
+                resource.get('kind'), metadata.get('namespace'), metadata.get('name'),
+                HttpStatusCode.OK.value, 'Resource applied.', resource
+            ))
+        else:
+            metadata = manifest.get('metadata') if isinstance(manifest, dict) else None
+            metadata = metadata if isinstance(metadata, dict) else {}
+            status_code = EXCEPTION_STATUS_CODES.get(type(exception), HttpStatusCode.InternalServerError)
+            results.append(ApplyItemResult(
+                manifest.get('kind') if isinstance(manifest, dict) else None, metadata.get('namespace'),
+                metadata.get('name'), status_code.value, str(exception)
+            ))
+    return ApplyResultDto(dry_run, results)
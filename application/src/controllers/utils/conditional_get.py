@@ -0,0 +1,31 @@
+from flask import request
+
+from exceptions.app_exceptions import ResourceNotModified
+
+
+def get_etag(resource):
+    """
+    Get ETag of Kubernetes resource derived from its resourceVersion and raise ResourceNotModified
+    if it matches If-None-Match request header, so matching responses skip DTO marshaling
+
+    :param resource: Kubernetes resource as Python dict
+    :return: ETag header value or None if resource has no resourceVersion
+    """
+    resource_version = resource.get('metadata', {}).get('resourceVersion')
+    if not resource_version:
+        return None
+    # Weak ETag, as the same resourceVersion is served in several encodings and content codings.
+    etag = f'W/"{resource_version}"'
+    if request.if_none_match.contains_weak(resource_version):
+        raise ResourceNotModified(etag)
+    return etag
+
+
+def get_etag_headers(etag):
+    """
+    Get response headers carrying ETag
+
+    :param etag: ETag header value or None
+    :return: Response headers
+    """
+    return {'ETag': etag} if etag else {}
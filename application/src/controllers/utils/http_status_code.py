@@ -4,8 +4,15 @@ from enum import Enum
 class HttpStatusCode(Enum):
     OK = 200
     Accepted = 202
+    MultiStatus = 207
+    NotModified = 304
     BadRequest = 400
     Conflict = 409
     NotFound = 404
+    Gone = 410
     UnprocessableEntity = 422
+    TooManyRequests = 429
+    InternalServerError = 500
+    BadGateway = 502
     ServiceUnavailable = 503
+    GatewayTimeout = 504
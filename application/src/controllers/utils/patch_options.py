@@ -0,0 +1,48 @@
+from flask import request
+
+from controllers.utils.patch_type import PatchType
+from exceptions.kube_api_exceptions import InvalidResourceManifestException
+
+
+def is_flag_set(name):
+    """
+    Check if boolean query parameter of request is set
+
+    :param name: Query parameter name
+    :return: True if query parameter is set to true or 1
+    """
+    return request.args.get(name, 'false').lower() in ('true', '1')
+
+
+def get_apply_options():
+    """
+    Get server-side apply options from query parameters of request
+
+    :return: Python dict with field_manager, force and dry_run keyword arguments
+    """
+    return {
+        'field_manager': request.args.get('fieldManager'),
+        'force': is_flag_set('force'),
+        'dry_run': is_flag_set('dryRun')
+    }
+
+
+def get_patch_options():
+    """
+    Get patch type and apply options from query parameters of request, strategic merge patch is used by default
+
+    :return: Python dict with patch_type, field_manager, force and dry_run keyword arguments
+    """
+    try:
+        patch_type = PatchType(request.args.get('patchType', PatchType.STRATEGIC.value))
+    except ValueError:
+        raise InvalidResourceManifestException('Provided patch type is not supported.')
+    return {'patch_type': patch_type, **get_apply_options()}
+
+
+PATCH_OPTIONS_DOC = {
+    'patchType': 'Patch type, one of strategic (default), merge and apply (server-side apply of full manifest)',
+    'fieldManager': 'Name of field manager owning applied fields',
+    'force': 'Take ownership of fields managed by other field managers, server-side apply only',
+    'dryRun': 'Validate and return patched resource without persisting it'
+}
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class PatchType(Enum):
+    APPLY = 'apply'
+    MERGE = 'merge'
+    STRATEGIC = 'strategic'
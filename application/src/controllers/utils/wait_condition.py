@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class WaitCondition(Enum):
+    READY = 'Ready'
+    DELETED = 'Deleted'
@@ -0,0 +1,27 @@
+from flask import request
+
+from common.app_configuration import AppConfiguration
+from controllers.utils.wait_condition import WaitCondition
+from exceptions.kube_api_exceptions import InvalidResourceManifestException
+
+DEFAULT_WAIT_TIMEOUT_SECONDS = 60
+
+
+def get_wait_options(default_condition):
+    """
+    Get wait condition and timeout from query parameters of request, timeout is capped by K8S_WAIT_MAX_TIMEOUT
+
+    :param default_condition: Condition waited for when condition query parameter is not provided
+    :return: Tuple of wait condition and timeout in seconds
+    """
+    try:
+        condition = WaitCondition(request.args.get('condition', default_condition.value))
+    except ValueError:
+        raise InvalidResourceManifestException('Provided condition is not supported.')
+    timeout = request.args.get('timeout', DEFAULT_WAIT_TIMEOUT_SECONDS, type=float)
+    return condition, min(max(timeout, 0), AppConfiguration.get_instance().get_wait_max_timeout())
+
+
+WAIT_OPTIONS_DOC = {
+    'timeout': f'Max number of seconds to wait, {DEFAULT_WAIT_TIMEOUT_SECONDS} by default'
+}
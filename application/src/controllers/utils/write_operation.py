@@ -0,0 +1,61 @@
+from flask import request, url_for
+
+from common.app_configuration import AppConfiguration
+from controllers.utils.bulk_operation import EXCEPTION_STATUS_CODES
+from controllers.utils.http_status_code import HttpStatusCode
+from dto.kube_api_response_dto import KubeApiResponseDto
+from exceptions.app_exceptions import ServiceUnavailable
+from services.crud_service_provider import CRUDServiceProvider
+
+WRITE_OPERATION_DOC = {
+    'Prefer': {
+        'in': 'header',
+        'description': 'respond-async queues write and returns ID of operation tracked at /operations/<id>'
+    }
+}
+
+
+def is_async_write_requested():
+    """
+    Check if write of request should be queued instead of being run before response is sent
+
+    :return: True if async writes are enabled or request was sent with Prefer: respond-async header
+    """
+    return AppConfiguration.get_instance().is_async_write_enabled() or \
+        'respond-async' in request.headers.get('Prefer', '')
+
+
+def run_write(write, kind, action, name, namespace, success_message):
+    """
+    Run write or queue it behind writes of the same namespace, so writes of one namespace are applied
+    in the order they were received
+
+    :param write: Function without arguments calling Kubernetes Api
+    :param kind: Kind of written resource
+    :param action: Write action, e.g. create or delete
+    :param name: Resource name
+    :param namespace: Namespace name, None for Namespace resources
+    :param success_message: Message returned when write succeeded
+    :return: Tuple of Kubernetes Api response DTO, status code and headers
+    """
+    if not is_async_write_requested():
+        write()
+        return KubeApiResponseDto(success_message), HttpStatusCode.Accepted.value, {}
+
+    def run():
+        try:
+            write()
+        except tuple(EXCEPTION_STATUS_CODES) as e:
+            return EXCEPTION_STATUS_CODES.get(type(e), HttpStatusCode.InternalServerError).value, str(e)
+        return HttpStatusCode.Accepted.value, success_message
+
+    operation = CRUDServiceProvider.get_instance().get_write_pipeline().submit(
+        namespace or name, run, {'kind': kind.value, 'action': action, 'name': name, 'namespace': namespace}
+    )
+    if operation is None:
+        raise ServiceUnavailable('Too many pending write operations. Try again later.')
+    headers = {
+        'Location': url_for('operation', operation_id=operation['id']),
+        'Preference-Applied': 'respond-async'
+    }
+    return KubeApiResponseDto('Operation queued.', operation['id']), HttpStatusCode.Accepted.value, headers
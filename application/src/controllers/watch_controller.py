@@ -0,0 +1,107 @@
+import queue
+
+from flask import Response, request, stream_with_context
+from flask_restplus import Resource
+
+from common.json_codec import JsonCodec
+from common.model_compiler import compile_model
+from controllers.utils.http_status_code import HttpStatusCode
+from controllers.utils.kind import Kind
+from dto.namespace_dto import NamespaceDto
+from dto.pod_dto import PodDto
+from dto.service_dto import ServiceDto
+from main import api
+from services.crud_service_provider import CRUDServiceProvider
+
+KEEPALIVE_INTERVAL_SECONDS = 15
+DTO_MODELS = {
+    Kind.POD.value: PodDto.model,
+    Kind.SERVICE.value: ServiceDto.model,
+    Kind.NAMESPACE.value: NamespaceDto.model
+}
+# Models are compiled on first event of their kind, so app startup does not pay for kinds nobody watches.
+dto_projections = {}
+
+
+def get_dto_projection(kind):
+    """
+    Get projection function of DTO model of kind, compiled on first use
+
+    :param kind: Resource kind
+    :return: Function projecting resource into Python dict
+    """
+    project = dto_projections.get(kind)
+    if project is None:
+        # Concurrent first events may compile model twice, both results are equal.
+        project = dto_projections[kind] = compile_model(DTO_MODELS[kind])
+    return project
+
+
+def get_event_payload(kind, event):
+    """
+    Convert watch event into payload reusing DTO shape of watched kind
+
+    :param kind: Resource kind
+    :param event: Watch event
+    :return: Event payload as Python dict
+    """
+    resource = event['object']
+    if event['type'] in ('ADDED', 'MODIFIED', 'DELETED'):
+        resource = get_dto_projection(kind)(resource)
+    return {'type': event['type'], 'object': resource}
+
+
+def format_server_sent_event(kind, event):
+    """
+    Format watch event as server-sent event, resourceVersion is used as event id
+
+    :param kind: Resource kind
+    :param event: Watch event
+    :return: Server-sent event bytes
+    """
+    resource_version = event['object'].get('metadata', {}).get('resourceVersion', '')
+    return b'id: %s\nevent: %s\ndata: %s\n\n' % (
+        resource_version.encode('utf-8'), event['type'].encode('utf-8'),
+        JsonCodec.dumps(get_event_payload(kind, event))
+    )
+
+
+@api.route('/watch/<string:namespace>/<string:kind>')
+class WatchController(Resource):
+    @api.produces(['text/event-stream'])
+    @api.doc(responses={
+        HttpStatusCode.NotFound.value: 'Provided kind is not supported.',
+        HttpStatusCode.ServiceUnavailable.value: 'The service is unavailable or too many watch streams are open.'
+    }, params={
+        'resourceVersion': 'resourceVersion to resume from, Last-Event-ID header is used when not provided'
+    })
+    def get(self, namespace, kind):
+        """
+        Stream changes of Kubernetes resources as server-sent events
+
+        :param namespace: Namespace name, ignored for Namespace kind
+        :param kind: Kind name
+        :return: Event stream with ADDED, MODIFIED, DELETED, BOOKMARK and ERROR events
+        """
+        resource_version = request.args.get('resourceVersion') or request.headers.get('Last-Event-ID')
+        crud_service = CRUDServiceProvider.get_instance()
+        watch_broadcaster, subscriber = crud_service.subscribe_to_watch(kind, namespace, resource_version)
+
+        def generate():
+            while True:
+                try:
+                    event = subscriber.events.get(timeout=KEEPALIVE_INTERVAL_SECONDS)
+                except queue.Empty:
+                    yield b': keepalive\n\n'
+                    continue
+                if event is None:
+                    return
+                yield format_server_sent_event(watch_broadcaster.kind, event)
+                if event['type'] == 'ERROR':
+                    return
+
+        response = Response(stream_with_context(generate()), mimetype='text/event-stream',
+                            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+        # Unlike finally block of generator, close callback runs also when client leaves before first event.
+        response.call_on_close(lambda: crud_service.unsubscribe_from_watch(watch_broadcaster, subscriber))
+        return response
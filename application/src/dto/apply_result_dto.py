@@ -0,0 +1,38 @@
+from flask_restplus import fields
+from main import api
+
+
+class ApplyItemResult:
+    model = api.model(
+        'ApplyItemResult',
+        {
+            'kind': fields.String(),
+            'namespace': fields.String(),
+            'name': fields.String(),
+            'code': fields.Integer(),
+            'message': fields.String(),
+            'resource': fields.Raw()
+        }
+    )
+
+    def __init__(self, kind, namespace, name, code, message, resource=None):
+        self.kind = kind
+        self.namespace = namespace
+        self.name = name
+        self.code = code
+        self.message = message
+        self.resource = resource
+
+
+class ApplyResultDto:
+    model = api.model(
+        'ApplyResult',
+        {
+            'dry_run': fields.Boolean(),
+            'results': fields.List(fields.Nested(ApplyItemResult.model))
+        }
+    )
+
+    def __init__(self, dry_run, results):
+        self.dry_run = dry_run
+        self.results = results
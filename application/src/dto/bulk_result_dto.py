@@ -0,0 +1,30 @@
+from flask_restplus import fields
+from main import api
+
+
+class BulkItemResult:
+    model = api.model(
+        'BulkItemResult',
+        {
+            'name': fields.String(),
+            'code': fields.Integer(),
+            'message': fields.String()
+        }
+    )
+
+    def __init__(self, name, code, message):
+        self.name = name
+        self.code = code
+        self.message = message
+
+
+class BulkResultDto:
+    model = api.model(
+        'BulkResult',
+        {
+            'results': fields.List(fields.Nested(BulkItemResult.model))
+        }
+    )
+
+    def __init__(self, results):
+        self.results = results
@@ -0,0 +1,22 @@
+from flask_restplus import fields
+from main import api
+
+
+class CircuitBreakerStatusDto:
+    model = api.model(
+        'CircuitBreakerStatus',
+        {
+            'enabled': fields.Boolean(),
+            'state': fields.String(),
+            'failure_rate': fields.Float(),
+            'tracked_calls': fields.Integer(),
+            'open_seconds': fields.Float()
+        }
+    )
+
+    def __init__(self, status):
+        self.enabled = status['enabled']
+        self.state = status['state']
+        self.failure_rate = status['failure_rate']
+        self.tracked_calls = status['tracked_calls']
+        self.open_seconds = status['open_seconds']
@@ -0,0 +1,40 @@
+from flask_restplus import fields
+from main import api
+
+
+class ConnectionPool:
+    model = api.model(
+        'ConnectionPool',
+        {
+            'host': fields.String(),
+            'port': fields.Integer(),
+            'scheme': fields.String(),
+            'max_size': fields.Integer(),
+            'idle_connections': fields.Integer(),
+            'num_connections': fields.Integer(),
+            'num_requests': fields.Integer()
+        }
+    )
+
+    def __init__(self, pool):
+        self.host = pool['host']
+        self.port = pool['port']
+        self.scheme = pool['scheme']
+        self.max_size = pool['max_size']
+        self.idle_connections = pool['idle_connections']
+        self.num_connections = pool['num_connections']
+        self.num_requests = pool['num_requests']
+
+
+class ConnectionPoolStatisticsDto:
+    model = api.model(
+        'ConnectionPoolStatistics',
+        {
+            'max_size': fields.Integer(),
+            'pools': fields.List(fields.Nested(ConnectionPool.model))
+        }
+    )
+
+    def __init__(self, statistics):
+        self.max_size = statistics['max_size']
+        self.pools = [ConnectionPool(pool) for pool in statistics['pools']]
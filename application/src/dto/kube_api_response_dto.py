@@ -6,9 +6,11 @@ class KubeApiResponseDto:
     model = api.model(
         'KubeApiResponse',
         {
-            'message': fields.String()
+            'message': fields.String(),
+            'operation_id': fields.String(description='ID of queued write operation, tracked at /operations/<id>')
         }
     )
 
-    def __init__(self, message):
+    def __init__(self, message, operation_id=None):
         self.message = message
+        self.operation_id = operation_id
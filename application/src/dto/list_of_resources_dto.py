@@ -7,8 +7,12 @@ class ListOfResourcesDto:
         'ListOfResources',
         {
             'resources': fields.List(fields.String()),
+            'continue': fields.String(attribute='continue_token'),
+            'items': fields.List(fields.Raw())
         }
     )
 
-    def __init__(self, resources):
+    def __init__(self, resources, with_items=False):
         self.resources = [resource['metadata']['name'] for resource in resources['items']]
+        self.continue_token = resources.get('metadata', {}).get('continue') or None
+        self.items = resources['items'] if with_items else None
@@ -10,9 +10,6 @@ class NamespaceMetadata:
         }
     )
 
-    def __init__(self, metadata):
-        self.name = metadata['name']
-
 
 class NamespaceSpec:
     model = api.model(
@@ -22,9 +19,6 @@ class NamespaceSpec:
         }
     )
 
-    def __init__(self, spec):
-        self.finalizers = spec['finalizers']
-
 
 class NamespaceDto:
     model = api.model(
@@ -34,13 +28,6 @@ class NamespaceDto:
             'status': fields.String(),
             'kind': fields.String(),
             'spec': fields.Nested(NamespaceSpec.model),
-            'api_version': fields.String()
+            'api_version': fields.String(attribute='apiVersion')
         }
     )
-
-    def __init__(self, namespace):
-        self.metadata = NamespaceMetadata(namespace['metadata'])
-        self.status = namespace['status']
-        self.kind = namespace['kind']
-        self.spec = NamespaceSpec(namespace['spec'])
-        self.api_version = namespace['apiVersion']
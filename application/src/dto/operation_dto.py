@@ -0,0 +1,34 @@
+from flask_restplus import fields
+from main import api
+
+
+class OperationDto:
+    model = api.model(
+        'Operation',
+        {
+            'id': fields.String(),
+            'kind': fields.String(),
+            'action': fields.String(),
+            'name': fields.String(),
+            'namespace': fields.String(),
+            'status': fields.String(description='pending, running, succeeded or failed'),
+            'code': fields.Integer(description='HTTP status code the write would have been answered with'),
+            'message': fields.String(),
+            'created': fields.Float(description='Unix time the operation was queued'),
+            'started': fields.Float(),
+            'finished': fields.Float()
+        }
+    )
+
+    def __init__(self, operation):
+        self.id = operation['id']
+        self.kind = operation['kind']
+        self.action = operation['action']
+        self.name = operation['name']
+        self.namespace = operation['namespace']
+        self.status = operation['status']
+        self.code = operation['code']
+        self.message = operation['message']
+        self.created = operation['created']
+        self.started = operation['started']
+        self.finished = operation['finished']
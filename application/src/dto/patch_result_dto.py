@@ -0,0 +1,18 @@
+from flask_restplus import fields
+from main import api
+
+
+class PatchResultDto:
+    model = api.model(
+        'PatchResult',
+        {
+            'message': fields.String(),
+            'dry_run': fields.Boolean(),
+            'resource': fields.Raw()
+        }
+    )
+
+    def __init__(self, message, dry_run, resource):
+        self.message = message
+        self.dry_run = dry_run
+        self.resource = resource
@@ -10,9 +10,6 @@ class PodLabel:
         }
     )
 
-    def __init__(self, labels):
-        self.app = labels['app']
-
 
 class PodMetadata:
     model = api.model(
@@ -24,29 +21,18 @@ class PodMetadata:
         }
     )
 
-    def __init__(self, metadata):
-        self.name = metadata['name']
-        self.labels = PodLabel(metadata['labels'])
-        self.namespace = metadata['namespace']
-
 
 class PodSpec:
     model = api.model(
         'PodSpec',
         {
-            'service_account': fields.String(),
-            'node_name': fields.String(),
-            'security_context': fields.String(),
-            'service_account_name': fields.String()
+            'service_account': fields.String(attribute='serviceAccount'),
+            'node_name': fields.String(attribute='nodeName'),
+            'security_context': fields.String(attribute='securityContext'),
+            'service_account_name': fields.String(attribute='serviceAccountName')
         }
     )
 
-    def __init__(self, spec):
-        self.service_account = spec['serviceAccount']
-        self.node_name = spec['nodeName']
-        self.security_context = spec['securityContext']
-        self.service_account_name = spec['serviceAccountName']
-
 
 class PodContainerStatus:
     model = api.model(
@@ -57,28 +43,18 @@ class PodContainerStatus:
         }
     )
 
-    def __init__(self, container_status):
-        self.ready = container_status['ready']
-        self.image = container_status['image']
-
 
 class PodStatus:
     model = api.model(
         'PodStatus',
         {
             'phase': fields.String(),
-            'container_statuses': fields.List(fields.Nested(PodContainerStatus.model)),
-            'pod_ip': fields.String(),
-            'host_ip': fields.String()
+            'container_statuses': fields.List(fields.Nested(PodContainerStatus.model), attribute='containerStatuses'),
+            'pod_ip': fields.String(attribute='podIP'),
+            'host_ip': fields.String(attribute='hostIP')
         }
     )
 
-    def __init__(self, status):
-        self.phase = status['phase']
-        self.container_statuses = [PodContainerStatus(container) for container in status['containerStatuses']]
-        self.pod_ip = status['podIP']
-        self.host_ip = status['hostIP']
-
 
 class PodDto:
     model = api.model(
@@ -88,13 +64,6 @@ class PodDto:
             'status': fields.Nested(PodStatus.model),
             'kind': fields.String(),
             'spec': fields.Nested(PodSpec.model),
-            'api_version': fields.String()
+            'api_version': fields.String(attribute='apiVersion')
         }
     )
-
-    def __init__(self, pod):
-        self.metadata = PodMetadata(pod['metadata'])
-        self.status = PodStatus(pod['status'])
-        self.kind = pod['kind']
-        self.spec = PodSpec(pod['spec'])
-        self.api_version = pod['apiVersion']
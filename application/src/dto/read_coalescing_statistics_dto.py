@@ -0,0 +1,20 @@
+from flask_restplus import fields
+from main import api
+
+
+class ReadCoalescingStatisticsDto:
+    model = api.model(
+        'ReadCoalescingStatistics',
+        {
+            'enabled': fields.Boolean(),
+            'in_flight_calls': fields.Integer(),
+            'executed_calls': fields.Integer(),
+            'coalesced_calls': fields.Integer()
+        }
+    )
+
+    def __init__(self, statistics):
+        self.enabled = statistics['enabled']
+        self.in_flight_calls = statistics['in_flight_calls']
+        self.executed_calls = statistics['executed_calls']
+        self.coalesced_calls = statistics['coalesced_calls']
@@ -0,0 +1,38 @@
+from flask_restplus import fields
+from main import api
+
+
+class InformerStatus:
+    model = api.model(
+        'InformerStatus',
+        {
+            'kind': fields.String(),
+            'synced': fields.Boolean(),
+            'fresh': fields.Boolean(),
+            'staleness_seconds': fields.Float(),
+            'resource_version': fields.String(),
+            'size': fields.Integer()
+        }
+    )
+
+    def __init__(self, status):
+        self.kind = status['kind']
+        self.synced = status['synced']
+        self.fresh = status['fresh']
+        self.staleness_seconds = status['staleness_seconds']
+        self.resource_version = status['resource_version']
+        self.size = status['size']
+
+
+class ResourceCacheStatusDto:
+    model = api.model(
+        'ResourceCacheStatus',
+        {
+            'enabled': fields.Boolean(),
+            'informers': fields.List(fields.Nested(InformerStatus.model))
+        }
+    )
+
+    def __init__(self, status):
+        self.enabled = status['enabled']
+        self.informers = [InformerStatus(informer) for informer in status['informers']]
@@ -11,10 +11,6 @@ class ServiceMetadata:
         }
     )
 
-    def __init__(self, metadata):
-        self.name = metadata['name']
-        self.namespace = metadata['namespace']
-
 
 class ServiceSelector:
     model = api.model(
@@ -24,9 +20,6 @@ class ServiceSelector:
         }
     )
 
-    def __init__(self, selector):
-        self.app = selector['app']
-
 
 class ServicePort:
     model = api.model(
@@ -34,33 +27,22 @@ class ServicePort:
         {
             'port': fields.String(),
             'protocol': fields.String(),
-            'target_port': fields.String()
+            'target_port': fields.String(attribute='targetPort')
         }
     )
 
-    def __init__(self, port):
-        self.port = port['port']
-        self.protocol = port['protocol']
-        self.target_port = port['targetPort']
-
 
 class ServiceSpec:
     model = api.model(
         'ServiceSpec',
         {
             'selector': fields.Nested(ServiceSelector.model),
-            'cluster_ip': fields.String(),
+            'cluster_ip': fields.String(attribute='clusterIP'),
             'type': fields.String(),
             'ports': fields.List(fields.Nested(ServicePort.model))
         }
     )
 
-    def __init__(self, spec):
-        self.selector = ServiceSelector(spec['selector'])
-        self.cluster_ip = spec['clusterIP']
-        self.type = spec['type']
-        self.ports = [ServicePort(port) for port in spec['ports']]
-
 
 class ServiceDto:
     model = api.model(
@@ -69,12 +51,6 @@ class ServiceDto:
             'metadata': fields.Nested(ServiceMetadata.model),
             'kind': fields.String(),
             'spec': fields.Nested(ServiceSpec.model),
-            'api_version': fields.String()
+            'api_version': fields.String(attribute='apiVersion')
         }
     )
-
-    def __init__(self, service):
-        self.metadata = ServiceMetadata(service['metadata'])
-        self.kind = service['kind']
-        self.spec = ServiceSpec(service['spec'])
-        self.api_version = service['apiVersion']
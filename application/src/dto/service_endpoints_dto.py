@@ -0,0 +1,25 @@
+from flask_restplus import fields
+from main import api
+
+
+class ServiceEndpoint:
+    model = api.model(
+        'ServiceEndpoint',
+        {
+            'name': fields.String(),
+            'pod_ip': fields.String(),
+            'node_name': fields.String()
+        }
+    )
+
+
+class ServiceEndpointsDto:
+    model = api.model(
+        'ServiceEndpoints',
+        {
+            'name': fields.String(),
+            'namespace': fields.String(),
+            'selector': fields.Raw(),
+            'endpoints': fields.List(fields.Nested(ServiceEndpoint.model))
+        }
+    )
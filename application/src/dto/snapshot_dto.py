@@ -0,0 +1,27 @@
+from flask_restplus import fields
+from main import api
+from dto.namespace_dto import NamespaceDto
+from dto.pod_dto import PodDto
+from dto.service_dto import ServiceDto
+
+
+class NamespaceSnapshotDto:
+    model = api.model(
+        'NamespaceSnapshot',
+        {
+            'namespace': fields.Nested(NamespaceDto.model),
+            'pods': fields.List(fields.Nested(PodDto.model)),
+            'services': fields.List(fields.Nested(ServiceDto.model))
+        }
+    )
+
+
+class ClusterSnapshotDto:
+    model = api.model(
+        'ClusterSnapshot',
+        {
+            'namespaces': fields.List(fields.Nested(NamespaceDto.model)),
+            'pods': fields.List(fields.Nested(PodDto.model)),
+            'services': fields.List(fields.Nested(ServiceDto.model))
+        }
+    )
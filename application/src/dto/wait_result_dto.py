@@ -0,0 +1,20 @@
+from flask_restplus import fields
+from main import api
+
+
+class WaitResultDto:
+    model = api.model(
+        'WaitResult',
+        {
+            'condition': fields.String(),
+            'met': fields.Boolean(),
+            'result': fields.String(description='met, unsatisfiable or timeout'),
+            'waited_seconds': fields.Float()
+        }
+    )
+
+    def __init__(self, condition, result, waited_seconds):
+        self.condition = condition
+        self.met = result == 'met'
+        self.result = result
+        self.waited_seconds = waited_seconds
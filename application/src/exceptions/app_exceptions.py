@@ -1,3 +1,10 @@
 class ServiceUnavailable(Exception):
-    def __init__(self, message):
+    def __init__(self, message, retry_after=None):
         super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ResourceNotModified(Exception):
+    def __init__(self, etag):
+        super().__init__('Resource not modified.')
+        self.etag = etag
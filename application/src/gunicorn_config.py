@@ -0,0 +1,47 @@
+"""
+Gunicorn configuration used to serve the app in production.
+Every setting can be tuned with environment variables set in Helm chart values.
+"""
+import os
+import threading
+
+bind = f"0.0.0.0:{os.environ.get('GUNICORN_PORT', '5000')}"
+workers = int(os.environ.get('GUNICORN_WORKERS', '2'))
+# Watch streams and waits hold a thread each while they are open. Together they are capped at threads minus
+# K8S_RESERVED_THREADS per worker, so the reserved threads always serve other requests. K8S_WATCH_MAX_STREAMS and
+# K8S_WAIT_MAX_CONCURRENT default to that cap and can only lower it.
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+backlog = int(os.environ.get('GUNICORN_BACKLOG', '2048'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', '5'))
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '0'))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', '0'))
+# App is imported once by master and shared with forked workers.
+preload_app = os.environ.get('GUNICORN_PRELOAD_APP', 'False') == 'True'
+
+# Heartbeat files on tmpfs, container overlay filesystems may block workers on fsync.
+worker_tmp_dir = '/dev/shm'
+accesslog = '-'
+errorlog = '-'
+
+
+def child_exit(server, worker):
+    # Remove metrics of exited worker when metrics are aggregated between workers.
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def when_ready(server):
+    # Preloaded master imports services deferred at app startup, so forked workers start with them imported.
+    if preload_app:
+        from services.crud_service_provider import CRUDServiceProvider
+        CRUDServiceProvider.import_services()
+
+
+def post_worker_init(worker):
+    # Services deferred at app startup are imported in background, while worker already accepts requests.
+    from services.crud_service_provider import CRUDServiceProvider
+    threading.Thread(target=CRUDServiceProvider.import_services, name='import-services', daemon=True).start()
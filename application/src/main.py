@@ -4,7 +4,9 @@ from common.app_configuration import AppConfiguration
 
 app = Flask(__name__)
 api = AppConfiguration.get_instance().get_api_configuration(app)
-AppConfiguration.get_instance().configure_k8s_connectivity()
+AppConfiguration.get_instance().configure_request_metrics(app)
+AppConfiguration.get_instance().configure_response_compression(app)
+AppConfiguration.get_instance().configure_swagger_spec(app, api)
 
 # Required by Flask for splitting routes between many python modules
 from controllers.crud_controller import *
@@ -0,0 +1,118 @@
+import threading
+import time
+from collections import deque
+from enum import Enum
+
+
+class CircuitState(Enum):
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker tracking outcomes of recent calls in sliding window. Circuit opens once share of failed
+    or slow calls crosses threshold and calls are rejected without being made. After open duration limited
+    number of probe calls is let through, circuit closes if all of them succeed and opens again otherwise.
+    """
+
+    def __init__(self, failure_rate_threshold, slow_call_duration, window_size, min_calls, open_duration,
+                 half_open_calls):
+        """
+        :param failure_rate_threshold: Share of failed or slow calls in window opening circuit, between 0 and 1
+        :param slow_call_duration: Number of seconds after which successful call is counted as failure
+        :param window_size: Number of most recent calls tracked
+        :param min_calls: Min number of tracked calls before failure rate is evaluated
+        :param open_duration: Number of seconds calls are rejected before circuit is probed
+        :param half_open_calls: Number of probe calls let through while circuit is half-open
+        """
+        self._failure_rate_threshold = failure_rate_threshold
+        self._slow_call_duration = slow_call_duration
+        self._min_calls = max(min_calls, 1)
+        self._open_duration = open_duration
+        self._half_open_calls = max(half_open_calls, 1)
+        self._outcomes = deque(maxlen=max(window_size, self._min_calls))
+        self._state = CircuitState.CLOSED
+        self._opened_at = None
+        self._probe_permits = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+
+    def get_state(self):
+        """
+        Get current state, open circuit becomes half-open once open duration elapses
+
+        :return: Circuit state
+        """
+        with self._lock:
+            self._update_state()
+            return self._state
+
+    def allow(self):
+        """
+        Check if call can be made, permit of probe call is taken while circuit is half-open
+
+        :return: False if call should be rejected
+        """
+        with self._lock:
+            self._update_state()
+            if self._state == CircuitState.CLOSED:
+                return True
+            if self._state == CircuitState.HALF_OPEN and self._probe_permits > 0:
+                self._probe_permits -= 1
+                return True
+            return False
+
+    def record(self, failed, duration):
+        """
+        Record outcome of call made after it was allowed
+
+        :param failed: True if call failed
+        :param duration: Call duration in seconds
+        """
+        failed = failed or duration >= self._slow_call_duration
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                if failed:
+                    self._open()
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self._half_open_calls:
+                        self._state = CircuitState.CLOSED
+                        self._outcomes.clear()
+            elif self._state == CircuitState.CLOSED:
+                self._outcomes.append(failed)
+                if len(self._outcomes) >= self._min_calls and self.get_failure_rate() >= self._failure_rate_threshold:
+                    self._open()
+
+    def get_failure_rate(self):
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def get_status(self):
+        """
+        Get state and failure rate of circuit
+
+        :return: Circuit breaker status as Python dict
+        """
+        with self._lock:
+            self._update_state()
+            return {
+                'state': self._state.value,
+                'failure_rate': self.get_failure_rate(),
+                'tracked_calls': len(self._outcomes),
+                'open_seconds': time.monotonic() - self._opened_at if self._state != CircuitState.CLOSED else None
+            }
+
+    def _open(self):
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+
+    def _update_state(self):
+        if self._state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self._open_duration:
+            self._state = CircuitState.HALF_OPEN
+            self._probe_permits = self._half_open_calls
+            self._probe_successes = 0
@@ -0,0 +1,44 @@
+import threading
+
+
+class ConcurrencyLimiter:
+    """
+    Bounds number of long-lived requests of one type, e.g. watch streams, held by worker process at once.
+    Requests over the limit are rejected instead of queued, as each of them pins a server thread.
+    """
+
+    def __init__(self, limit):
+        """
+        :param limit: Max number of concurrently held slots
+        """
+        self._limit = limit
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        """
+        Take slot if limit is not reached
+
+        :return: True if slot was taken
+        """
+        with self._lock:
+            if self._active >= self._limit:
+                return False
+            self._active += 1
+            return True
+
+    def release(self):
+        """
+        Return slot taken by try_acquire
+        """
+        with self._lock:
+            self._active -= 1
+
+    def get_statistics(self):
+        """
+        Get number of held slots and limit
+
+        :return: Statistics as Python dict
+        """
+        with self._lock:
+            return {'active': self._active, 'limit': self._limit}
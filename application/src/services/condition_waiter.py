@@ -0,0 +1,93 @@
+import threading
+from enum import Enum
+
+
+class WaitState(Enum):
+    WAITING = 'waiting'
+    MET = 'met'
+    UNSATISFIABLE = 'unsatisfiable'
+    INTERRUPTED = 'interrupted'
+
+
+def get_wait_result(state):
+    """
+    Get result of finished wait reported to clients
+
+    :param state: Final wait state
+    :return: met, unsatisfiable or timeout
+    """
+    return 'timeout' if state in (WaitState.WAITING, WaitState.INTERRUPTED) else state.value
+
+
+class ConditionWaiter:
+    """
+    Watch subscriber evaluating condition of single resource on every event instead of queuing events.
+    All requests waiting for the same condition share one waiter and are released together.
+    """
+
+    def __init__(self, name, evaluate):
+        """
+        :param name: Resource name
+        :param evaluate: Function called with resource as Python dict or None if resource does not exist
+            and returning wait state
+        """
+        self.closed = False
+        self.waiters = 0
+        self.watch_broadcaster = None
+        self.state = WaitState.WAITING
+        self._name = name
+        self._evaluate = evaluate
+        self._released = threading.Event()
+        self._lock = threading.Lock()
+
+    def send(self, event):
+        """
+        Evaluate condition if watch event is about waited resource
+
+        :param event: Watch event
+        :return: Always True, waiter never falls behind upstream watch
+        """
+        resource = event['object']
+        if event['type'] in ('ADDED', 'MODIFIED', 'DELETED') and \
+                resource.get('metadata', {}).get('name') == self._name:
+            self.update(None if event['type'] == 'DELETED' else resource)
+        return True
+
+    def close(self, event=None):
+        """
+        Release waiters whose condition can no longer be tracked, e.g. after upstream watch failed
+
+        :param event: Final watch event
+        """
+        self.closed = True
+        self.release(WaitState.INTERRUPTED)
+
+    def update(self, resource):
+        """
+        Evaluate condition against current state of resource
+
+        :param resource: Resource as Python dict or None if resource does not exist
+        """
+        state = self._evaluate(resource)
+        if state != WaitState.WAITING:
+            self.release(state)
+
+    def release(self, state):
+        with self._lock:
+            if self._released.is_set():
+                return
+            self.state = state
+            self._released.set()
+
+    def is_released(self):
+        return self._released.is_set()
+
+    def wait(self, timeout):
+        """
+        Block until waiter is released or timeout elapses
+
+        :param timeout: Number of seconds to wait
+        :return: Wait state, WAITING if timeout elapsed
+        """
+        self._released.wait(timeout)
+        return self.state
@@ -1,29 +1,374 @@
-import json
+import functools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from kubernetes import client
 from kubernetes.client.exceptions import ApiException
+from urllib3.exceptions import HTTPError
 
+from common.app_configuration import AppConfiguration
+from common.json_codec import JsonCodec
+from common.metrics import Metrics
 from controllers.utils.http_status_code import HttpStatusCode
 from controllers.utils.kind import Kind
+from controllers.utils.patch_type import PatchType
 from exceptions.app_exceptions import ServiceUnavailable
 from exceptions.kube_api_exceptions import ResourceNotFoundException, ResourceAlreadyExistException, \
     InvalidResourceManifestException
+from controllers.utils.wait_condition import WaitCondition
+from services.circuit_breaker import CircuitBreaker, CircuitState
+from services.concurrency_limiter import ConcurrencyLimiter
+from services.condition_waiter import ConditionWaiter, WaitState, get_wait_result
+from services.field_projection import is_metadata_only, project_fields
+from services.rate_limiter import RateLimiter
+from services.resource_cache import ResourceCache, LABEL_INDEX, get_label_index_keys
+from services.single_flight import SingleFlight
+from services.watch_broadcaster import WatchBroadcaster
+from services.write_pipeline import OperationStore, SharedOrder, WritePipeline
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Server errors after which reads are retried.
+RETRIABLE_READ_STATUS_CODES = (
+    HttpStatusCode.InternalServerError.value, HttpStatusCode.BadGateway.value,
+    HttpStatusCode.ServiceUnavailable.value, HttpStatusCode.GatewayTimeout.value
+)
+# Content types selecting how Api server applies patch body, apply patch body has to be full object manifest.
+PATCH_CONTENT_TYPES = {
+    PatchType.APPLY: 'application/apply-patch+yaml',
+    PatchType.MERGE: 'application/merge-patch+json',
+    PatchType.STRATEGIC: 'application/strategic-merge-patch+json'
+}
+# Ask Api server to return only metadata of listed objects, full objects are returned by servers not supporting it.
+PARTIAL_OBJECT_METADATA_LIST_ACCEPT = (
+    'application/json;as=PartialObjectMetadataList;v=v1;g=meta.k8s.io,application/json'
+)
+# Broadcasters without subscribers are dropped after this time, so watches of many namespaces do not pile up.
+WATCH_BROADCASTER_IDLE_SECONDS = 60
+# Seconds clients rejected because too many long-lived requests are held should wait before retrying.
+RETRY_AFTER_SECONDS = 5
 
 
 class CRUDService:
     _instance = None
+    _instance_lock = threading.Lock()
 
     @staticmethod
     def get_instance():
         if CRUDService._instance is None:
-            CRUDService()
+            with CRUDService._instance_lock:
+                if CRUDService._instance is None:
+                    CRUDService()
         return CRUDService._instance
 
     def __init__(self):
         if CRUDService._instance is not None:
             raise Exception('This class is a singleton!')
-        else:
-            CRUDService._instance = self
+        self._api_client = None
+        self._core_v1_api = None
+        self._api_client_lock = threading.Lock()
+        self._resource_cache = None
+        self._resource_cache_lock = threading.Lock()
+        self._bulk_executor = None
+        self._bulk_executor_lock = threading.Lock()
+        self._snapshot_executor = None
+        self._snapshot_executor_lock = threading.Lock()
+        self._write_pipeline = None
+        self._write_pipeline_lock = threading.Lock()
+        self._watch_broadcasters = {}
+        self._watch_broadcasters_lock = threading.Lock()
+        self._watch_stream_limiter = ConcurrencyLimiter(AppConfiguration.get_instance().get_watch_max_streams())
+        self._condition_wait_limiter = ConcurrencyLimiter(AppConfiguration.get_instance().get_max_concurrent_waits())
+        self._long_lived_request_limiter = ConcurrencyLimiter(
+            AppConfiguration.get_instance().get_long_lived_request_limit()
+        )
+        self._condition_waiters = {}
+        self._condition_waiters_lock = threading.Lock()
+        self._single_flight = SingleFlight()
+        self._rate_limiter = RateLimiter(AppConfiguration.get_instance().get_rate_limit)
+        self._circuit_breaker = CircuitBreaker(*AppConfiguration.get_instance().get_circuit_breaker_configuration())
+        # Instance is published only once fully built, concurrent first requests never see missing fields.
+        CRUDService._instance = self
+
+    def get_core_v1_api(self):
+        """
+        Get long-lived Kubernetes CoreV1Api shared between all requests
+
+        :return: Kubernetes CoreV1Api
+        """
+        if self._core_v1_api is None:
+            with self._api_client_lock:
+                if self._core_v1_api is None:
+                    self._api_client = client.ApiClient(
+                        AppConfiguration.get_instance().get_k8s_client_configuration()
+                    )
+                    self._core_v1_api = client.CoreV1Api(self._api_client)
+        return self._core_v1_api
+
+    def get_kube_api_verb(self, operation):
+        """
+        Get verb of CoreV1Api operation used to select rate limit and retry policy
+
+        :param operation: Name of CoreV1Api operation, e.g. list_namespaced_pod
+        :return: Verb, e.g. list
+        """
+        return operation.split('_', 1)[0]
+
+    def reserve_kube_api_call(self, verb):
+        """
+        Reserve permit of client-side rate limiter and record time caller has to wait for it
+
+        :param verb: Verb of Kubernetes Api call
+        :return: Number of seconds caller has to wait before making call
+        """
+        wait = self._rate_limiter.reserve(verb)
+        Metrics.get_instance().observe_rate_limiter_wait(verb, wait)
+        return wait
+
+    def acquire_circuit_breaker_permit(self, operation):
+        """
+        Fail fast instead of calling Kubernetes Api server while circuit breaker is open
+
+        :param operation: Name of CoreV1Api operation
+        """
+        if not AppConfiguration.get_instance().is_circuit_breaker_enabled():
+            return
+        if not self._circuit_breaker.allow():
+            Metrics.get_instance().count_circuit_breaker_rejection(operation)
+            raise ServiceUnavailable('The service is unavailable. Kubernetes Api server is degraded.')
+
+    def record_kube_api_call(self, exception, duration):
+        """
+        Record outcome of Kubernetes Api call in circuit breaker. Throttled calls, server errors and
+        connection failures or timeouts are failures, client errors prove that Api server is responsive.
+
+        :param exception: Exception raised by call or None if call succeeded
+        :param duration: Call duration in seconds
+        """
+        if not AppConfiguration.get_instance().is_circuit_breaker_enabled():
+            return
+        # Exceptions without HTTP status are raised when no response was received.
+        status = getattr(exception, 'status', None)
+        failed = exception is not None and (
+            not status or status == HttpStatusCode.TooManyRequests.value
+            or status >= HttpStatusCode.InternalServerError.value
+        )
+        self._circuit_breaker.record(failed, duration)
+
+    def is_circuit_breaker_closed(self):
+        """
+        Check if Kubernetes Api calls are made normally
+
+        :return: False if circuit breaker is open or probing Api server
+        """
+        return not AppConfiguration.get_instance().is_circuit_breaker_enabled() or \
+            self._circuit_breaker.get_state() == CircuitState.CLOSED
+
+    def get_circuit_breaker_status(self):
+        """
+        Get state and failure rate of circuit breaker around Kubernetes Api calls
+
+        :return: Circuit breaker status as Python dict
+        """
+        status = self._circuit_breaker.get_status()
+        status['enabled'] = AppConfiguration.get_instance().is_circuit_breaker_enabled()
+        return status
+
+    def get_retry_delay(self, verb, exception, attempt):
+        """
+        Get delay before retrying failed Kubernetes Api call. Throttled calls (429) are retried for every verb,
+        server errors only for reads as writes might have been applied. Retry-After response header is honored,
+        otherwise delay grows exponentially with full jitter.
+
+        :param verb: Verb of Kubernetes Api call
+        :param exception: Kubernetes Api exception of failed attempt
+        :param attempt: Number of already made retries
+        :return: Delay in seconds or None if call should not be retried
+        """
+        max_retries, base_delay, max_delay = AppConfiguration.get_instance().get_retry_configuration()
+        if attempt >= max_retries:
+            return None
+        if exception.status != HttpStatusCode.TooManyRequests.value and not (
+                exception.status in RETRIABLE_READ_STATUS_CODES and verb in ('read', 'list')):
+            return None
+        retry_after = (exception.headers or {}).get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), max_delay) + random.uniform(0, base_delay)
+        return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+    def call_kube_api(self, operation, *args, **kwargs):
+        """
+        Call Kubernetes CoreV1Api operation through client-side rate limiter and circuit breaker, retry throttled
+        and failed calls and record latency of every attempt. Connection failures and timeouts are raised
+        as ServiceUnavailable.
+
+        :param operation: Name of CoreV1Api operation
+        :return: Kubernetes Api response
+        """
+        if AppConfiguration.get_instance().is_kube_api_compression_enabled():
+            # Api server compresses large responses, urllib3 decompresses them transparently.
+            kwargs['_headers'] = {'Accept-Encoding': 'gzip', **kwargs.get('_headers', {})}
+        kwargs.setdefault('_request_timeout', AppConfiguration.get_instance().get_kube_api_timeout())
+        verb = self.get_kube_api_verb(operation)
+        attempt = 0
+        while True:
+            wait = self.reserve_kube_api_call(verb)
+            if wait:
+                time.sleep(wait)
+            self.acquire_circuit_breaker_permit(operation)
+            start = time.perf_counter()
+            try:
+                with Metrics.get_instance().time_kube_api_call(operation):
+                    response = getattr(self.get_core_v1_api(), operation)(*args, **kwargs)
+            except ApiException as e:
+                self.record_kube_api_call(e, time.perf_counter() - start)
+                delay = self.get_retry_delay(verb, e, attempt)
+                if delay is None:
+                    raise
+                Metrics.get_instance().count_kube_api_retry(operation, e.status)
+                time.sleep(delay)
+                attempt += 1
+            except HTTPError as e:
+                self.record_kube_api_call(e, time.perf_counter() - start)
+                raise ServiceUnavailable('The service is unavailable.') from e
+            except Exception as e:
+                # Outcome of every allowed call is recorded, otherwise permit of half-open circuit would leak.
+                self.record_kube_api_call(e, time.perf_counter() - start)
+                raise
+            else:
+                self.record_kube_api_call(None, time.perf_counter() - start)
+                return response
+
+    def coalesce_kube_api_read(self, operation, *args, convert, convert_args=(), **kwargs):
+        """
+        Call Kubernetes CoreV1Api read operation and convert its response. Identical reads arriving while
+        the call is in flight wait for it and share converted result instead of calling Api server again.
+
+        :param operation: Name of CoreV1Api operation
+        :param convert: Function converting Kubernetes Api response
+        :param convert_args: Additional hashable arguments of convert function
+        :return: Converted Kubernetes Api response
+        """
+        def read():
+            return convert(self.call_kube_api(operation, *args, **kwargs), *convert_args)
+
+        if not AppConfiguration.get_instance().is_read_coalescing_enabled():
+            return read()
+        # Transport options like _headers and _preload_content follow from operation and convert arguments.
+        request_kwargs = tuple(sorted(
+            (name, value) for name, value in kwargs.items() if not name.startswith('_') or name == '_continue'
+        ))
+        key = (operation, args, convert_args, request_kwargs)
+        result, coalesced = self._single_flight.do(key, read)
+        Metrics.get_instance().count_kube_api_read(operation, coalesced)
+        return result
+
+    def get_read_coalescing_statistics(self):
+        """
+        Get number of Kubernetes Api reads executed and coalesced with identical in-flight reads
+
+        :return: Read coalescing statistics as Python dict
+        """
+        statistics = self._single_flight.get_statistics()
+        statistics['enabled'] = AppConfiguration.get_instance().is_read_coalescing_enabled()
+        return statistics
+
+    def get_connection_pool_statistics(self):
+        """
+        Get statistics of connection pools used to communicate with Kubernetes Api server
+
+        :return: Connection pool statistics as Python dict
+        """
+        pool_manager = self.get_core_v1_api().api_client.rest_client.pool_manager
+        pools = []
+        for key in pool_manager.pools.keys():
+            pool = pool_manager.pools.get(key)
+            if pool is None:
+                continue
+            pools.append({
+                'host': pool.host,
+                'port': pool.port,
+                'scheme': pool.scheme,
+                'max_size': pool.pool.maxsize if pool.pool else 0,
+                'idle_connections': sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool else 0,
+                'num_connections': pool.num_connections,
+                'num_requests': pool.num_requests
+            })
+        return {
+            'max_size': self._api_client.configuration.connection_pool_maxsize,
+            'pools': pools
+        }
+
+    def get_resource_cache(self):
+        """
+        Get informer-backed resource cache, informers are started on first call
+
+        :return: Resource cache or None if cache is disabled
+        """
+        if not AppConfiguration.get_instance().is_resource_cache_enabled():
+            return None
+        if self._resource_cache is None:
+            with self._resource_cache_lock:
+                if self._resource_cache is None:
+                    watch_timeout = AppConfiguration.get_instance().get_resource_cache_watch_timeout()
+                    resource_cache = ResourceCache(
+                        AppConfiguration.get_instance().get_resource_cache_max_staleness(), watch_timeout
+                    )
+                    for kind, operation, indexers in (
+                            (Kind.POD.value, 'list_pod_for_all_namespaces', {LABEL_INDEX: get_label_index_keys}),
+                            (Kind.SERVICE.value, 'list_service_for_all_namespaces', None),
+                            (Kind.NAMESPACE.value, 'list_namespace', None)):
+                        # Relists go through rate limiter and circuit breaker, so relist storms after watches
+                        # expire are throttled like any other list.
+                        resource_cache.add_informer(
+                            kind, functools.partial(self.call_kube_api, operation),
+                            self.get_kube_api_watch_func(operation, watch_timeout), indexers
+                        )
+                    self._resource_cache = resource_cache
+        return self._resource_cache
+
+    def get_kube_api_watch_func(self, operation, watch_timeout):
+        """
+        Get CoreV1Api function opening watches. Read timeout covers the longest silence of watch, so watches
+        whose connection stopped delivering fail instead of hanging.
+
+        :param operation: Name of CoreV1Api list operation
+        :param watch_timeout: Number of seconds after which Api server closes watch
+        :return: CoreV1Api function
+        """
+        connect_timeout, read_timeout = AppConfiguration.get_instance().get_kube_api_timeout()
+        return functools.partial(getattr(self.get_core_v1_api(), operation),
+                                 _request_timeout=(connect_timeout, watch_timeout + read_timeout))
+
+    def get_cached_informer(self, kind):
+        """
+        Get informer which can answer reads of provided kind. Stale informers are used as well while
+        circuit breaker is not closed, as stale reads are preferred over failing fast.
+
+        :param kind: Resource kind
+        :return: Informer or None if cache is disabled, not synced yet or too stale
+        """
+        resource_cache = self.get_resource_cache()
+        if resource_cache is None:
+            return None
+        return resource_cache.get_informer(kind, allow_stale=not self.is_circuit_breaker_closed())
+
+    def get_resource_cache_status(self):
+        """
+        Get readiness and staleness of resource cache
+
+        :return: Resource cache status as Python dict
+        """
+        resource_cache = self.get_resource_cache()
+        return {
+            'enabled': resource_cache is not None,
+            'informers': resource_cache.get_status() if resource_cache else []
+        }
 
     def convert_k8s_resource(self, resource):
         """
@@ -32,20 +377,49 @@ class CRUDService:
         :param resource: Kubernetes resource
         :return: Kubernetes object converted into Python dict
         """
-        # Decode Kubernetes object from bytes to str.
-        resource = resource.data.decode('utf-8')
-        return json.loads(resource)
+        with Metrics.get_instance().time_json_decode():
+            # Kubernetes object is parsed directly from bytes.
+            return JsonCodec.loads(resource.data)
 
-    def convert_kube_api_error_msg_output(self, error_msg):
+    def convert_k8s_resource_list(self, resource_list, fields=None):
         """
-        Convert retrieved Kubernetes exception body into Python dict
+        Convert retrieved and not deserialized list of Kubernetes objects into Python dict which keeps
+        only names or selected fields of listed objects. Response is parsed incrementally when ijson
+        is installed, so whole list is never built in memory.
 
-        :param error_msg: Exception message
-        :return: Kubernetes Exception converted into Python dict
+        :param resource_list: List of Kubernetes resources
+        :param fields: Parsed field paths selected from every resource, only names are kept if None
+        :return: Python dict with items and continue token
         """
-        # Decode Kubernetes object from bytes to str.
-        error_msg = error_msg.decode('utf-8')
-        return json.loads(error_msg)
+        with Metrics.get_instance().time_json_decode():
+            if ijson is None:
+                resource_list = JsonCodec.loads(resource_list.data)
+                return {
+                    'metadata': {'continue': resource_list['metadata'].get('continue')},
+                    'items': [
+                        {'metadata': {'name': item['metadata']['name']}} if fields is None
+                        else project_fields(item, fields)
+                        for item in resource_list['items']
+                    ]
+                }
+            items = []
+            _continue = None
+            item_builder = None
+            for prefix, event, value in ijson.parse(resource_list, use_float=True):
+                if fields is None:
+                    if prefix == 'items.item.metadata.name':
+                        items.append({'metadata': {'name': value}})
+                elif prefix == 'items.item' and event == 'start_map':
+                    item_builder = ijson.ObjectBuilder()
+                if item_builder is not None:
+                    # Only single listed object is built at a time.
+                    item_builder.event(event, value)
+                    if prefix == 'items.item' and event == 'end_map':
+                        items.append(project_fields(item_builder.value, fields))
+                        item_builder = None
+                elif prefix == 'metadata.continue':
+                    _continue = value
+            return {'metadata': {'continue': _continue}, 'items': items}
 
     def handle_kube_api_exception(self, exception):
         """
@@ -53,12 +427,13 @@ class CRUDService:
 
         :param exception: Kubernetes Api Exception
         """
-        error_msg = self.convert_kube_api_error_msg_output(exception.body)
-        if error_msg['code'] == HttpStatusCode.NotFound.value:
+        # Status of HTTP response is used, as bodies of throttled or proxied responses are not always JSON.
+        status = exception.status
+        if status == HttpStatusCode.NotFound.value:
             raise ResourceNotFoundException('Provided resource not found or namespace does not exist.')
-        elif error_msg['code'] == HttpStatusCode.Conflict.value:
+        elif status == HttpStatusCode.Conflict.value:
             raise ResourceAlreadyExistException('Resource already exist.')
-        elif error_msg['code'] == HttpStatusCode.BadRequest.value or HttpStatusCode.UnprocessableEntity.value:
+        elif status in (HttpStatusCode.BadRequest.value, HttpStatusCode.UnprocessableEntity.value):
             raise InvalidResourceManifestException('Invalid request body. Check if provided values are correct.')
         else:
             raise ServiceUnavailable('The service is unavailable.')
@@ -88,6 +463,138 @@ class CRUDService:
         resource_manifest['apiVersion'] = api_version
         return resource_manifest
 
+    def get_watch_broadcaster(self, kind, namespace):
+        """
+        Get broadcaster multiplexing single upstream watch of kind in namespace to many subscribers
+
+        :param kind: Resource kind
+        :param namespace: Namespace resource, ignored for Namespace kind
+        :return: Watch broadcaster
+        """
+        if kind.lower() == Kind.POD.value.lower():
+            key, operation = (Kind.POD.value, namespace), 'list_namespaced_pod'
+        elif kind.lower() == Kind.SERVICE.value.lower():
+            key, operation = (Kind.SERVICE.value, namespace), 'list_namespaced_service'
+        elif kind.lower() == Kind.NAMESPACE.value.lower():
+            key, operation = (Kind.NAMESPACE.value, None), 'list_namespace'
+        else:
+            raise ResourceNotFoundException('Provided kind is not supported.')
+        args = (namespace,) if key[1] is not None else ()
+
+        def get_resource_version():
+            response = self.call_kube_api(operation, *args, limit=1, _preload_content=False)
+            return JsonCodec.loads(response.data)['metadata']['resourceVersion']
+
+        with self._watch_broadcasters_lock:
+            idle_keys = [
+                broadcaster_key for broadcaster_key, broadcaster in self._watch_broadcasters.items()
+                if broadcaster.is_idle(WATCH_BROADCASTER_IDLE_SECONDS)
+            ]
+            for broadcaster_key in idle_keys:
+                del self._watch_broadcasters[broadcaster_key]
+            if key not in self._watch_broadcasters:
+                queue_size, history_size, watch_timeout = AppConfiguration.get_instance().get_watch_configuration()
+                self._watch_broadcasters[key] = WatchBroadcaster(
+                    key[0], self.get_kube_api_watch_func(operation, watch_timeout), key[1], queue_size,
+                    history_size, watch_timeout, get_resource_version
+                )
+            return self._watch_broadcasters[key]
+
+    def subscribe_to_watch(self, kind, namespace, resource_version=None):
+        """
+        Subscribe to changes of Kubernetes resources
+
+        :param kind: Resource kind
+        :param namespace: Namespace resource
+        :param resource_version: resourceVersion to resume from
+        :return: Tuple of watch broadcaster and subscriber
+        """
+        watch_broadcaster = self.get_watch_broadcaster(kind, namespace)
+        self.acquire_long_lived_request_slot(self._watch_stream_limiter, 'Too many watch streams are open.')
+        try:
+            return watch_broadcaster, watch_broadcaster.subscribe(resource_version)
+        except Exception as e:
+            self.release_long_lived_request_slot(self._watch_stream_limiter)
+            if isinstance(e, ApiException):
+                self.handle_kube_api_exception(e)
+            raise
+
+    def unsubscribe_from_watch(self, watch_broadcaster, subscriber):
+        """
+        Stop following changes of Kubernetes resources, called once for every subscription
+
+        :param watch_broadcaster: Watch broadcaster returned by subscribe_to_watch
+        :param subscriber: Subscriber returned by subscribe_to_watch
+        """
+        watch_broadcaster.unsubscribe(subscriber)
+        self.release_long_lived_request_slot(self._watch_stream_limiter)
+
+    def get_bulk_executor(self):
+        """
+        Get worker pool shared by bulk operations
+
+        :return: Thread pool executor
+        """
+        if self._bulk_executor is None:
+            with self._bulk_executor_lock:
+                if self._bulk_executor is None:
+                    self._bulk_executor = ThreadPoolExecutor(
+                        max_workers=AppConfiguration.get_instance().get_bulk_max_workers(),
+                        thread_name_prefix='bulk-operation'
+                    )
+        return self._bulk_executor
+
+    def get_snapshot_executor(self):
+        """
+        Get worker pool of snapshot lists, kept apart from bulk operations so neither can starve the other
+
+        :return: Thread pool executor
+        """
+        if self._snapshot_executor is None:
+            with self._snapshot_executor_lock:
+                if self._snapshot_executor is None:
+                    self._snapshot_executor = ThreadPoolExecutor(
+                        max_workers=AppConfiguration.get_instance().get_snapshot_max_workers(),
+                        thread_name_prefix='snapshot'
+                    )
+        return self._snapshot_executor
+
+    def execute_bulk_operation(self, operation, items):
+        """
+        Run operation for every item concurrently using bounded worker pool
+
+        :param operation: Function called with single item
+        :param items: List of items
+        :return: List of exceptions raised for items in input order, None for items which succeeded
+        """
+        def execute(item):
+            try:
+                operation(item)
+            except Exception as e:
+                return e
+            return None
+
+        return list(self.get_bulk_executor().map(execute, items))
+
+    def get_write_pipeline(self):
+        """
+        Get pipeline running queued writes in background
+
+        :return: Write pipeline
+        """
+        if self._write_pipeline is None:
+            with self._write_pipeline_lock:
+                if self._write_pipeline is None:
+                    max_workers, max_pending, retention, directory = \
+                        AppConfiguration.get_instance().get_write_pipeline_configuration()
+                    # Workers sharing operations directory also share order of writes of every namespace.
+                    self._write_pipeline = WritePipeline(
+                        max_workers, max_pending, OperationStore(retention, directory),
+                        on_finished=Metrics.get_instance().observe_write_operation,
+                        shared_order=SharedOrder(directory) if directory else None
+                    )
+        return self._write_pipeline
+
     def get_namespace(self, namespace):
         """
         Get Kubernetes Namespace resource
@@ -95,9 +602,13 @@ class CRUDService:
         :param namespace:  Namespace resource
         :return: Namespace resource converted as Python dict
         """
+        informer = self.get_cached_informer(Kind.NAMESPACE.value)
+        cached_namespace = informer.get(namespace) if informer else None
+        if cached_namespace is not None:
+            return cached_namespace
         try:
-            return self.convert_k8s_resource(
-                client.CoreV1Api().read_namespace(namespace, _preload_content=False)
+            return self.coalesce_kube_api_read(
+                'read_namespace', namespace, _preload_content=False, convert=self.convert_k8s_resource
             )
         except ApiException as e:
             self.handle_kube_api_exception(e)
@@ -110,9 +621,14 @@ class CRUDService:
         :param namespace: Namespace resource
         :return: Service resource converted as Python dict
         """
+        informer = self.get_cached_informer(Kind.SERVICE.value)
+        cached_service = informer.get(service, namespace) if informer else None
+        if cached_service is not None:
+            return cached_service
         try:
-            return self.convert_k8s_resource(
-                client.CoreV1Api().read_namespaced_service(service, namespace, _preload_content=False)
+            return self.coalesce_kube_api_read(
+                'read_namespaced_service', service, namespace, _preload_content=False,
+                convert=self.convert_k8s_resource
             )
         except ApiException as e:
             self.handle_kube_api_exception(e)
@@ -125,35 +641,384 @@ class CRUDService:
         :param namespace: Namespace resource
         :return: Pod resource converted as Python dict
         """
+        informer = self.get_cached_informer(Kind.POD.value)
+        cached_pod = informer.get(pod, namespace) if informer else None
+        if cached_pod is not None:
+            return cached_pod
         try:
-            return self.convert_k8s_resource(
-                client.CoreV1Api().read_namespaced_pod(pod, namespace, _preload_content=False)
+            return self.coalesce_kube_api_read(
+                'read_namespaced_pod', pod, namespace, _preload_content=False, convert=self.convert_k8s_resource
             )
         except ApiException as e:
             self.handle_kube_api_exception(e)
 
-    def get_list_of_resources(self, kind, namespace):
+    def get_list_of_resources(self, kind, namespace, limit=None, _continue=None, label_selector=None,
+                              field_selector=None, fields=None):
         """
         Get list of Kubernetes resources
 
         :param kind: Resource kind
         :param namespace: Namespace resource
+        :param limit: Max number of resources returned in one page
+        :param _continue: Continue token returned with previous page
+        :param label_selector: Label selector evaluated by Api server
+        :param field_selector: Field selector evaluated by Api server
+        :param fields: Parsed field paths selected from every resource, only names are listed if None
         :return: List of Kubernetes resources
         """
+        if limit is None and _continue is None and label_selector is None and field_selector is None:
+            for cached_kind in (Kind.POD.value, Kind.SERVICE.value, Kind.NAMESPACE.value):
+                if kind.lower() == cached_kind.lower():
+                    informer = self.get_cached_informer(cached_kind)
+                    if informer:
+                        # Like Api server, cache answers lists of namespace which does not exist with no items.
+                        is_namespaced = cached_kind != Kind.NAMESPACE.value
+                        resources = informer.list(namespace if is_namespaced else None)
+                        if fields is not None:
+                            resources = [project_fields(resource, fields) for resource in resources]
+                        return {'items': resources}
         if kind.lower() == Kind.POD.value.lower():
-            return self.convert_k8s_resource(
-                client.CoreV1Api().list_namespaced_pod(namespace, _preload_content=False)
-            )
+            operation, args = 'list_namespaced_pod', (namespace,)
         elif kind.lower() == Kind.SERVICE.value.lower():
-            return self.convert_k8s_resource(
-                client.CoreV1Api().list_namespaced_service(namespace, _preload_content=False)
-            )
+            operation, args = 'list_namespaced_service', (namespace,)
         elif kind.lower() == Kind.NAMESPACE.value.lower():
-            return self.convert_k8s_resource(
-                client.CoreV1Api().list_namespace(_preload_content=False)
-            )
+            operation, args = 'list_namespace', ()
         else:
             raise ResourceNotFoundException('Provided kind is not supported.')
+        # Full objects are fetched only when selected fields are not part of metadata.
+        headers = {'Accept': PARTIAL_OBJECT_METADATA_LIST_ACCEPT} if fields is None or is_metadata_only(fields) else {}
+        try:
+            return self.coalesce_kube_api_read(
+                operation, *args, limit=limit, _continue=_continue, label_selector=label_selector,
+                field_selector=field_selector, _headers=headers, _preload_content=False,
+                convert=self.convert_k8s_resource_list, convert_args=(fields,)
+            )
+        except ApiException as e:
+            self.handle_kube_api_exception(e)
+
+    def get_resource_names_stream(self, kind, namespace, page_size):
+        """
+        Get generator of Kubernetes resource names which walks list pages using continue tokens.
+        First page is fetched eagerly so that errors are raised before streaming starts.
+
+        :param kind: Resource kind
+        :param namespace: Namespace resource
+        :param page_size: Max number of resources fetched from Api server in one page
+        :return: Generator of resource names
+        """
+        resources = self.get_list_of_resources(kind, namespace, limit=page_size)
+
+        def generate_resource_names(page):
+            while True:
+                for resource in page['items']:
+                    yield resource['metadata']['name']
+                _continue = page.get('metadata', {}).get('continue')
+                if not _continue:
+                    return
+                page = self.get_list_of_resources(kind, namespace, limit=page_size, _continue=_continue)
+
+        return generate_resource_names(resources)
+
+    def convert_k8s_resource_items(self, resource_list, kind):
+        """
+        Convert retrieved and not deserialized list of Kubernetes objects into list of full objects.
+        Kind and apiVersion omitted by Api server in list items are filled in.
+
+        :param resource_list: List of Kubernetes resources
+        :param kind: Resource kind
+        :return: List of Kubernetes objects converted into Python dicts
+        """
+        return [
+            {'kind': kind, 'apiVersion': Kind.VERSION.value, **resource}
+            for resource in self.convert_k8s_resource(resource_list)['items']
+        ]
+
+    def convert_k8s_resource_page(self, resource_list, kind):
+        """
+        Convert retrieved and not deserialized page of Kubernetes objects into full objects with kind
+        and apiVersion filled in and continue token of next page
+
+        :param resource_list: Page of Kubernetes resources
+        :param kind: Resource kind
+        :return: Python dict with items and continue token
+        """
+        resources = self.convert_k8s_resource(resource_list)
+        return {
+            'items': [{'kind': kind, 'apiVersion': Kind.VERSION.value, **resource} for resource in resources['items']],
+            'continue': resources['metadata'].get('continue')
+        }
+
+    def get_full_list_of_resources(self, kind, namespace=None):
+        """
+        Get list of full Kubernetes resources of kind, from resource cache when it is fresh. Otherwise pages
+        are fetched one after another, so Api server and app never hold whole unpaginated response at once.
+
+        :param kind: Resource kind, one of Pod, Service and Namespace
+        :param namespace: Namespace resource, resources of all namespaces are listed if None
+        :return: List of Kubernetes resources converted into Python dicts
+        """
+        informer = self.get_cached_informer(kind)
+        if informer:
+            resources = informer.list(namespace) if namespace is not None else informer.list_all()
+            return [{'kind': kind, 'apiVersion': Kind.VERSION.value, **resource} for resource in resources]
+        if kind == Kind.NAMESPACE.value:
+            operation, args = 'list_namespace', ()
+        elif namespace is None:
+            operation, args = f'list_{kind.lower()}_for_all_namespaces', ()
+        else:
+            operation, args = f'list_namespaced_{kind.lower()}', (namespace,)
+        page_size = AppConfiguration.get_instance().get_list_page_size()
+        resources = []
+        _continue = None
+        while True:
+            try:
+                page = self.coalesce_kube_api_read(
+                    operation, *args, limit=page_size, _continue=_continue, _preload_content=False,
+                    convert=self.convert_k8s_resource_page, convert_args=(kind,)
+                )
+            except ApiException as e:
+                self.handle_kube_api_exception(e)
+            resources.extend(page['items'])
+            _continue = page['continue']
+            if not _continue:
+                return resources
+
+    def is_pod_ready(self, pod):
+        """
+        Check if Pod is ready to serve traffic, container statuses are used when Ready condition is not reported
+
+        :param pod: Pod resource as Python dict
+        :return: True if Pod is ready
+        """
+        status = pod.get('status') or {}
+        for condition in status.get('conditions') or []:
+            if condition.get('type') == 'Ready':
+                return condition.get('status') == 'True'
+        container_statuses = status.get('containerStatuses') or []
+        return bool(container_statuses) and all(container.get('ready') for container in container_statuses)
+
+    def get_wait_state(self, condition, resource):
+        """
+        Evaluate wait condition against current state of resource
+
+        :param condition: Wait condition
+        :param resource: Resource as Python dict or None if resource does not exist
+        :return: Wait state
+        """
+        if condition == WaitCondition.DELETED:
+            return WaitState.MET if resource is None else WaitState.WAITING
+        if resource is None:
+            # Pod may not be created yet, e.g. when its creation was queued.
+            return WaitState.WAITING
+        phase = (resource.get('status') or {}).get('phase')
+        if phase in ('Succeeded', 'Failed'):
+            return WaitState.UNSATISFIABLE
+        return WaitState.MET if phase == 'Running' and self.is_pod_ready(resource) else WaitState.WAITING
+
+    def read_waited_resource(self, kind, name, namespace):
+        """
+        Read resource directly from Api server, cached resource may not reflect changes made before watch started
+
+        :param kind: Resource kind
+        :param name: Resource name
+        :param namespace: Namespace name, ignored for Namespace kind
+        :return: Resource as Python dict or None if resource does not exist
+        """
+        if kind == Kind.POD:
+            operation, args = 'read_namespaced_pod', (name, namespace)
+        else:
+            operation, args = 'read_namespace', (name,)
+        try:
+            return self.coalesce_kube_api_read(operation, *args, _preload_content=False,
+                                               convert=self.convert_k8s_resource)
+        except ApiException as e:
+            if e.status == HttpStatusCode.NotFound.value:
+                return None
+            self.handle_kube_api_exception(e)
+
+    def acquire_condition_waiter(self, kind, name, namespace, condition):
+        """
+        Get waiter shared by all requests waiting for the same condition of the same resource. New waiter
+        subscribes to watch broadcaster of kind before resource is read, so no change is missed in between.
+
+        :param kind: Resource kind
+        :param name: Resource name
+        :param namespace: Namespace name, None for Namespace kind
+        :param condition: Wait condition
+        :return: Tuple of waiter key and waiter
+        """
+        key = (kind, namespace, name, condition)
+        watch_broadcaster = self.get_watch_broadcaster(kind.value, namespace)
+        with self._condition_waiters_lock:
+            waiter = self._condition_waiters.get(key)
+            is_new = waiter is None or waiter.is_released()
+            if is_new:
+                waiter = self._condition_waiters[key] = ConditionWaiter(
+                    name, lambda resource: self.get_wait_state(condition, resource)
+                )
+                # Waiter is unsubscribed from the same broadcaster even if idle broadcaster is replaced meanwhile.
+                waiter.watch_broadcaster = watch_broadcaster
+            waiter.waiters += 1
+        if is_new:
+            try:
+                waiter.watch_broadcaster.subscribe(subscriber=waiter)
+                waiter.update(self.read_waited_resource(kind, name, namespace))
+            except Exception as e:
+                self.release_condition_waiter(key, waiter)
+                if isinstance(e, ApiException):
+                    self.handle_kube_api_exception(e)
+                raise
+        return key, waiter
+
+    def release_condition_waiter(self, key, waiter):
+        """
+        Stop waiting, waiter is unsubscribed from watch broadcaster once no request waits for it
+
+        :param key: Waiter key
+        :param waiter: Waiter
+        """
+        with self._condition_waiters_lock:
+            waiter.waiters -= 1
+            if waiter.waiters > 0:
+                return
+            if self._condition_waiters.get(key) is waiter:
+                del self._condition_waiters[key]
+        waiter.watch_broadcaster.unsubscribe(waiter)
+
+    def acquire_long_lived_request_slot(self, limiter, message):
+        """
+        Take slot of long-lived request type and slot shared by all long-lived requests, so together they never
+        hold threads reserved for other requests
+
+        :param limiter: Concurrency limiter of request type
+        :param message: Message of ServiceUnavailable raised when no slot is free
+        """
+        if not limiter.try_acquire():
+            raise ServiceUnavailable(message, retry_after=RETRY_AFTER_SECONDS)
+        if not self._long_lived_request_limiter.try_acquire():
+            limiter.release()
+            raise ServiceUnavailable(message, retry_after=RETRY_AFTER_SECONDS)
+
+    def release_long_lived_request_slot(self, limiter):
+        """
+        Return slots taken by acquire_long_lived_request_slot
+
+        :param limiter: Concurrency limiter of request type
+        """
+        self._long_lived_request_limiter.release()
+        limiter.release()
+
+    def wait_for_condition(self, kind, name, namespace, condition, timeout):
+        """
+        Block until condition of resource is met, changes are followed by watch instead of polling
+
+        :param kind: Resource kind
+        :param name: Resource name
+        :param namespace: Namespace name, None for Namespace kind
+        :param condition: Wait condition, Ready is supported for Pods only
+        :param timeout: Max number of seconds to wait
+        :return: Wait result, met, unsatisfiable or timeout
+        """
+        if condition == WaitCondition.READY and kind != Kind.POD:
+            raise InvalidResourceManifestException('Provided condition is not supported for this kind.')
+        # Every waiting request holds a server thread, so waits over the limit are rejected right away.
+        self.acquire_long_lived_request_slot(self._condition_wait_limiter, 'Too many requests are waiting.')
+        try:
+            deadline = time.monotonic() + timeout
+            while True:
+                key, waiter = self.acquire_condition_waiter(kind, name, namespace, condition)
+                try:
+                    state = waiter.wait(max(deadline - time.monotonic(), 0))
+                finally:
+                    self.release_condition_waiter(key, waiter)
+                if state != WaitState.INTERRUPTED:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    state = WaitState.WAITING
+                    break
+                # Upstream watch expired, waiting continues on new watch.
+                time.sleep(min(remaining, 1))
+        finally:
+            self.release_long_lived_request_slot(self._condition_wait_limiter)
+        result = get_wait_result(state)
+        Metrics.get_instance().count_condition_wait(kind.value, condition.value, result)
+        return result
+
+    def get_service_endpoints(self, service, namespace):
+        """
+        Resolve selector of Kubernetes Service to its ready Pods. Label index of Pod informer is used
+        when resource cache is fresh, otherwise Pods are listed with label selector.
+
+        :param service: Service resource
+        :param namespace: Namespace resource
+        :return: Service endpoints as Python dict
+        """
+        selector = (self.get_service(service, namespace).get('spec') or {}).get('selector') or {}
+        if not selector:
+            # Endpoints of Services without selector are not managed by Kubernetes.
+            pods = []
+        else:
+            informer = self.get_cached_informer(Kind.POD.value)
+            if informer:
+                pods = informer.get_by_index(
+                    LABEL_INDEX, [(namespace, key, value) for key, value in selector.items()]
+                )
+            else:
+                try:
+                    pods = self.coalesce_kube_api_read(
+                        'list_namespaced_pod', namespace,
+                        label_selector=','.join(f'{key}={value}' for key, value in sorted(selector.items())),
+                        _preload_content=False, convert=self.convert_k8s_resource_items, convert_args=(Kind.POD.value,)
+                    )
+                except ApiException as e:
+                    self.handle_kube_api_exception(e)
+        return {
+            'name': service,
+            'namespace': namespace,
+            'selector': selector,
+            'endpoints': [
+                {
+                    'name': pod['metadata']['name'],
+                    'pod_ip': (pod.get('status') or {}).get('podIP'),
+                    'node_name': (pod.get('spec') or {}).get('nodeName')
+                }
+                for pod in sorted(pods, key=lambda pod: pod['metadata']['name']) if self.is_pod_ready(pod)
+            ]
+        }
+
+    def get_namespace_snapshot(self, namespace):
+        """
+        Get Namespace together with its Pods and Services, all three are fetched concurrently
+
+        :param namespace: Namespace resource
+        :return: Snapshot with Namespace, Pods and Services as Python dict
+        """
+        executor = self.get_snapshot_executor()
+        namespace_future = executor.submit(self.get_namespace, namespace)
+        pods_future = executor.submit(self.get_full_list_of_resources, Kind.POD.value, namespace)
+        services_future = executor.submit(self.get_full_list_of_resources, Kind.SERVICE.value, namespace)
+        return {
+            'namespace': namespace_future.result(),
+            'pods': pods_future.result(),
+            'services': services_future.result()
+        }
+
+    def get_cluster_snapshot(self):
+        """
+        Get all Namespaces, Pods and Services of the cluster, all three lists are fetched concurrently
+
+        :return: Snapshot with Namespaces, Pods and Services as Python dict
+        """
+        executor = self.get_snapshot_executor()
+        namespaces_future = executor.submit(self.get_full_list_of_resources, Kind.NAMESPACE.value)
+        pods_future = executor.submit(self.get_full_list_of_resources, Kind.POD.value)
+        services_future = executor.submit(self.get_full_list_of_resources, Kind.SERVICE.value)
+        return {
+            'namespaces': namespaces_future.result(),
+            'pods': pods_future.result(),
+            'services': services_future.result()
+        }
 
     def delete_namespace(self, namespace):
         """
@@ -162,7 +1027,7 @@ class CRUDService:
         :param namespace: Namespace resource
         """
         try:
-            client.CoreV1Api().delete_namespace(namespace, _preload_content=False)
+            self.call_kube_api('delete_namespace', namespace, _preload_content=False)
         except ApiException as e:
             self.handle_kube_api_exception(e)
 
@@ -174,7 +1039,7 @@ class CRUDService:
         :param namespace: Namespace resource
         """
         try:
-            client.CoreV1Api().delete_namespaced_service(service, namespace, _preload_content=False)
+            self.call_kube_api('delete_namespaced_service', service, namespace, _preload_content=False)
         except ApiException as e:
             self.handle_kube_api_exception(e)
 
@@ -186,7 +1051,7 @@ class CRUDService:
         :param namespace: Namespace resource
         """
         try:
-            client.CoreV1Api().delete_namespaced_pod(pod, namespace, _preload_content=False)
+            self.call_kube_api('delete_namespaced_pod', pod, namespace, _preload_content=False)
         except ApiException as e:
             self.handle_kube_api_exception(e)
 
@@ -202,7 +1067,7 @@ class CRUDService:
             pod_manifest, name, Kind.POD.value, Kind.VERSION.value, namespace=namespace
         )
         try:
-            client.CoreV1Api().create_namespaced_pod(namespace, pod_manifest, _preload_content=False)
+            self.call_kube_api('create_namespaced_pod', namespace, pod_manifest, _preload_content=False)
         except ApiException as e:
             self.handle_kube_api_exception(e)
 
@@ -217,7 +1082,7 @@ class CRUDService:
         service_manifest = self.get_modified_resource_metadata(
             service_manifest, name, Kind.SERVICE.value, Kind.VERSION.value, namespace=namespace)
         try:
-            client.CoreV1Api().create_namespaced_service(namespace, service_manifest, _preload_content=False)
+            self.call_kube_api('create_namespaced_service', namespace, service_manifest, _preload_content=False)
         except ApiException as e:
             self.handle_kube_api_exception(e)
 
@@ -229,32 +1094,107 @@ class CRUDService:
         """
         try:
             namespace_manifest = self.get_modified_resource_metadata({}, name, Kind.NAMESPACE.value, Kind.VERSION.value)
-            client.CoreV1Api().create_namespace(namespace_manifest, _preload_content=False)
+            self.call_kube_api('create_namespace', namespace_manifest, _preload_content=False)
+        except ApiException as e:
+            self.handle_kube_api_exception(e)
+
+    def patch_resource(self, kind, name, namespace, manifest, patch_type=PatchType.STRATEGIC, field_manager=None,
+                       force=False, dry_run=False):
+        """
+        Patch Kubernetes resource and return it as persisted by Api server, so no follow-up read is needed.
+        Server-side apply creates resource if it does not exist yet.
+
+        :param kind: Resource kind, one of Pod, Service and Namespace
+        :param name: Resource name
+        :param namespace: Namespace resource, ignored for Namespace kind
+        :param manifest: Patch body, full resource manifest for server-side apply
+        :param patch_type: Patch type
+        :param field_manager: Name of actor owning applied fields, default field manager is used if None
+        :param force: Take ownership of fields managed by other field managers, only used by server-side apply
+        :param dry_run: Validate and return patched resource without persisting it
+        :return: Patched resource converted as Python dict
+        """
+        if kind == Kind.NAMESPACE.value:
+            operation, args = 'patch_namespace', (name,)
+        else:
+            operation, args = f'patch_namespaced_{kind.lower()}', (name, namespace)
+        if patch_type == PatchType.APPLY:
+            manifest = self.get_modified_resource_metadata(
+                manifest, name, kind, Kind.VERSION.value,
+                namespace=namespace if kind != Kind.NAMESPACE.value else None
+            )
+        try:
+            return self.convert_k8s_resource(self.call_kube_api(
+                operation, *args, manifest,
+                field_manager=field_manager or AppConfiguration.get_instance().get_field_manager(),
+                force=True if patch_type == PatchType.APPLY and force else None,
+                dry_run='All' if dry_run else None,
+                _content_type=PATCH_CONTENT_TYPES[patch_type], _preload_content=False
+            ))
         except ApiException as e:
             self.handle_kube_api_exception(e)
 
-    def update_pod(self, name, namespace, pod_manifest):
+    def update_pod(self, name, namespace, pod_manifest, patch_type=PatchType.STRATEGIC, field_manager=None,
+                   force=False, dry_run=False):
         """
         Update existing Kubernetes Pod resource in provided Namespace using Pod manifest body
 
         :param name: Pod resource name
         :param namespace: Namespace resource
         :param pod_manifest: Pod resource manifest body
+        :param patch_type: Patch type
+        :param field_manager: Name of actor owning applied fields
+        :param force: Take ownership of conflicting fields, only used by server-side apply
+        :param dry_run: Validate and return patched resource without persisting it
+        :return: Patched Pod resource converted as Python dict
         """
-        try:
-            client.CoreV1Api().patch_namespaced_pod(name, namespace, pod_manifest, _preload_content=False)
-        except ApiException as e:
-            self.handle_kube_api_exception(e)
+        return self.patch_resource(
+            Kind.POD.value, name, namespace, pod_manifest, patch_type, field_manager, force, dry_run
+        )
 
-    def update_service(self, name, namespace, service_manifest):
+    def update_service(self, name, namespace, service_manifest, patch_type=PatchType.STRATEGIC, field_manager=None,
+                       force=False, dry_run=False):
         """
         Update existing Kubernetes Service resource in provided Namespace using Service manifest body
 
         :param name: Service resource name
         :param namespace: Namespace resource
         :param service_manifest: Service resource manifest body
+        :param patch_type: Patch type
+        :param field_manager: Name of actor owning applied fields
+        :param force: Take ownership of conflicting fields, only used by server-side apply
+        :param dry_run: Validate and return patched resource without persisting it
+        :return: Patched Service resource converted as Python dict
         """
-        try:
-            client.CoreV1Api().patch_namespaced_service(name, namespace, service_manifest, _preload_content=False)
-        except ApiException as e:
-            self.handle_kube_api_exception(e)
+        return self.patch_resource(
+            Kind.SERVICE.value, name, namespace, service_manifest, patch_type, field_manager, force, dry_run
+        )
+
+    def get_manifest_target(self, manifest, default_namespace):
+        """
+        Get kind, name and namespace of resource described by manifest
+
+        :param manifest: Resource manifest with kind and metadata.name
+        :param default_namespace: Namespace of namespaced resources whose manifest has no metadata.namespace
+        :return: Tuple of kind, name and namespace
+        """
+        kinds = {kind.value.lower(): kind.value for kind in (Kind.POD, Kind.SERVICE, Kind.NAMESPACE)}
+        kind = kinds.get(str(manifest.get('kind')).lower())
+        if kind is None:
+            raise ResourceNotFoundException('Provided kind is not supported.')
+        metadata = manifest['metadata']
+        return kind, metadata['name'], metadata.get('namespace') or default_namespace
+
+    def apply_manifest(self, manifest, default_namespace, field_manager=None, force=False, dry_run=False):
+        """
+        Apply Kubernetes resource manifest with server-side apply
+
+        :param manifest: Resource manifest with kind and metadata.name
+        :param default_namespace: Namespace of namespaced resources whose manifest has no metadata.namespace
+        :param field_manager: Name of actor owning applied fields
+        :param force: Take ownership of conflicting fields
+        :param dry_run: Validate and return applied resource without persisting it
+        :return: Applied resource converted as Python dict
+        """
+        kind, name, namespace = self.get_manifest_target(manifest, default_namespace)
+        return self.patch_resource(kind, name, namespace, manifest, PatchType.APPLY, field_manager, force, dry_run)
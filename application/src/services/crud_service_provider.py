@@ -0,0 +1,21 @@
+class CRUDServiceProvider:
+    """
+    Services and Kubernetes client package are imported on first use, so app starts without paying for them.
+    """
+
+    @staticmethod
+    def get_instance():
+        """
+        Get service used by controllers
+
+        :return: CRUDService
+        """
+        from services.crud_service import CRUDService
+        return CRUDService.get_instance()
+
+    @staticmethod
+    def import_services():
+        """
+        Import services deferred at startup together with Kubernetes client package
+        """
+        import services.crud_service  # noqa: F401
@@ -0,0 +1,50 @@
+METADATA_NAME_FIELD = ('metadata', 'name')
+
+
+def parse_fields(fields):
+    """
+    Parse comma separated list of dotted field paths, metadata.name is always selected
+
+    :param fields: Field paths, e.g. 'metadata.labels,status.phase'
+    :return: Tuple of field paths split into keys or None if no fields were provided
+    """
+    if not fields:
+        return None
+    field_paths = [tuple(key for key in field.strip().split('.') if key) for field in fields.split(',')]
+    field_paths = [field_path for field_path in field_paths if field_path]
+    if METADATA_NAME_FIELD not in field_paths:
+        field_paths.insert(0, METADATA_NAME_FIELD)
+    return tuple(field_paths)
+
+
+def is_metadata_only(field_paths):
+    """
+    Check if every selected field is part of object metadata, so list can be fetched as PartialObjectMetadataList
+
+    :param field_paths: Parsed field paths
+    :return: True if only metadata fields are selected
+    """
+    return all(field_path[0] == 'metadata' for field_path in field_paths)
+
+
+def project_fields(resource, field_paths):
+    """
+    Copy selected fields of Kubernetes object keeping their nesting, missing fields are skipped
+
+    :param resource: Kubernetes object as Python dict
+    :param field_paths: Parsed field paths
+    :return: Projected Kubernetes object as Python dict
+    """
+    projection = {}
+    for field_path in field_paths:
+        value = resource
+        for key in field_path:
+            if not isinstance(value, dict) or key not in value:
+                break
+            value = value[key]
+        else:
+            target = projection
+            for key in field_path[:-1]:
+                target = target.setdefault(key, {})
+            target[field_path[-1]] = value
+    return projection
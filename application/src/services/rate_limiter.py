@@ -0,0 +1,65 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at constant rate. Callers reserve a token and wait until it becomes available,
+    so bursts are smoothed to configured rate instead of being rejected.
+    """
+
+    def __init__(self, qps, burst):
+        self._qps = qps
+        self._burst = max(burst, 1)
+        self._tokens = float(self._burst)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Take one token, bucket may go into debt which is paid off by waiting
+
+        :return: Number of seconds caller has to wait before making call
+        """
+        if self._qps <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._last_refill) * self._qps)
+            self._last_refill = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._qps
+
+
+class RateLimiter:
+    """
+    Client-side rate limiter of Kubernetes Api calls with separate token bucket for every verb.
+    """
+
+    def __init__(self, get_rate_limit):
+        """
+        :param get_rate_limit: Function returning tuple of QPS and burst for verb, QPS <= 0 disables limiting
+        """
+        self._get_rate_limit = get_rate_limit
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def get_bucket(self, verb):
+        bucket = self._buckets.get(verb)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(verb)
+                if bucket is None:
+                    bucket = self._buckets[verb] = TokenBucket(*self._get_rate_limit(verb))
+        return bucket
+
+    def reserve(self, verb):
+        """
+        Reserve permit to call Kubernetes Api with provided verb
+
+        :param verb: Verb of Kubernetes Api call, e.g. read, list, create, patch or delete
+        :return: Number of seconds caller has to wait before making call
+        """
+        return self.get_bucket(verb).reserve()
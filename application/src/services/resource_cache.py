@@ -0,0 +1,280 @@
+import logging
+import threading
+import time
+
+from kubernetes.client.exceptions import ApiException
+
+from common.json_codec import JsonCodec
+from controllers.utils.http_status_code import HttpStatusCode
+from services.watch_stream import WatchStream
+
+
+LABEL_INDEX = 'labels'
+
+
+def get_label_index_keys(resource):
+    """
+    Get keys of label index for resource, one key per label
+
+    :param resource: Kubernetes object as Python dict
+    :return: List of (namespace, label key, label value) tuples
+    """
+    metadata = resource['metadata']
+    namespace = metadata.get('namespace')
+    return [(namespace, key, value) for key, value in (metadata.get('labels') or {}).items()]
+
+
+class ResourceInformer:
+    """
+    Keeps in-memory store of single Kubernetes kind in sync with Api server using list+watch.
+    Optional indexers maintain inverted indices from index keys to resources on every store change.
+    """
+    MIN_BACKOFF_SECONDS = 1
+    MAX_BACKOFF_SECONDS = 30
+
+    def __init__(self, kind, list_func, watch_func, watch_timeout, indexers=None):
+        """
+        :param kind: Resource kind
+        :param list_func: Function listing resources of kind in all namespaces, used for relists
+        :param watch_func: CoreV1Api function listing resources of kind in all namespaces, used to open watches
+        :param watch_timeout: Number of seconds after which watch is reopened
+        :param indexers: Dict of index names and functions returning index keys of resource
+        """
+        self.kind = kind
+        self._list_func = list_func
+        self._watch_func = watch_func
+        self._watch_timeout = watch_timeout
+        self._indexers = indexers or {}
+        self._indices = {index_name: {} for index_name in self._indexers}
+        self._store = {}
+        self._store_lock = threading.Lock()
+        self._resource_version = None
+        self._synced = False
+        self._last_sync = None
+        self._watcher = None
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f'{kind}-informer', daemon=True)
+
+    def start(self):
+        """
+        Start informer thread
+        """
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop informer thread
+        """
+        self._stopped.set()
+        if self._watcher is not None:
+            self._watcher.stop()
+
+    def is_synced(self):
+        """
+        Check if initial list has been loaded into store
+
+        :return: True if store is synced
+        """
+        return self._synced
+
+    def get_staleness(self):
+        """
+        Get number of seconds elapsed since store was last confirmed to be up to date
+
+        :return: Staleness in seconds or None if store was never synced
+        """
+        if self._last_sync is None:
+            return None
+        return time.monotonic() - self._last_sync
+
+    def get_resource_version(self):
+        return self._resource_version
+
+    def get_size(self):
+        with self._store_lock:
+            return sum(len(resources) for resources in self._store.values())
+
+    def get(self, name, namespace=None):
+        """
+        Get resource from store
+
+        :param name: Resource name
+        :param namespace: Namespace resource, None for cluster scoped kinds
+        :return: Resource as Python dict or None if not found
+        """
+        with self._store_lock:
+            return self._store.get(namespace, {}).get(name)
+
+    def list(self, namespace=None):
+        """
+        List resources from store
+
+        :param namespace: Namespace resource, None for cluster scoped kinds
+        :return: List of resources as Python dicts
+        """
+        with self._store_lock:
+            return list(self._store.get(namespace, {}).values())
+
+    def list_all(self):
+        """
+        List resources of every namespace from store
+
+        :return: List of resources as Python dicts
+        """
+        with self._store_lock:
+            return [resource for resources in self._store.values() for resource in resources.values()]
+
+    def get_by_index(self, index_name, index_keys):
+        """
+        Get resources matching every provided key of index, cost depends only on number of indexed matches
+
+        :param index_name: Name of indexer
+        :param index_keys: List of index keys
+        :return: List of resources as Python dicts
+        """
+        with self._store_lock:
+            index = self._indices[index_name]
+            matches = sorted((index.get(index_key, set()) for index_key in index_keys), key=len)
+            if not matches:
+                return []
+            resource_keys = matches[0].intersection(*matches[1:])
+            return [self._store[namespace][name] for namespace, name in resource_keys]
+
+    def _index_resource(self, indices, resource):
+        metadata = resource['metadata']
+        resource_key = (metadata.get('namespace'), metadata['name'])
+        for index_name, index_func in self._indexers.items():
+            for index_key in index_func(resource):
+                indices[index_name].setdefault(index_key, set()).add(resource_key)
+
+    def _unindex_resource(self, resource):
+        metadata = resource['metadata']
+        resource_key = (metadata.get('namespace'), metadata['name'])
+        for index_name, index_func in self._indexers.items():
+            index = self._indices[index_name]
+            for index_key in index_func(resource):
+                resource_keys = index.get(index_key)
+                if resource_keys is not None:
+                    resource_keys.discard(resource_key)
+                    if not resource_keys:
+                        del index[index_key]
+
+    def _run(self):
+        backoff = self.MIN_BACKOFF_SECONDS
+        while not self._stopped.is_set():
+            try:
+                if self._resource_version is None:
+                    self._relist()
+                self._watch()
+                backoff = self.MIN_BACKOFF_SECONDS
+            except ApiException as e:
+                if e.status == HttpStatusCode.Gone.value:
+                    logging.info(f'{self.kind} watch expired at resourceVersion {self._resource_version}, relisting.')
+                    self._resource_version = None
+                    continue
+                logging.warning(f'{self.kind} informer failed: {e}')
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, self.MAX_BACKOFF_SECONDS)
+            except Exception as e:
+                logging.warning(f'{self.kind} informer failed: {e}')
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, self.MAX_BACKOFF_SECONDS)
+
+    def _relist(self):
+        response = self._list_func(_preload_content=False)
+        resources = JsonCodec.loads(response.data)
+        store = {}
+        indices = {index_name: {} for index_name in self._indexers}
+        for resource in resources['items']:
+            metadata = resource['metadata']
+            store.setdefault(metadata.get('namespace'), {})[metadata['name']] = resource
+            self._index_resource(indices, resource)
+        with self._store_lock:
+            self._store = store
+            self._indices = indices
+        self._resource_version = resources['metadata']['resourceVersion']
+        self._synced = True
+        self._last_sync = time.monotonic()
+
+    def _watch(self):
+        self._watcher = WatchStream()
+        for event in self._watcher.stream(self._watch_func,
+                                          resource_version=self._resource_version,
+                                          allow_watch_bookmarks=True,
+                                          timeout_seconds=self._watch_timeout):
+            resource = event['object']
+            metadata = resource['metadata']
+            if event['type'] in ('ADDED', 'MODIFIED'):
+                with self._store_lock:
+                    resources = self._store.setdefault(metadata.get('namespace'), {})
+                    previous_resource = resources.get(metadata['name'])
+                    if previous_resource is not None:
+                        self._unindex_resource(previous_resource)
+                    resources[metadata['name']] = resource
+                    self._index_resource(self._indices, resource)
+            elif event['type'] == 'DELETED':
+                with self._store_lock:
+                    previous_resource = self._store.get(metadata.get('namespace'), {}).pop(metadata['name'], None)
+                    if previous_resource is not None:
+                        self._unindex_resource(previous_resource)
+            self._resource_version = metadata['resourceVersion']
+            self._last_sync = time.monotonic()
+        # Watch closed cleanly after timeout, store is still consistent with Api server.
+        self._last_sync = time.monotonic()
+
+
+class ResourceCache:
+    """
+    In-memory read cache of Kubernetes resources kept in sync by one informer per kind.
+    """
+
+    def __init__(self, max_staleness, watch_timeout):
+        self._max_staleness = max_staleness
+        self._watch_timeout = watch_timeout
+        self._informers = {}
+
+    def add_informer(self, kind, list_func, watch_func, indexers=None):
+        """
+        Register and start informer for provided kind
+
+        :param kind: Resource kind
+        :param list_func: Function listing resources of kind in all namespaces, used for relists
+        :param watch_func: CoreV1Api function listing resources of kind in all namespaces, used to open watches
+        :param indexers: Dict of index names and functions returning index keys of resource
+        """
+        informer = ResourceInformer(kind, list_func, watch_func, self._watch_timeout, indexers)
+        self._informers[kind] = informer
+        informer.start()
+
+    def get_informer(self, kind, allow_stale=False):
+        """
+        Get informer for provided kind if its store can be used to answer reads
+
+        :param kind: Resource kind
+        :param allow_stale: Return synced informer even if it is too stale
+        :return: Informer or None if kind is not cached, not synced or too stale
+        """
+        informer = self._informers.get(kind)
+        if informer is None or not informer.is_synced():
+            return None
+        if not allow_stale and informer.get_staleness() > self._max_staleness:
+            return None
+        return informer
+
+    def get_status(self):
+        """
+        Get readiness and staleness of every informer
+
+        :return: List of informer statuses as Python dicts
+        """
+        return [
+            {
+                'kind': kind,
+                'synced': informer.is_synced(),
+                'fresh': self.get_informer(kind) is not None,
+                'staleness_seconds': informer.get_staleness(),
+                'resource_version': informer.get_resource_version(),
+                'size': informer.get_size()
+            }
+            for kind, informer in self._informers.items()
+        ]
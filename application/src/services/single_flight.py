@@ -0,0 +1,71 @@
+import threading
+
+
+class InFlightCall:
+    """
+    Upstream call whose result is shared by every caller waiting for the same key.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+
+
+class SingleFlight:
+    """
+    Collapses identical concurrent calls into one, callers arriving while call is in flight
+    wait for it and receive the same result or exception.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._executed_calls = 0
+        self._coalesced_calls = 0
+
+    def do(self, key, func):
+        """
+        Call func unless call with the same key is already in flight
+
+        :param key: Hashable key identifying call
+        :param func: Function without arguments
+        :return: Tuple of func result and flag telling if result was shared with another caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self._coalesced_calls += 1
+                is_leader = False
+            else:
+                call = self._calls[key] = InFlightCall()
+                self._executed_calls += 1
+                is_leader = True
+        if not is_leader:
+            call.done.wait()
+            if call.exception is not None:
+                raise call.exception
+            return call.result, True
+        try:
+            call.result = func()
+        except Exception as e:
+            call.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def get_statistics(self):
+        """
+        Get number of executed, coalesced and currently in-flight calls
+
+        :return: Statistics as Python dict
+        """
+        with self._lock:
+            return {
+                'in_flight_calls': len(self._calls),
+                'executed_calls': self._executed_calls,
+                'coalesced_calls': self._coalesced_calls
+            }
@@ -0,0 +1,247 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+from kubernetes.client.exceptions import ApiException
+
+from controllers.utils.http_status_code import HttpStatusCode
+from services.watch_stream import WatchStream
+
+
+class WatchSubscriber:
+    """
+    Single downstream watch client with bounded queue of pending events.
+    """
+
+    def __init__(self, queue_size):
+        self.events = queue.Queue(maxsize=queue_size)
+        self.closed = False
+
+    def send(self, event):
+        """
+        Put event into subscriber queue
+
+        :param event: Watch event
+        :return: False if subscriber is too slow and its queue is full
+        """
+        try:
+            self.events.put_nowait(event)
+            return True
+        except queue.Full:
+            return False
+
+    def close(self, event=None):
+        """
+        Close subscriber, optional final event is delivered even if queue is full
+
+        :param event: Final watch event
+        """
+        if self.closed:
+            return
+        self.closed = True
+        while True:
+            try:
+                self.events.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self.events.get_nowait()
+                except queue.Empty:
+                    pass
+
+
+class WatchBroadcaster:
+    """
+    Multiplexes single upstream Kubernetes watch of one kind in one namespace to many subscribers.
+    Recent events are kept in memory so subscribers can resume from resourceVersion.
+    """
+    MIN_BACKOFF_SECONDS = 1
+    MAX_BACKOFF_SECONDS = 30
+
+    def __init__(self, kind, list_func, namespace, queue_size, history_size, watch_timeout,
+                 get_resource_version):
+        """
+        :param kind: Resource kind
+        :param list_func: CoreV1Api function listing resources of kind, used to open upstream watch
+        :param namespace: Namespace resource, None for cluster scoped kinds
+        :param queue_size: Max number of events pending in queue of every subscriber
+        :param history_size: Max number of recent events kept for resuming subscribers
+        :param watch_timeout: Number of seconds after which upstream watch is reopened
+        :param get_resource_version: Function returning current resourceVersion of listed resources
+        """
+        self.kind = kind
+        self._list_func = list_func
+        self._get_resource_version = get_resource_version
+        self._namespace = namespace
+        self._queue_size = queue_size
+        self._watch_timeout = watch_timeout
+        self._history = deque(maxlen=history_size)
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._resource_version = None
+        self._history_start_version = None
+        self._thread = None
+        self._watcher = None
+        self._idle_since = time.monotonic()
+
+    def get_list_args(self):
+        return (self._namespace,) if self._namespace is not None else ()
+
+    def subscribe(self, resource_version=None, subscriber=None):
+        """
+        Subscribe to watch events, upstream watch is started for first subscriber
+
+        :param resource_version: resourceVersion to resume from, only new events are sent if not provided
+        :param subscriber: Object with send and close methods receiving events, queuing subscriber by default
+        :return: Subscriber
+        """
+        subscriber = subscriber or WatchSubscriber(self._queue_size)
+        with self._lock:
+            current_resource_version = self._resource_version
+        if current_resource_version is None:
+            # Api server is called without holding the lock, so slow list does not block other subscribers.
+            current_resource_version = self._get_resource_version()
+        with self._lock:
+            if self._resource_version is None:
+                self._resource_version = current_resource_version
+                self._history_start_version = current_resource_version
+            if resource_version:
+                if not self.replay_history(subscriber, resource_version):
+                    subscriber.close(self.get_expired_event(resource_version))
+                    return subscriber
+            subscriber.send(self.get_bookmark_event(self._resource_version))
+            self._subscribers.add(subscriber)
+            self._idle_since = None
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f'{self.kind}-watch-broadcaster', daemon=True)
+                self._thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        """
+        Remove subscriber, upstream watch stops once no subscribers are left
+
+        :param subscriber: Subscriber
+        """
+        with self._lock:
+            self._subscribers.discard(subscriber)
+            watcher = None
+            if not self._subscribers and self._idle_since is None:
+                watcher = self._watcher
+                self._idle_since = time.monotonic()
+        subscriber.close()
+        if watcher is not None:
+            # Upstream watch is stopped right away instead of after its next event.
+            watcher.stop()
+
+    def is_idle(self, idle_seconds):
+        """
+        Check if broadcaster has had no subscribers and no upstream watch for provided time
+
+        :param idle_seconds: Number of seconds
+        :return: True if broadcaster is idle
+        """
+        with self._lock:
+            return self._thread is None and self._idle_since is not None and \
+                time.monotonic() - self._idle_since >= idle_seconds
+
+    def replay_history(self, subscriber, resource_version):
+        """
+        Send buffered events newer than provided resourceVersion
+
+        :param subscriber: Subscriber
+        :param resource_version: resourceVersion to resume from
+        :return: False if resourceVersion is older than buffered events
+        """
+        if resource_version == self._resource_version:
+            return True
+        history = list(self._history)
+        versions = [self._history_start_version] + [event_version for event_version, _ in history]
+        if resource_version not in versions:
+            return False
+        for event_version, event in history[versions.index(resource_version):]:
+            if not subscriber.send(event):
+                return False
+        return True
+
+    def get_bookmark_event(self, resource_version):
+        return {'type': 'BOOKMARK', 'object': {'kind': self.kind, 'metadata': {'resourceVersion': resource_version}}}
+
+    def get_expired_event(self, resource_version):
+        return {
+            'type': 'ERROR',
+            'object': {
+                'kind': 'Status',
+                'code': HttpStatusCode.Gone.value,
+                'message': f'Too old resource version: {resource_version}.',
+                'metadata': {'resourceVersion': resource_version}
+            }
+        }
+
+    def broadcast(self, event):
+        """
+        Send event to every subscriber, subscribers whose queues are full are closed
+
+        :param event: Watch event
+        """
+        with self._lock:
+            resource_version = event['object']['metadata']['resourceVersion']
+            self._resource_version = resource_version
+            if event['type'] != 'BOOKMARK':
+                if len(self._history) == self._history.maxlen:
+                    self._history_start_version = self._history[0][0]
+                self._history.append((resource_version, event))
+            slow_subscribers = [subscriber for subscriber in self._subscribers if not subscriber.send(event)]
+            for subscriber in slow_subscribers:
+                self._subscribers.discard(subscriber)
+                subscriber.close(self.get_expired_event(resource_version))
+
+    def close_all(self, event):
+        with self._lock:
+            for subscriber in self._subscribers:
+                subscriber.close(event)
+            self._subscribers.clear()
+            self._idle_since = time.monotonic()
+            self._history.clear()
+            self._resource_version = None
+            self._history_start_version = None
+            self._thread = None
+            self._watcher = None
+
+    def _run(self):
+        backoff = self.MIN_BACKOFF_SECONDS
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    self._watcher = None
+                    if self._idle_since is None:
+                        self._idle_since = time.monotonic()
+                    return
+                resource_version = self._resource_version
+                watcher = self._watcher = WatchStream()
+            try:
+                for event in watcher.stream(self._list_func, *self.get_list_args(),
+                                            resource_version=resource_version,
+                                            allow_watch_bookmarks=True,
+                                            timeout_seconds=self._watch_timeout):
+                    self.broadcast(event)
+                    with self._lock:
+                        if not self._subscribers:
+                            watcher.stop()
+                backoff = self.MIN_BACKOFF_SECONDS
+                continue
+            except ApiException as e:
+                if e.status == HttpStatusCode.Gone.value:
+                    # Events between last seen resourceVersion and now are lost, subscribers have to relist.
+                    logging.info(f'{self.kind} watch expired at resourceVersion {resource_version}.')
+                    self.close_all(self.get_expired_event(resource_version))
+                    return
+                logging.warning(f'{self.kind} watch broadcaster failed: {e}')
+            except Exception as e:
+                logging.warning(f'{self.kind} watch broadcaster failed: {e}')
+            # Subscribers stay connected while watch is resumed from last seen resourceVersion.
+            time.sleep(backoff)
+            backoff = min(backoff * 2, self.MAX_BACKOFF_SECONDS)
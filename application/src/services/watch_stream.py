@@ -0,0 +1,70 @@
+import socket
+
+from kubernetes.client.exceptions import ApiException
+from kubernetes.watch.watch import iter_resp_lines
+
+from common.json_codec import JsonCodec
+from controllers.utils.http_status_code import HttpStatusCode
+
+
+class WatchStream:
+    """
+    Streams events of Kubernetes watch as Python dicts without deserializing them into models. ERROR events
+    sent by Api server in the stream, e.g. 410 Gone once watched resourceVersion expired, are raised
+    as ApiException with status of the event, so callers handle them like failed calls.
+    """
+
+    def __init__(self):
+        self._response = None
+        self._stopped = False
+
+    def stream(self, list_func, *args, **kwargs):
+        """
+        Open watch and yield its events until Api server closes it or watch is stopped
+
+        :param list_func: CoreV1Api function listing watched kind
+        :param args: Positional arguments of list function, e.g. namespace
+        :param kwargs: Keyword arguments of list function, e.g. resource_version and timeout_seconds
+        :return: Generator of watch events as Python dicts
+        """
+        self._stopped = False
+        response = list_func(*args, watch=True, _preload_content=False, **kwargs)
+        self._response = response
+        try:
+            if not 200 <= response.status <= 299:
+                raise ApiException(http_resp=response)
+            for line in iter_resp_lines(response):
+                if not line.strip():
+                    continue
+                event = JsonCodec.loads(line)
+                if event['type'] == 'ERROR':
+                    status = event.get('object') or {}
+                    raise ApiException(
+                        status=status.get('code', HttpStatusCode.InternalServerError.value),
+                        reason=f"{status.get('reason')}: {status.get('message')}"
+                    )
+                yield event
+                if self._stopped:
+                    return
+        except Exception:
+            # Reading from socket shut down by stop fails, watch just ends in that case.
+            if not self._stopped:
+                raise
+        finally:
+            self._response = None
+            response.close()
+            response.release_conn()
+
+    def stop(self):
+        """
+        Stop watch, thread blocked reading the stream is woken up by shutting down its socket
+        """
+        self._stopped = True
+        response = self._response
+        connection = getattr(response, 'connection', None) if response is not None else None
+        sock = getattr(connection, 'sock', None) if connection is not None else None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
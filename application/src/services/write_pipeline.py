@@ -0,0 +1,308 @@
+import fcntl
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+from common.json_codec import JsonCodec
+
+
+class OperationStore:
+    """
+    Keeps state of write operations for retention period after they finish. When directory is provided,
+    every state change is also written into it, so operations can be looked up by all processes sharing it.
+    """
+
+    def __init__(self, retention, directory=None):
+        self._retention = retention
+        self._directory = directory
+        self._operations = {}
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get_operation_path(self, operation_id):
+        return os.path.join(self._directory, f'{operation_id}.json')
+
+    def save(self, operation):
+        """
+        Store copy of operation state
+
+        :param operation: Operation as Python dict
+        """
+        with self._lock:
+            self._operations[operation['id']] = dict(operation)
+        if self._directory:
+            path = self.get_operation_path(operation['id'])
+            with open(path + '.tmp', 'wb') as operation_file:
+                operation_file.write(JsonCodec.dumps(operation))
+            # Readers never see partially written state.
+            os.replace(path + '.tmp', path)
+
+    def get(self, operation_id):
+        """
+        Get operation state
+
+        :param operation_id: Operation ID
+        :return: Operation as Python dict or None if operation is unknown or expired
+        """
+        with self._lock:
+            operation = self._operations.get(operation_id)
+        if operation is not None:
+            return dict(operation)
+        if not self._directory or not operation_id.isalnum():
+            return None
+        try:
+            with open(self.get_operation_path(operation_id), 'rb') as operation_file:
+                return JsonCodec.loads(operation_file.read())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def prune(self):
+        """
+        Remove operations finished longer than retention period ago
+        """
+        expiry = time.time() - self._retention
+        with self._lock:
+            expired_ids = [
+                operation_id for operation_id, operation in self._operations.items()
+                if operation['finished'] is not None and operation['finished'] < expiry
+            ]
+            for operation_id in expired_ids:
+                del self._operations[operation_id]
+        if self._directory:
+            for entry in os.scandir(self._directory):
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < expiry:
+                        os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+
+
+def is_process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class SharedOrder:
+    """
+    Orders operations with the same key across all worker processes sharing directory. Every operation takes
+    ticket from sequence of its key when it is queued and runs only once tickets taken before it are released.
+    Tickets of exited processes are dropped, as their queued operations are lost together with the process.
+    """
+    POLL_INTERVAL_SECONDS = 0.01
+
+    def __init__(self, directory):
+        self._directory = os.path.join(directory, 'order')
+        os.makedirs(self._directory, exist_ok=True)
+
+    def get_key_directory(self, key):
+        # Prefix keeps keys like '..' inside the directory.
+        return os.path.join(self._directory, 'key-' + quote(key, safe=''))
+
+    def take_ticket(self, key, operation_id):
+        """
+        Take next ticket of key
+
+        :param key: Ordering key
+        :param operation_id: Operation ID
+        :return: Ticket
+        """
+        key_directory = self.get_key_directory(key)
+        os.makedirs(key_directory, exist_ok=True)
+        with open(os.path.join(key_directory, 'sequence'), 'a+') as sequence_file:
+            # Ticket file is created under the lock, so tickets appear in the order of their sequence numbers.
+            fcntl.flock(sequence_file, fcntl.LOCK_EX)
+            sequence_file.seek(0)
+            sequence = int(sequence_file.read() or 0) + 1
+            sequence_file.seek(0)
+            sequence_file.truncate()
+            sequence_file.write(str(sequence))
+            sequence_file.flush()
+            ticket = f'{sequence:020d}-{os.getpid()}-{operation_id}.ticket'
+            open(os.path.join(key_directory, ticket), 'w').close()
+        return ticket
+
+    def wait_for_turn(self, key, ticket):
+        """
+        Block until all tickets of key taken before provided ticket are released
+
+        :param key: Ordering key
+        :param ticket: Ticket
+        """
+        key_directory = self.get_key_directory(key)
+        while True:
+            is_waiting = False
+            for name in os.listdir(key_directory):
+                if not name.endswith('.ticket') or name >= ticket:
+                    continue
+                if is_process_alive(int(name.split('-')[1])):
+                    is_waiting = True
+                else:
+                    self.release_ticket(key, name)
+            if not is_waiting:
+                return
+            time.sleep(self.POLL_INTERVAL_SECONDS)
+
+    def release_ticket(self, key, ticket):
+        try:
+            os.remove(os.path.join(self.get_key_directory(key), ticket))
+        except FileNotFoundError:
+            pass
+
+
+class WritePipeline:
+    """
+    Runs write operations in background on bounded worker pool. Operations with the same ordering key
+    are run one after another in submission order, operations with different keys run concurrently.
+    Order is kept across worker processes when they share order of keys.
+    """
+    PRUNE_INTERVAL_SECONDS = 60
+
+    def __init__(self, max_workers, max_pending, operation_store, on_finished=None, shared_order=None):
+        """
+        :param max_workers: Max number of operations run concurrently
+        :param max_pending: Max number of operations waiting to be run
+        :param operation_store: Store of operation states
+        :param on_finished: Function called with every finished operation
+        :param shared_order: Order of keys shared by worker processes, operations are ordered within process only
+            if not provided
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='write-pipeline')
+        self._max_pending = max_pending
+        self._operation_store = operation_store
+        self._on_finished = on_finished
+        self._queues = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._shared_order = shared_order
+        # Held while ticket is taken and operation queued, so queue of every key is in order of its tickets.
+        self._enqueue_lock = threading.Lock()
+        self._last_prune = time.monotonic()
+
+    def submit(self, key, func, description):
+        """
+        Queue operation behind operations with the same ordering key
+
+        :param key: Ordering key, e.g. namespace
+        :param func: Function without arguments returning tuple of status code and message
+        :param description: Python dict describing operation, e.g. action, kind, name and namespace
+        :return: Operation as Python dict or None if too many operations are pending
+        """
+        operation = {
+            **description,
+            'id': uuid.uuid4().hex,
+            'status': 'pending',
+            'code': None,
+            'message': None,
+            'created': time.time(),
+            'started': None,
+            'finished': None
+        }
+        with self._lock:
+            if self._pending >= self._max_pending:
+                return None
+            self._pending += 1
+        # Pending state is written before operation is queued, so it never overwrites state saved by worker,
+        # and file I/O does not block other submissions.
+        self._operation_store.save(operation)
+        queued_operation = dict(operation)
+        with self._enqueue_lock:
+            ticket = self._shared_order.take_ticket(key, operation['id']) if self._shared_order else None
+            with self._lock:
+                queue = self._queues.get(key)
+                is_idle = queue is None
+                if is_idle:
+                    queue = self._queues[key] = deque()
+                queue.append((operation, func, ticket))
+        if is_idle:
+            self._schedule(key)
+        self.prune()
+        return queued_operation
+
+    def get_operation(self, operation_id):
+        """
+        Get state of operation
+
+        :param operation_id: Operation ID
+        :return: Operation as Python dict or None if operation is unknown or expired
+        """
+        return self._operation_store.get(operation_id)
+
+    def get_statistics(self):
+        """
+        Get number of pending operations and ordering keys with pending operations
+
+        :return: Statistics as Python dict
+        """
+        with self._lock:
+            return {'pending_operations': self._pending, 'active_keys': len(self._queues)}
+
+    def prune(self):
+        now = time.monotonic()
+        if now - self._last_prune < self.PRUNE_INTERVAL_SECONDS:
+            return
+        self._last_prune = now
+        self._operation_store.prune()
+
+    def _run_next(self, key):
+        with self._lock:
+            operation, func, ticket = self._queues[key][0]
+        if ticket is not None:
+            # Operations of the key queued earlier by other worker processes run first.
+            self._shared_order.wait_for_turn(key, ticket)
+        operation['status'] = 'running'
+        operation['started'] = time.time()
+        self._operation_store.save(operation)
+        try:
+            operation['code'], operation['message'] = func()
+            operation['status'] = 'succeeded' if operation['code'] < 400 else 'failed'
+        except Exception as e:
+            logging.exception(f'Write operation {operation["id"]} failed')
+            operation['code'], operation['message'], operation['status'] = 500, str(e), 'failed'
+        finally:
+            if ticket is not None:
+                self._shared_order.release_ticket(key, ticket)
+        operation['finished'] = time.time()
+        self._operation_store.save(operation)
+        if self._on_finished is not None:
+            self._on_finished(operation)
+        with self._lock:
+            queue = self._queues[key]
+            queue.popleft()
+            self._pending -= 1
+            if not queue:
+                del self._queues[key]
+                return
+        # Next operation of the key is queued behind operations of other keys, so one busy key does not
+        # hold worker while others wait.
+        self._schedule(key)
+
+    def _schedule(self, key):
+        try:
+            self._executor.submit(self._run_next, key)
+        except RuntimeError:
+            # Executor is shut down, e.g. worker process is exiting, queued operations would never run.
+            self._fail_queued(key, 'Write pipeline is shut down.')
+
+    def _fail_queued(self, key, message):
+        with self._lock:
+            queue = self._queues.pop(key, deque())
+            self._pending -= len(queue)
+        for operation, _, ticket in queue:
+            if ticket is not None:
+                self._shared_order.release_ticket(key, ticket)
+            operation['code'], operation['message'], operation['status'] = 503, message, 'failed'
+            operation['finished'] = time.time()
+            self._operation_store.save(operation)
+            if self._on_finished is not None:
+                self._on_finished(operation)
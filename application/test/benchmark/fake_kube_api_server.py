@@ -0,0 +1,435 @@
+"""
+Local stand-in for Kubernetes Api server serving canned Pod, Service and Namespace responses.
+Response size, latency and rate of watch events are configurable, so benchmarks are reproducible without a cluster.
+"""
+import argparse
+import gzip
+import json
+import re
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+NAMESPACED_RESOURCE_PATH = re.compile(r'^/api/v1/namespaces/([^/]+)/(pods|services)(?:/([^/]+))?$')
+ALL_NAMESPACES_RESOURCE_PATH = re.compile(r'^/api/v1/(pods|services)$')
+NAMESPACE_PATH = re.compile(r'^/api/v1/namespaces(?:/([^/]+))?$')
+MISSING_RESOURCE_NAME = 'missing'
+INITIAL_RESOURCE_VERSION = 1000
+MAX_RECORDED_WRITES = 10000
+# Kubernetes Api server compresses only responses larger than 128 KiB.
+GZIP_MIN_BYTES = 128 * 1024
+
+
+class FakeKubeApiServerConfig:
+    def __init__(self, items, containers, padding_bytes, latency_ms, watch_event_interval_ms=0):
+        self.items = items
+        self.containers = containers
+        self.padding = 'x' * padding_bytes
+        self.latency = latency_ms / 1000
+        # Every open watch sends MODIFIED event of one of listed resources at this interval, 0 keeps watches silent.
+        self.watch_event_interval = watch_event_interval_ms / 1000
+        self.resource_version = INITIAL_RESOURCE_VERSION
+        # Watches from older resourceVersion fail with in-stream 410 Gone like after etcd compaction.
+        self.compacted_resource_version = 0
+        self.requests = Counter()
+        # Names of written resources in order of received create, patch and delete requests.
+        self.writes = deque(maxlen=MAX_RECORDED_WRITES)
+        # Status codes and Retry-After values of next requests failed on purpose.
+        self.failures = deque()
+        self.lock = threading.Lock()
+
+    def compact(self):
+        """
+        Bump resourceVersion and expire all older ones
+        """
+        with self.lock:
+            self.resource_version += 1
+            self.compacted_resource_version = self.resource_version
+
+    def next_resource_version(self):
+        """
+        Bump resourceVersion like every change of resource does
+
+        :return: New resourceVersion
+        """
+        with self.lock:
+            self.resource_version += 1
+            return self.resource_version
+
+    def count_request(self, method, path, watch=False):
+        with self.lock:
+            self.requests[(method, path, watch)] += 1
+
+    def fail_requests(self, count, status, retry_after=None):
+        """
+        Fail next requests, watches excluded, with provided status code
+
+        :param count: Number of failed requests
+        :param status: Status code of failed requests
+        :param retry_after: Value of Retry-After header of failed requests
+        """
+        with self.lock:
+            self.failures.extend([(status, retry_after)] * count)
+
+    def get_failure(self):
+        """
+        Take status code and Retry-After value of next failure
+
+        :return: Tuple of status code and Retry-After value or None if request should succeed
+        """
+        with self.lock:
+            return self.failures.popleft() if self.failures else None
+
+    def record_write(self, method, path, name):
+        with self.lock:
+            self.writes.append((method, path, name))
+
+    def get_written_names(self, method, path):
+        """
+        Get names of resources written by requests
+
+        :param method: HTTP method
+        :param path: URL path
+        :return: Resource names in order of requests
+        """
+        with self.lock:
+            return [name for write_method, write_path, name in self.writes
+                    if write_method == method and write_path == path]
+
+    def get_request_count(self, method, path, watch=False):
+        """
+        Get number of received requests
+
+        :param method: HTTP method
+        :param path: URL path
+        :param watch: True to count watch requests
+        :return: Number of requests
+        """
+        with self.lock:
+            return self.requests[(method, path, watch)]
+
+
+def get_pod(config, name, namespace):
+    """
+    Get canned Pod manifest
+
+    :param config: Fake server configuration
+    :param name: Pod name
+    :param namespace: Namespace name
+    :return: Pod manifest
+    """
+    return {
+        'kind': 'Pod',
+        'apiVersion': 'v1',
+        'metadata': {
+            'name': name,
+            'namespace': namespace,
+            'labels': {'app': 'benchmark'},
+            'annotations': {'padding': config.padding},
+            'resourceVersion': str(config.resource_version)
+        },
+        'spec': {
+            'serviceAccount': 'default',
+            'serviceAccountName': 'default',
+            'nodeName': 'node-1',
+            'securityContext': {},
+            'containers': [{'name': f'container-{i}', 'image': 'nginx'} for i in range(config.containers)]
+        },
+        'status': {
+            'phase': 'Running',
+            'podIP': '10.0.0.1',
+            'hostIP': '192.168.0.1',
+            'containerStatuses': [{'name': f'container-{i}', 'ready': True, 'image': 'nginx'}
+                                  for i in range(config.containers)]
+        }
+    }
+
+
+def get_service(config, name, namespace):
+    """
+    Get canned Service manifest
+
+    :param config: Fake server configuration
+    :param name: Service name
+    :param namespace: Namespace name
+    :return: Service manifest
+    """
+    return {
+        'kind': 'Service',
+        'apiVersion': 'v1',
+        'metadata': {
+            'name': name,
+            'namespace': namespace,
+            'annotations': {'padding': config.padding},
+            'resourceVersion': str(config.resource_version)
+        },
+        'spec': {
+            'selector': {'app': 'benchmark'},
+            'clusterIP': '10.1.0.1',
+            'type': 'ClusterIP',
+            'ports': [{'port': 80, 'protocol': 'TCP', 'targetPort': 8080}]
+        }
+    }
+
+
+def get_namespace(config, name):
+    """
+    Get canned Namespace manifest
+
+    :param config: Fake server configuration
+    :param name: Namespace name
+    :return: Namespace manifest
+    """
+    return {
+        'kind': 'Namespace',
+        'apiVersion': 'v1',
+        'metadata': {'name': name, 'resourceVersion': str(config.resource_version)},
+        'spec': {'finalizers': ['kubernetes']},
+        'status': {'phase': 'Active'}
+    }
+
+
+def get_watched_resource(config, path, index):
+    """
+    Get canned manifest of resource listed by watched path
+
+    :param config: Fake server configuration
+    :param path: URL path of watch request
+    :param index: Index of resource in list response
+    :return: Resource manifest or None if path is not listed
+    """
+    match = NAMESPACED_RESOURCE_PATH.match(path)
+    if match:
+        namespace, resource, _ = match.groups()
+    else:
+        match = ALL_NAMESPACES_RESOURCE_PATH.match(path)
+        namespace, resource = 'default', match.group(1) if match else None
+    if resource is not None:
+        get_resource = get_pod if resource == 'pods' else get_service
+        return get_resource(config, f'{resource}-{index}', namespace)
+    if NAMESPACE_PATH.match(path):
+        return get_namespace(config, f'namespace-{index}' if index else 'default')
+    return None
+
+
+def get_list(config, items, accept, limit=None, _continue=None):
+    """
+    Get canned list response, only metadata is returned when PartialObjectMetadataList is requested
+
+    :param config: Fake server configuration
+    :param items: Generator of list items
+    :param accept: Accept header of request
+    :param limit: Max number of items in page
+    :param _continue: Continue token
+    :return: List manifest
+    """
+    items = list(items)
+    start = int(_continue) if _continue else 0
+    end = start + limit if limit else len(items)
+    page = items[start:end]
+    if 'as=PartialObjectMetadataList' in (accept or ''):
+        page = [{'metadata': item['metadata']} for item in page]
+    return {
+        'kind': 'List',
+        'apiVersion': 'v1',
+        'metadata': {'resourceVersion': str(config.resource_version), 'continue': str(end) if end < len(items) else ''},
+        'items': page
+    }
+
+
+class FakeKubeApiHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    config = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if len(data) >= GZIP_MIN_BYTES and 'gzip' in (self.headers.get('Accept-Encoding') or ''):
+            data = gzip.compress(data, compresslevel=1)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_not_found(self):
+        self.send_json(404, {'kind': 'Status', 'apiVersion': 'v1', 'status': 'Failure', 'reason': 'NotFound',
+                             'message': 'not found', 'code': 404})
+
+    def send_failure(self):
+        """
+        Send failure injected by fail_requests
+
+        :return: True if request was failed
+        """
+        failure = self.config.get_failure()
+        if failure is None:
+            return False
+        status, retry_after = failure
+        self.send_json(status, {'kind': 'Status', 'apiVersion': 'v1', 'status': 'Failure',
+                                'message': 'injected failure', 'code': status},
+                       {'Retry-After': str(retry_after)} if retry_after is not None else None)
+        return True
+
+    def send_chunk(self, data):
+        self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+        self.wfile.flush()
+
+    def send_events(self, path, timeout):
+        deadline = time.monotonic() + timeout
+        index = 0
+        while deadline - time.monotonic() > self.config.watch_event_interval:
+            time.sleep(self.config.watch_event_interval)
+            self.config.next_resource_version()
+            resource = get_watched_resource(self.config, path, index % self.config.items)
+            if resource is None:
+                break
+            self.send_chunk(json.dumps({'type': 'MODIFIED', 'object': resource}).encode('utf-8') + b'\n')
+            index += 1
+        time.sleep(max(deadline - time.monotonic(), 0))
+
+    def send_watch(self, path, query):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        resource_version = query.get('resourceVersion', [''])[0]
+        if resource_version and int(resource_version) < self.config.compacted_resource_version:
+            # Api server reports expired resourceVersion in the stream after it already answered with 200.
+            self.send_chunk(json.dumps({'type': 'ERROR', 'object': {
+                'kind': 'Status', 'apiVersion': 'v1', 'metadata': {}, 'status': 'Failure', 'reason': 'Expired',
+                'message': f'too old resource version: {resource_version} '
+                           f'({self.config.compacted_resource_version})', 'code': 410
+            }}).encode('utf-8') + b'\n')
+        else:
+            timeout = int(query.get('timeoutSeconds', ['1'])[0])
+            if self.config.watch_event_interval:
+                self.send_events(path, timeout)
+            else:
+                # Watches stay open without events until requested timeout elapses.
+                time.sleep(timeout)
+        self.wfile.write(b'0\r\n\r\n')
+
+    def read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length)
+        return json.loads(body) if body else {}
+
+    def do_GET(self):
+        time.sleep(self.config.latency)
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        self.config.count_request('GET', url.path, bool(query.get('watch')))
+        if query.get('watch'):
+            return self.send_watch(url.path, query)
+        if self.send_failure():
+            return
+        limit = int(query['limit'][0]) if 'limit' in query else None
+        _continue = query.get('continue', [None])[0]
+        accept = self.headers.get('Accept')
+
+        match = NAMESPACED_RESOURCE_PATH.match(url.path)
+        if match:
+            namespace, resource, name = match.groups()
+            get_resource = get_pod if resource == 'pods' else get_service
+            if name is None:
+                # Api server lists namespace which does not exist as empty.
+                count = 0 if namespace == MISSING_RESOURCE_NAME else self.config.items
+                items = (get_resource(self.config, f'{resource}-{i}', namespace) for i in range(count))
+                return self.send_json(200, get_list(self.config, items, accept, limit, _continue))
+            if MISSING_RESOURCE_NAME in (name, namespace):
+                return self.send_not_found()
+            return self.send_json(200, get_resource(self.config, name, namespace))
+
+        match = ALL_NAMESPACES_RESOURCE_PATH.match(url.path)
+        if match:
+            resource = match.group(1)
+            get_resource = get_pod if resource == 'pods' else get_service
+            items = (get_resource(self.config, f'{resource}-{i}', 'default') for i in range(self.config.items))
+            return self.send_json(200, get_list(self.config, items, accept, limit, _continue))
+
+        match = NAMESPACE_PATH.match(url.path)
+        if match:
+            name = match.group(1)
+            if name is None:
+                names = ['default'] + [f'namespace-{i}' for i in range(1, self.config.items)]
+                items = (get_namespace(self.config, name) for name in names)
+                return self.send_json(200, get_list(self.config, items, accept, limit, _continue))
+            if name == MISSING_RESOURCE_NAME:
+                return self.send_not_found()
+            return self.send_json(200, get_namespace(self.config, name))
+
+        self.send_not_found()
+
+    def do_POST(self):
+        time.sleep(self.config.latency)
+        path = urlparse(self.path).path
+        self.config.count_request('POST', path)
+        body = self.read_body()
+        if self.send_failure():
+            return
+        self.config.record_write('POST', path, (body.get('metadata') or {}).get('name'))
+        self.send_json(201, body)
+
+    def do_PATCH(self):
+        time.sleep(self.config.latency)
+        path = urlparse(self.path).path
+        self.config.count_request('PATCH', path)
+        body = self.read_body()
+        if self.send_failure():
+            return
+        self.config.record_write('PATCH', path, path.rsplit('/', 1)[-1])
+        self.send_json(200, body)
+
+    def do_DELETE(self):
+        time.sleep(self.config.latency)
+        path = urlparse(self.path).path
+        self.config.count_request('DELETE', path)
+        self.read_body()
+        if self.send_failure():
+            return
+        self.config.record_write('DELETE', path, path.rsplit('/', 1)[-1])
+        self.send_json(200, {'kind': 'Status', 'apiVersion': 'v1', 'status': 'Success'})
+
+
+class FakeKubeApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def handle_error(self, request, client_address):
+        # App closes pooled connections on shutdown, resets are expected.
+        pass
+
+
+def create_fake_kube_api_server(port, config):
+    """
+    Create fake Kubernetes Api server
+
+    :param port: Port to listen on
+    :param config: Fake server configuration
+    :return: HTTP server
+    """
+    handler = type('ConfiguredFakeKubeApiHandler', (FakeKubeApiHandler,), {'config': config})
+    return FakeKubeApiServer(('127.0.0.1', port), handler)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Fake Kubernetes Api server')
+    parser.add_argument('--port', type=int, default=18080)
+    parser.add_argument('--items', type=int, default=100, help='Number of items in list responses')
+    parser.add_argument('--containers', type=int, default=2, help='Number of containers in every Pod')
+    parser.add_argument('--padding-bytes', type=int, default=0, help='Size of annotation added to every resource')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Latency added to every response')
+    parser.add_argument('--watch-event-interval-ms', type=float, default=0,
+                        help='Interval of events sent by every open watch, watches are silent by default')
+    args = parser.parse_args()
+    create_fake_kube_api_server(args.port, FakeKubeApiServerConfig(
+        args.items, args.containers, args.padding_bytes, args.latency_ms, args.watch_event_interval_ms
+    )).serve_forever()
@@ -0,0 +1,67 @@
+"""
+Micro-benchmark of DTO marshaling comparing FlaskRestPlus marshal with models compiled into projection functions.
+Canned Pod, Service and Namespace manifests of fake Kubernetes Api server are used as input.
+"""
+import argparse
+import os
+import sys
+import timeit
+
+from fake_kube_api_server import FakeKubeApiServerConfig, get_namespace, get_pod, get_service
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src')
+
+
+def run_marshal_benchmark(containers, padding_bytes, number):
+    """
+    Measure marshaling time of every kind with both marshaling paths
+
+    :param containers: List of numbers of containers in Pod
+    :param padding_bytes: Size of annotation added to every resource
+    :param number: Number of marshal calls per measurement
+    :return: List of results as Python dicts
+    """
+    sys.path.insert(0, SRC_DIR)
+    # DTO modules are imported through app module, so api models are registered the same way as in the app.
+    import main  # noqa: F401
+    from flask_restplus import marshal
+    from common.model_compiler import compile_model
+    from dto.namespace_dto import NamespaceDto
+    from dto.pod_dto import PodDto
+    from dto.service_dto import ServiceDto
+
+    cases = []
+    for container_count in containers:
+        config = FakeKubeApiServerConfig(1, container_count, padding_bytes, 0)
+        cases.append((f'pod_{container_count}_containers', get_pod(config, 'benchmark', 'default'), PodDto.model))
+    config = FakeKubeApiServerConfig(1, 1, padding_bytes, 0)
+    cases.append(('service', get_service(config, 'benchmark', 'default'), ServiceDto.model))
+    cases.append(('namespace', get_namespace(config, 'benchmark'), NamespaceDto.model))
+
+    results = []
+    for name, resource, model in cases:
+        project = compile_model(model)
+        if project(resource) != marshal(resource, model):
+            raise AssertionError(f'Compiled marshaling of {name} differs from FlaskRestPlus marshal.')
+        flask_restplus_time = min(timeit.repeat(lambda: marshal(resource, model), number=number, repeat=5))
+        compiled_time = min(timeit.repeat(lambda: project(resource), number=number, repeat=5))
+        results.append({
+            'case': name,
+            'flask_restplus_us': flask_restplus_time / number * 1e6,
+            'compiled_us': compiled_time / number * 1e6,
+            'speedup': flask_restplus_time / compiled_time
+        })
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare FlaskRestPlus marshal with compiled models')
+    parser.add_argument('--containers', type=int, nargs='*', default=[1, 10, 50],
+                        help='Numbers of containers in benchmarked Pods')
+    parser.add_argument('--padding-bytes', type=int, default=0, help='Size of annotation added to every resource')
+    parser.add_argument('--number', type=int, default=2000, help='Number of marshal calls per measurement')
+    args = parser.parse_args()
+    print(f'{"case":<24}{"flask_restplus [us]":>22}{"compiled [us]":>16}{"speedup":>10}')
+    for result in run_marshal_benchmark(args.containers, args.padding_bytes, args.number):
+        print(f'{result["case"]:<24}{result["flask_restplus_us"]:>22.1f}{result["compiled_us"]:>16.1f}'
+              f'{result["speedup"]:>9.1f}x')
@@ -0,0 +1,364 @@
+"""
+Benchmark of every app route against local fake Kubernetes Api server.
+Reports throughput, latency percentiles and RSS of the app and optionally fails
+when results regress compared with baseline results of previous run.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+import requests
+
+from fake_kube_api_server import FakeKubeApiServerConfig, create_fake_kube_api_server
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src')
+KUBECONFIG_TEMPLATE = """apiVersion: v1
+kind: Config
+clusters:
+- name: fake
+  cluster:
+    server: http://127.0.0.1:{port}
+users:
+- name: fake
+  user:
+    token: fake
+contexts:
+- name: fake
+  context:
+    cluster: fake
+    user: fake
+current-context: fake
+"""
+POD_MANIFEST = {
+    'metadata': {'labels': {'app': 'benchmark'}},
+    'spec': {'containers': [{'name': 'nginx', 'image': 'nginx', 'ports': [{'containerPort': 80}]}]}
+}
+SERVICE_MANIFEST = {
+    'spec': {'selector': {'app': 'benchmark'}, 'ports': [{'protocol': 'TCP', 'port': 80, 'targetPort': 80}]}
+}
+BULK_NAMES = [f'benchmark-{i}' for i in range(10)]
+OPERATION_TIMEOUT_SECONDS = 30
+RESPOND_ASYNC = {'headers': {'Prefer': 'respond-async'}, 'follow_location': True}
+
+# Scenario name, HTTP method, path, JSON body, expected status code and optional request options:
+# headers sent with request, stream to measure time to first line of streamed response and follow_location
+# to poll operation returned in Location header until it finishes.
+SCENARIOS = [
+    ('pod_get', 'GET', '/pod/benchmark/default/', None, 200),
+    ('pod_create', 'POST', '/pod/benchmark/default/', POD_MANIFEST, 202),
+    ('pod_update', 'PUT', '/pod/benchmark/default/', {'metadata': {'labels': {'app': 'updated'}}}, 202),
+    ('pod_delete', 'DELETE', '/pod/benchmark/default/', None, 202),
+    ('pod_create_async', 'POST', '/pod/benchmark/default/', POD_MANIFEST, 202, RESPOND_ASYNC),
+    ('pod_delete_async', 'DELETE', '/pod/benchmark/default/', None, 202, RESPOND_ASYNC),
+    ('pod_wait_ready', 'GET', '/pod/benchmark/default/wait?timeout=5', None, 200),
+    ('pod_bulk_create', 'POST', '/pod/_bulk/default',
+     [dict(POD_MANIFEST, metadata={'name': name, 'labels': {'app': 'benchmark'}}) for name in BULK_NAMES], 207),
+    ('pod_bulk_delete', 'DELETE', '/pod/_bulk/default', BULK_NAMES, 207),
+    ('pod_apply', 'PUT', '/pod/benchmark/default/?patchType=apply', POD_MANIFEST, 202),
+    ('service_get', 'GET', '/service/benchmark/default/', None, 200),
+    ('service_create', 'POST', '/service/benchmark/default/', SERVICE_MANIFEST, 202),
+    ('service_update', 'PUT', '/service/benchmark/default/', {'spec': {'selector': {'app': 'updated'}}}, 202),
+    ('service_delete', 'DELETE', '/service/benchmark/default/', None, 202),
+    ('service_endpoints', 'GET', '/service/benchmark/default/endpoints', None, 200),
+    ('service_bulk_create', 'POST', '/service/_bulk/default',
+     [dict(SERVICE_MANIFEST, metadata={'name': name}) for name in BULK_NAMES], 207),
+    ('service_bulk_delete', 'DELETE', '/service/_bulk/default', BULK_NAMES, 207),
+    ('apply_manifests', 'POST', '/apply',
+     [dict(POD_MANIFEST, kind='Pod', apiVersion='v1', metadata={'name': name}) for name in BULK_NAMES] +
+     [dict(SERVICE_MANIFEST, kind='Service', apiVersion='v1', metadata={'name': name}) for name in BULK_NAMES], 207),
+    ('apply_manifests_dry_run', 'POST', '/apply?dryRun=true',
+     [dict(POD_MANIFEST, kind='Pod', apiVersion='v1', metadata={'name': name}) for name in BULK_NAMES], 207),
+    ('namespace_get', 'GET', '/namespace/benchmark/', None, 200),
+    ('namespace_create', 'POST', '/namespace/benchmark/', None, 202),
+    ('namespace_delete', 'DELETE', '/namespace/benchmark/', None, 202),
+    ('namespace_wait_deleted', 'GET', '/namespace/missing/wait?timeout=5', None, 200),
+    ('namespace_bulk_create', 'POST', '/namespace/_bulk', BULK_NAMES, 207),
+    ('namespace_bulk_delete', 'DELETE', '/namespace/_bulk', BULK_NAMES, 207),
+    ('namespace_snapshot', 'GET', '/namespace/default/snapshot', None, 200),
+    ('cluster_snapshot', 'GET', '/namespace/_snapshot', None, 200),
+    ('list_pods', 'GET', '/list_resources/default/pod', None, 200),
+    ('list_services', 'GET', '/list_resources/default/service', None, 200),
+    ('list_namespaces', 'GET', '/list_resources/default/namespace', None, 200),
+    ('list_pods_paginated', 'GET', '/list_resources/default/pod?limit=50', None, 200),
+    ('list_pods_fields', 'GET', '/list_resources/default/pod?fields=status.phase,status.podIP', None, 200),
+    ('stream_pods', 'GET', '/list_resources/default/pod/stream?limit=50', None, 200),
+    ('watch_pods', 'GET', '/watch/default/pod', None, 200, {'stream': True}),
+    ('metrics', 'GET', '/metrics', None, 200),
+]
+
+
+def get_rss_kb(pid):
+    """
+    Get resident set size of process and all its children
+
+    :param pid: Process id
+    :return: RSS in kB
+    """
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as stat:
+                parent_pid = int(stat.read().rsplit(')', 1)[1].split()[1])
+            children.setdefault(parent_pid, []).append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+    rss_kb = 0
+    pids = [pid]
+    while pids:
+        current_pid = pids.pop()
+        pids.extend(children.get(current_pid, []))
+        try:
+            with open(f'/proc/{current_pid}/status') as status:
+                for line in status:
+                    if line.startswith('VmRSS:'):
+                        rss_kb += int(line.split()[1])
+        except OSError:
+            continue
+    return rss_kb
+
+
+def get_percentile(sorted_values, percentile):
+    """
+    Get percentile of sorted values
+
+    :param sorted_values: Sorted list of values
+    :param percentile: Percentile between 0 and 100
+    :return: Percentile value
+    """
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, int(round(percentile / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def start_app(server, port, kubeconfig_path, workers, threads, concurrency):
+    """
+    Start app process connected to fake Kubernetes Api server
+
+    :param server: gunicorn or flask
+    :param port: App port
+    :param kubeconfig_path: Path to kubeconfig pointing to fake Kubernetes Api server
+    :param workers: Number of Gunicorn workers
+    :param threads: Number of Gunicorn threads per worker
+    :param concurrency: Number of concurrent clients, watch streams and waits are capped above it
+    :return: App process
+    """
+    env = dict(os.environ, KUBECONFIG=kubeconfig_path, K8S_ENVIRONMENT='False', FLASK_APP='main.py',
+               GUNICORN_PORT=str(port), GUNICORN_WORKERS=str(workers), GUNICORN_THREADS=str(threads),
+               K8S_WATCH_MAX_STREAMS=str(concurrency), K8S_WAIT_MAX_CONCURRENT=str(concurrency))
+    if server == 'gunicorn':
+        command = ['gunicorn', '--config', 'gunicorn_config.py', '--access-logfile', '/dev/null', 'main:app']
+    else:
+        command = ['flask', 'run', '--port', str(port), '--with-threads']
+    return subprocess.Popen(command, cwd=SRC_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_for_app(url, timeout=30):
+    """
+    Wait until app responds
+
+    :param url: App URL
+    :param timeout: Timeout in seconds
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f'{url}/swagger.json')
+            return
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    raise TimeoutError(f'App did not start within {timeout} seconds.')
+
+
+def wait_for_operation(session, url, location):
+    """
+    Poll queued write operation until it finishes
+
+    :param session: Requests session
+    :param url: App URL
+    :param location: Location header of response which queued operation
+    :return: Final operation status
+    """
+    deadline = time.monotonic() + OPERATION_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        status = session.get(urljoin(url, location)).json()['status']
+        if status not in ('pending', 'running'):
+            return status
+        time.sleep(0.01)
+    return 'timeout'
+
+
+def send_request(session, url, scenario):
+    """
+    Send request of scenario
+
+    :param session: Requests session
+    :param url: App URL
+    :param scenario: Scenario tuple
+    :return: True if request succeeded
+    """
+    _, method, path, body, expected_status = scenario[:5]
+    options = scenario[5] if len(scenario) > 5 else {}
+    stream = options.get('stream', False)
+    response = session.request(method, f'{url}{path}', json=body, headers=options.get('headers'), stream=stream)
+    if response.status_code != expected_status:
+        response.close()
+        return False
+    if stream:
+        # Stream stays open until client leaves, so only first line is read.
+        next(response.iter_lines(chunk_size=1), None)
+        response.close()
+    if options.get('follow_location'):
+        return wait_for_operation(session, url, response.headers['Location']) == 'succeeded'
+    return True
+
+
+def run_scenario(url, scenario, concurrency, requests_per_scenario):
+    """
+    Send requests of single scenario at fixed concurrency
+
+    :param url: App URL
+    :param scenario: Scenario tuple
+    :param concurrency: Number of concurrent clients
+    :param requests_per_scenario: Total number of requests
+    :return: Scenario results
+    """
+    name = scenario[0]
+    latencies = []
+    errors = []
+    remaining = [requests_per_scenario]
+    lock = threading.Lock()
+
+    def client():
+        session = requests.Session()
+        while True:
+            with lock:
+                if remaining[0] == 0:
+                    return
+                remaining[0] -= 1
+            start = time.perf_counter()
+            succeeded = send_request(session, url, scenario)
+            latency = time.perf_counter() - start
+            with lock:
+                latencies.append(latency)
+                if not succeeded:
+                    errors.append(name)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(client)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'scenario': name,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'throughput': len(latencies) / elapsed,
+        'p50_ms': get_percentile(latencies, 50) * 1000,
+        'p95_ms': get_percentile(latencies, 95) * 1000,
+        'p99_ms': get_percentile(latencies, 99) * 1000
+    }
+
+
+def get_regressions(results, baseline, max_regression):
+    """
+    Compare results with baseline results
+
+    :param results: Benchmark results
+    :param baseline: Baseline benchmark results
+    :param max_regression: Allowed relative regression
+    :return: List of regression descriptions
+    """
+    baseline_scenarios = {scenario['scenario']: scenario for scenario in baseline['scenarios']}
+    regressions = []
+    for scenario in results['scenarios']:
+        previous = baseline_scenarios.get(scenario['scenario'])
+        if previous is None:
+            continue
+        if scenario['throughput'] < previous['throughput'] * (1 - max_regression):
+            regressions.append(f"{scenario['scenario']}: throughput {previous['throughput']:.1f} -> "
+                               f"{scenario['throughput']:.1f} req/s")
+        if scenario['p95_ms'] > previous['p95_ms'] * (1 + max_regression):
+            regressions.append(f"{scenario['scenario']}: p95 {previous['p95_ms']:.1f} -> {scenario['p95_ms']:.1f} ms")
+    if results['rss_kb'] > baseline['rss_kb'] * (1 + max_regression):
+        regressions.append(f"RSS {baseline['rss_kb']} -> {results['rss_kb']} kB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark app routes against fake Kubernetes Api server')
+    parser.add_argument('--server', choices=['gunicorn', 'flask'], default='gunicorn')
+    parser.add_argument('--app-port', type=int, default=15000)
+    parser.add_argument('--api-port', type=int, default=18080)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=500, help='Number of requests per scenario')
+    parser.add_argument('--warmup', type=int, default=50, help='Number of not measured requests per scenario')
+    parser.add_argument('--items', type=int, default=100, help='Number of items in list responses')
+    parser.add_argument('--containers', type=int, default=2, help='Number of containers in every Pod')
+    parser.add_argument('--padding-bytes', type=int, default=0, help='Size of annotation added to every resource')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Latency of fake Kubernetes Api server')
+    parser.add_argument('--watch-event-interval-ms', type=float, default=0,
+                        help='Interval of events sent by every watch of fake Kubernetes Api server')
+    parser.add_argument('--scenarios', nargs='*', help='Names of scenarios to run, all by default')
+    parser.add_argument('--output', help='Path to write results as JSON')
+    parser.add_argument('--baseline', help='Path to baseline results JSON')
+    parser.add_argument('--max-regression', type=float, default=0.2, help='Allowed relative regression')
+    args = parser.parse_args()
+
+    api_server = create_fake_kube_api_server(args.api_port, FakeKubeApiServerConfig(
+        args.items, args.containers, args.padding_bytes, args.latency_ms, args.watch_event_interval_ms
+    ))
+    threading.Thread(target=api_server.serve_forever, daemon=True).start()
+
+    with tempfile.NamedTemporaryFile('w', suffix='.yaml', delete=False) as kubeconfig:
+        kubeconfig.write(KUBECONFIG_TEMPLATE.format(port=args.api_port))
+    url = f'http://127.0.0.1:{args.app_port}'
+    app = start_app(args.server, args.app_port, kubeconfig.name, args.workers, args.threads, args.concurrency)
+    try:
+        wait_for_app(url)
+        scenarios = [scenario for scenario in SCENARIOS if not args.scenarios or scenario[0] in args.scenarios]
+        results = {'parameters': vars(args), 'scenarios': []}
+        print(f"{'scenario':<24}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+        for scenario in scenarios:
+            run_scenario(url, scenario, args.concurrency, args.warmup)
+            result = run_scenario(url, scenario, args.concurrency, args.requests)
+            results['scenarios'].append(result)
+            print(f"{result['scenario']:<24}{result['throughput']:>10.1f}{result['p50_ms']:>10.2f}"
+                  f"{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['errors']:>8}")
+        results['rss_kb'] = get_rss_kb(app.pid)
+        print(f"RSS: {results['rss_kb']} kB")
+    finally:
+        app.terminate()
+        app.wait()
+        api_server.shutdown()
+        os.unlink(kubeconfig.name)
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+    if any(result['errors'] for result in results['scenarios']):
+        print('Some requests returned unexpected status codes or their operations failed.')
+        sys.exit(1)
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            regressions = get_regressions(results, json.load(baseline), args.max_regression)
+        if regressions:
+            print('Performance regressions detected:')
+            print('\n'.join(regressions))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Startup profile of the app. Python -X importtime reports import cost of every module while app module is imported,
+first request is served and services deferred at startup are imported. The same report is written to container logs
+of every Gunicorn worker when server.profileImports is enabled in Helm chart values and can be summarized with --log.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src')
+IMPORT_TIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+STARTUP_SCRIPT = '''
+import sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+status_code = main.app.test_client().get(sys.argv[1]).status_code
+served = time.perf_counter()
+from services.crud_service_provider import CRUDServiceProvider
+CRUDServiceProvider.import_services()
+services_imported = time.perf_counter()
+print(status_code, imported - start, served - imported, services_imported - served)
+'''
+
+
+def parse_import_times(lines):
+    """
+    Parse output of Python -X importtime
+
+    :param lines: Lines of output, lines not reported by -X importtime are skipped
+    :return: List of imported modules as Python dicts with self and cumulative time in microseconds
+    """
+    import_times = []
+    for line in lines:
+        match = IMPORT_TIME_LINE.search(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            import_times.append({
+                'module': module,
+                'self_us': int(self_us),
+                'cumulative_us': int(cumulative_us),
+                'depth': (len(indent) - 1) // 2
+            })
+    return import_times
+
+
+def get_package_times(import_times):
+    """
+    Sum self time of imported modules per top-level package
+
+    :param import_times: Parsed imported modules
+    :return: List of tuples of package and time in microseconds, most expensive first
+    """
+    package_times = {}
+    for import_time in import_times:
+        package = import_time['module'].split('.', 1)[0]
+        package_times[package] = package_times.get(package, 0) + import_time['self_us']
+    return sorted(package_times.items(), key=lambda item: item[1], reverse=True)
+
+
+def run_startup_profile(path):
+    """
+    Import app in fresh interpreter, serve first request and import deferred services
+
+    :param path: Path of first request
+    :return: Tuple of startup timings as Python dict and parsed imported modules
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT, path],
+        cwd=SRC_DIR, capture_output=True, text=True, check=True
+    )
+    status_code, imported, served, services_imported = result.stdout.split()[-4:]
+    timings = {
+        'first_request_status': int(status_code),
+        'import_app_ms': float(imported) * 1e3,
+        'first_request_ms': float(served) * 1e3,
+        'import_services_ms': float(services_imported) * 1e3
+    }
+    return timings, parse_import_times(result.stderr.splitlines())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Report import cost per module during app startup')
+    parser.add_argument('--path', default='/swagger.json', help='Path of first request served after startup')
+    parser.add_argument('--log', help='Summarize -X importtime report from log file instead of starting app')
+    parser.add_argument('--top', type=int, default=20, help='Number of reported modules and packages')
+    args = parser.parse_args()
+    if args.log:
+        with open(args.log) as log:
+            import_times = parse_import_times(log)
+    else:
+        timings, import_times = run_startup_profile(args.path)
+        for name, value in timings.items():
+            print(f'{name:<24}{value:>12.1f}' if isinstance(value, float) else f'{name:<24}{value:>12}')
+        print()
+    print(f'{"module":<48}{"self [ms]":>12}{"cumulative [ms]":>18}')
+    for import_time in sorted(import_times, key=lambda item: item['self_us'], reverse=True)[:args.top]:
+        print(f'{import_time["module"]:<48}{import_time["self_us"] / 1e3:>12.1f}'
+              f'{import_time["cumulative_us"] / 1e3:>18.1f}')
+    print()
+    print(f'{"package":<48}{"self [ms]":>12}')
+    for package, self_us in get_package_times(import_times)[:args.top]:
+        print(f'{package:<48}{self_us / 1e3:>12.1f}')
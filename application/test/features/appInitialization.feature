@@ -6,6 +6,12 @@ Feature: Application initialization
     When GET request is sent to "localhost:5000/swagger.json"
     Then status code is "200"
 
+  @good_case
+  Scenario: Prometheus metrics are served
+    Given flask application tries to start on port "5000"
+    When GET request is sent to "localhost:5000/metrics"
+    Then status code is "200"
+
   @bad_case
   Scenario: Application fails to start due invalid port range
     Given flask application tries to start on port "100000"
@@ -0,0 +1,52 @@
+Feature: Circuit breaker of Kubernetes Api calls
+
+  @good_case
+  Scenario: Circuit opens once failure rate crosses threshold
+    Given circuit breaker with failure rate threshold "0.5", window of "4" calls and open duration of "0.2" seconds
+    When "2" successful calls are recorded
+    And "2" failed calls are recorded
+    Then circuit breaker is "open"
+    And call is rejected
+
+  @good_case
+  Scenario: Circuit stays closed below failure rate threshold
+    Given circuit breaker with failure rate threshold "0.5", window of "4" calls and open duration of "0.2" seconds
+    When "3" successful calls are recorded
+    And "1" failed calls are recorded
+    Then circuit breaker is "closed"
+
+  @good_case
+  Scenario: Circuit closes after successful probe calls
+    Given circuit breaker with failure rate threshold "0.5", window of "4" calls and open duration of "0.2" seconds
+    When "4" failed calls are recorded
+    And open duration elapses
+    Then circuit breaker is "half_open"
+    When "2" successful calls are recorded
+    Then circuit breaker is "closed"
+
+  @good_case
+  Scenario: Circuit opens again after failed probe call
+    Given circuit breaker with failure rate threshold "0.5", window of "4" calls and open duration of "0.2" seconds
+    When "4" failed calls are recorded
+    And open duration elapses
+    And "1" failed calls are recorded
+    Then circuit breaker is "open"
+    And call is rejected
+
+  @good_case
+  Scenario: Half-open circuit lets through limited number of probe calls
+    Given circuit breaker with failure rate threshold "0.5", window of "4" calls and open duration of "0.2" seconds
+    When "4" failed calls are recorded
+    And open duration elapses
+    And "2" calls are in flight
+    Then circuit breaker is "half_open"
+    And call is rejected
+
+  @good_case
+  Scenario: Probe call failing with unexpected exception is recorded
+    Given circuit breaker with failure rate threshold "0.5", window of "4" calls and open duration of "0.2" seconds
+    And CRUD service whose Kubernetes Api calls fail with unexpected exception
+    When "4" failed calls are recorded
+    And open duration elapses
+    And Kubernetes Api call is made
+    Then circuit breaker is "open"
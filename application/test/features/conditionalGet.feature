@@ -0,0 +1,25 @@
+Feature: Conditional GET
+
+  @good_case
+  Scenario: Unchanged resource is not sent again
+    Given fake Kubernetes Api server is running on port "18180"
+    And flask application is started on port "5001" with environment
+      | name                | value |
+      | K8S_READ_COALESCING | True  |
+    When GET request is sent to "localhost:5001/pod/benchmark/default/"
+    Then status code is "200"
+    And response has header "ETag"
+    When GET request is sent to "/pod/benchmark/default/" with ETag of previous response
+    Then status code is "304"
+    And response has header "ETag"
+
+  @good_case
+  Scenario: Changed resource is sent again
+    Given fake Kubernetes Api server is running on port "18180"
+    And flask application is started on port "5001" with environment
+      | name                | value |
+      | K8S_READ_COALESCING | True  |
+    When GET request is sent to "localhost:5001/pod/benchmark/default/"
+    And fake Kubernetes Api server compacts resource versions
+    And GET request is sent to "/pod/benchmark/default/" with ETag of previous response
+    Then status code is "200"
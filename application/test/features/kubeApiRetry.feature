@@ -0,0 +1,48 @@
+Feature: Rate limiting and retries of Kubernetes Api calls
+
+  @good_case
+  Scenario: Throttled read is retried after Retry-After delay
+    Given fake Kubernetes Api server is running on port "18180"
+    And fake Kubernetes Api server fails next 2 requests with status 429 and Retry-After 1
+    And flask application is started on port "5001" with environment
+      | name                   | value |
+      | K8S_RETRY_MAX_ATTEMPTS | 3     |
+    When 1 GET requests are sent to "/pod/benchmark/default/" concurrently
+    Then all responses have status code "200"
+    And requests took at least "2" seconds
+    And fake Kubernetes Api server receives 3 GET requests of "/api/v1/namespaces/default/pods/benchmark"
+
+  @good_case
+  Scenario: Read failing with server error is retried
+    Given fake Kubernetes Api server is running on port "18180"
+    And fake Kubernetes Api server fails next 2 requests with status 503
+    And flask application is started on port "5001" with environment
+      | name                   | value |
+      | K8S_RETRY_MAX_ATTEMPTS | 3     |
+    When 1 GET requests are sent to "/pod/benchmark/default/" concurrently
+    Then all responses have status code "200"
+    And fake Kubernetes Api server receives 3 GET requests of "/api/v1/namespaces/default/pods/benchmark"
+
+  @good_case
+  Scenario: Read is not retried beyond max number of retries
+    Given fake Kubernetes Api server is running on port "18180"
+    And fake Kubernetes Api server fails next 5 requests with status 503
+    And flask application is started on port "5001" with environment
+      | name                   | value |
+      | K8S_RETRY_MAX_ATTEMPTS | 2     |
+    When 1 GET requests are sent to "/pod/benchmark/default/" concurrently
+    Then all responses have status code "503"
+    And fake Kubernetes Api server receives 3 GET requests of "/api/v1/namespaces/default/pods/benchmark"
+
+  @good_case
+  Scenario: Reads over client-side rate limit are delayed
+    Given fake Kubernetes Api server is running on port "18180"
+    And flask application is started on port "5001" with environment
+      | name                 | value |
+      | K8S_RATE_LIMIT_QPS   | 2     |
+      | K8S_RATE_LIMIT_BURST | 1     |
+      | K8S_READ_COALESCING  | False |
+    When 5 GET requests are sent to "/pod/benchmark/default/" concurrently
+    Then all responses have status code "200"
+    And requests took at least "1.5" seconds
+    And fake Kubernetes Api server receives 5 GET requests of "/api/v1/namespaces/default/pods/benchmark"
@@ -0,0 +1,23 @@
+Feature: Read coalescing
+
+  @good_case
+  Scenario: Concurrent identical reads share one Kubernetes Api call
+    Given fake Kubernetes Api server is running on port "18180"
+    And fake Kubernetes Api server responds with latency of "500" ms
+    And flask application is started on port "5001" with environment
+      | name                | value |
+      | K8S_READ_COALESCING | True  |
+    When 5 GET requests are sent to "/pod/benchmark/default/" concurrently
+    Then all responses have status code "200"
+    And fake Kubernetes Api server receives 1 GET requests of "/api/v1/namespaces/default/pods/benchmark"
+
+  @good_case
+  Scenario: Concurrent identical reads are not coalesced when coalescing is disabled
+    Given fake Kubernetes Api server is running on port "18180"
+    And fake Kubernetes Api server responds with latency of "500" ms
+    And flask application is started on port "5001" with environment
+      | name                | value |
+      | K8S_READ_COALESCING | False |
+    When 5 GET requests are sent to "/pod/benchmark/default/" concurrently
+    Then all responses have status code "200"
+    And fake Kubernetes Api server receives 5 GET requests of "/api/v1/namespaces/default/pods/benchmark"
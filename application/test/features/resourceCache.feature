@@ -0,0 +1,39 @@
+Feature: Resource cache
+
+  @good_case
+  Scenario: Resource cache relists after watched resource version expires
+    Given fake Kubernetes Api server is running on port "18180"
+    And flask application is started on port "5001" with environment
+      | name                             | value |
+      | K8S_RESOURCE_CACHE               | True  |
+      | K8S_RESOURCE_CACHE_WATCH_TIMEOUT | 1     |
+    When GET request is sent to "localhost:5001/diagnostics/resource_cache"
+    Then fake Kubernetes Api server receives 1 GET requests of "/api/v1/pods"
+    When fake Kubernetes Api server compacts resource versions
+    Then fake Kubernetes Api server receives 2 GET requests of "/api/v1/pods"
+
+  @good_case
+  Scenario: Cached list of missing namespace is empty like list of Api server
+    Given fake Kubernetes Api server is running on port "18180"
+    And flask application is started on port "5001" with environment
+      | name               | value |
+      | K8S_RESOURCE_CACHE | True  |
+    When resource cache is synced
+    And GET request is sent to "localhost:5001/list_resources/default/pod"
+    Then status code is "200"
+    And response lists 10 resources
+    When GET request is sent to "localhost:5001/list_resources/missing/pod"
+    Then status code is "200"
+    And response lists 0 resources
+    And fake Kubernetes Api server receives 0 GET requests of "/api/v1/namespaces/default/pods"
+    And fake Kubernetes Api server receives 0 GET requests of "/api/v1/namespaces/missing/pods"
+
+  @good_case
+  Scenario: Uncached list of missing namespace is empty
+    Given fake Kubernetes Api server is running on port "18180"
+    And flask application is started on port "5001" with environment
+      | name               | value |
+      | K8S_RESOURCE_CACHE | False |
+    When GET request is sent to "localhost:5001/list_resources/missing/pod"
+    Then status code is "200"
+    And response lists 0 resources
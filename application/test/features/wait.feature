@@ -0,0 +1,24 @@
+Feature: Waits for resource conditions
+
+  @good_case
+  Scenario: Waits over limit are rejected
+    Given fake Kubernetes Api server is running on port "18180"
+    And flask application is started on port "5001" with environment
+      | name                    | value |
+      | K8S_WAIT_MAX_CONCURRENT | 1     |
+    When GET request is sent to "/namespace/default/wait?timeout=5" in background
+    Then fake Kubernetes Api server receives 1 GET requests of "/api/v1/namespaces/default"
+    When GET request is sent to "localhost:5001/namespace/namespace-1/wait?timeout=5"
+    Then status code is "503"
+    And response has header "Retry-After"
+
+  @good_case
+  Scenario: Wait continues on new watch after watched resource version expires
+    Given fake Kubernetes Api server is running on port "18180"
+    And flask application is started on port "5001" with environment
+      | name              | value |
+      | K8S_WATCH_TIMEOUT | 1     |
+    When GET request is sent to "/namespace/default/wait?timeout=10" in background
+    Then fake Kubernetes Api server receives 1 GET requests of "/api/v1/namespaces/default"
+    When fake Kubernetes Api server compacts resource versions
+    Then fake Kubernetes Api server receives 2 GET requests of "/api/v1/namespaces/default"
@@ -0,0 +1,35 @@
+Feature: Watch streams
+
+  @good_case
+  Scenario: Watch stream reports expired resource version
+    Given fake Kubernetes Api server is running on port "18180"
+    And flask application is started on port "5001" with environment
+      | name              | value |
+      | K8S_WATCH_TIMEOUT | 1     |
+    When watch stream of "/watch/default/pod" is opened
+    Then watch stream receives BOOKMARK event
+    When fake Kubernetes Api server compacts resource versions
+    Then watch stream receives ERROR event with code 410
+
+  @good_case
+  Scenario: Watch streams over limit are rejected
+    Given fake Kubernetes Api server is running on port "18180"
+    And flask application is started on port "5001" with environment
+      | name                  | value |
+      | K8S_WATCH_MAX_STREAMS | 1     |
+    When watch stream of "/watch/default/pod" is opened
+    Then watch stream receives BOOKMARK event
+    When GET request is sent to "localhost:5001/watch/default/service"
+    Then status code is "503"
+    And response has header "Retry-After"
+
+  @good_case
+  Scenario: Watch stream relays changes of watched resources
+    Given fake Kubernetes Api server is running on port "18180"
+    And fake Kubernetes Api server sends watch events every "100" ms
+    And flask application is started on port "5001" with environment
+      | name              | value |
+      | K8S_WATCH_TIMEOUT | 1     |
+    When watch stream of "/watch/default/pod" is opened
+    Then watch stream receives BOOKMARK event
+    And watch stream receives MODIFIED event
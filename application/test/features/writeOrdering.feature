@@ -0,0 +1,21 @@
+Feature: Ordering of queued writes
+
+  @good_case
+  Scenario: Queued writes of one namespace reach Kubernetes Api in order they were received
+    Given fake Kubernetes Api server is running on port "18180"
+    And fake Kubernetes Api server responds with latency of "20" ms
+    And flask application is started on port "5001" with environment
+      | name              | value |
+      | K8S_WRITE_WORKERS | 4     |
+    When 10 pods are created in namespace "default" with respond-async preference
+    Then fake Kubernetes Api server receives creates of pods in order of requests to "/api/v1/namespaces/default/pods"
+
+  @good_case
+  Scenario: Queued writes of one namespace keep their order across Gunicorn workers
+    Given fake Kubernetes Api server is running on port "18180"
+    And fake Kubernetes Api server responds with latency of "20" ms
+    And gunicorn application is started on port "5001" with 4 workers and environment
+      | name              | value |
+      | K8S_WRITE_WORKERS | 4     |
+    When 20 pods are created in namespace "default" with respond-async preference
+    Then fake Kubernetes Api server receives creates of pods in order of requests to "/api/v1/namespaces/default/pods"
@@ -0,0 +1,19 @@
+Feature: Write pipeline
+
+  @good_case
+  Scenario: Operations of the same namespace run in submission order
+    Given write pipeline with "4" workers
+    When "10" operations are submitted for each of namespaces
+      | namespace |
+      | first     |
+      | second    |
+      | third     |
+    Then operations of each namespace run one after another in submission order
+    And operations of different namespaces run concurrently
+
+  @good_case
+  Scenario: Operations queued when workers shut down are failed
+    Given write pipeline with "1" workers
+    When blocked operation and "3" operations are submitted for namespace "default"
+    And write pipeline workers are shut down
+    Then operations have status "failed" and code "503"
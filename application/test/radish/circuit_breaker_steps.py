@@ -0,0 +1,79 @@
+from radish import given, when, then, world
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src'))
+from services.circuit_breaker import CircuitBreaker  # noqa: E402
+
+SLOW_CALL_DURATION_SECONDS = 10
+HALF_OPEN_CALLS = 2
+
+
+class FailingCoreV1Api:
+    """ CoreV1Api whose operations fail before any response is received """
+
+    def __getattr__(self, name):
+        def operation(*args, **kwargs):
+            raise ValueError(f'{name} failed.')
+        return operation
+
+
+@given('circuit breaker with failure rate threshold {threshold:QuotedString}, window of {window_size:QuotedString} '
+       'calls and open duration of {open_duration:QuotedString} seconds')
+def create_circuit_breaker(step, threshold, window_size, open_duration):
+    world.config.user_data['open_duration'] = float(open_duration)
+    world.config.user_data['circuit_breaker'] = CircuitBreaker(
+        float(threshold), SLOW_CALL_DURATION_SECONDS, int(window_size), int(window_size), float(open_duration),
+        HALF_OPEN_CALLS
+    )
+
+
+@when('{count:QuotedString} {outcome:w} calls are recorded')
+def record_calls(step, count, outcome):
+    # Calls are recorded the way CRUDService does, only after circuit breaker allowed them.
+    circuit_breaker = world.config.user_data['circuit_breaker']
+    for _ in range(int(count)):
+        assert circuit_breaker.allow(), 'Call was rejected.'
+        circuit_breaker.record(outcome == 'failed', 0)
+
+
+@when('{count:QuotedString} calls are in flight')
+def start_calls(step, count):
+    circuit_breaker = world.config.user_data['circuit_breaker']
+    for _ in range(int(count)):
+        assert circuit_breaker.allow(), 'Call was rejected.'
+
+
+@when('open duration elapses')
+def wait_for_open_duration(step):
+    time.sleep(world.config.user_data['open_duration'])
+
+
+@then('circuit breaker is {state:QuotedString}')
+def check_state(step, state):
+    actual = world.config.user_data['circuit_breaker'].get_state().value
+    assert actual == state, f"Actual state: '{actual}'.\n Expected state: '{state}'"
+
+
+@then('call is rejected')
+def check_call_rejected(step):
+    assert not world.config.user_data['circuit_breaker'].allow(), 'Call was allowed.'
+
+
+@given('CRUD service whose Kubernetes Api calls fail with unexpected exception')
+def create_failing_crud_service(step):
+    # Service runs in radish process, its client and circuit breaker are replaced for the scenario.
+    from services.crud_service import CRUDService
+    crud_service = CRUDService.get_instance()
+    crud_service._core_v1_api = FailingCoreV1Api()
+    crud_service._circuit_breaker = world.config.user_data['circuit_breaker']
+    world.config.user_data['crud_service'] = crud_service
+
+
+@when('Kubernetes Api call is made')
+def make_kube_api_call(step):
+    try:
+        world.config.user_data['crud_service'].call_kube_api('read_namespace', 'default')
+    except ValueError:
+        pass
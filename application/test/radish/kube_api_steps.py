@@ -0,0 +1,262 @@
+from radish import given, when, then, world
+import subprocess
+import os
+import sys
+import tempfile
+import threading
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from retry import retry
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmark'))
+from fake_kube_api_server import FakeKubeApiServerConfig, create_fake_kube_api_server  # noqa: E402
+from run_benchmark import KUBECONFIG_TEMPLATE, POD_MANIFEST  # noqa: E402
+
+REQUEST_COUNT_TIMEOUT_SECONDS = 15
+BACKGROUND_REQUEST_TIMEOUT_SECONDS = 30
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src')
+
+
+@retry(requests.ConnectionError, tries=20, delay=0.5)
+def wait_for_app(url):
+    """
+    Wait until app accepts connections
+    :param url: URL
+    """
+    requests.get(url)
+
+
+@given('fake Kubernetes Api server is running on port {port:QuotedString}')
+def start_fake_kube_api_server(step, port):
+    # Fake server runs in radish process, so steps can change its state and inspect received requests.
+    config = FakeKubeApiServerConfig(items=10, containers=1, padding_bytes=0, latency_ms=0)
+    server = create_fake_kube_api_server(int(port), config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    with tempfile.NamedTemporaryFile('w', suffix='.yaml', delete=False) as kubeconfig:
+        kubeconfig.write(KUBECONFIG_TEMPLATE.format(port=port))
+    world.config.user_data['api_server'] = server
+    world.config.user_data['api_server_config'] = config
+    world.config.user_data['kubeconfig'] = kubeconfig.name
+
+
+def get_app_environment(step):
+    # Environment variables are taken from step table with name and value columns.
+    env = dict(os.environ, FLASK_APP='../src/main.py', K8S_ENVIRONMENT='False',
+               KUBECONFIG=world.config.user_data['kubeconfig'])
+    env.update({row['name']: row['value'] for row in step.table})
+    return env
+
+
+@given('flask application is started on port {port:QuotedString} with environment')
+def start_app_with_environment(step, port):
+    env = get_app_environment(step)
+    world.config.user_data["host"] = "localhost"
+    world.config.user_data["port"] = port
+    world.config.user_data['process'] = \
+        subprocess.Popen(
+            ["flask", "run", "--port", port, "--with-threads"],
+            shell=False,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL)
+    wait_for_app(f"http://localhost:{port}/swagger.json")
+
+
+@given('gunicorn application is started on port {port:QuotedString} with {workers:d} workers and environment')
+def start_gunicorn_app_with_environment(step, port, workers):
+    # Workers share operations directory like containers of the Helm chart do.
+    operations_dir = world.config.user_data['operations_dir'] = tempfile.mkdtemp()
+    env = dict(get_app_environment(step), GUNICORN_PORT=port, GUNICORN_WORKERS=str(workers),
+               K8S_WRITE_OPERATIONS_DIR=operations_dir)
+    world.config.user_data["host"] = "localhost"
+    world.config.user_data["port"] = port
+    world.config.user_data['process'] = subprocess.Popen(
+        ['gunicorn', '--config', 'gunicorn_config.py', 'main:app'],
+        cwd=SRC_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    wait_for_app(f"http://localhost:{port}/swagger.json")
+
+
+@when('resource cache is synced')
+def wait_for_resource_cache(step):
+    deadline = time.monotonic() + REQUEST_COUNT_TIMEOUT_SECONDS
+    url = f"http://localhost:{world.config.user_data['port']}/diagnostics/resource_cache"
+    while time.monotonic() < deadline:
+        informers = requests.get(url).json()['informers']
+        if informers and all(informer['synced'] for informer in informers):
+            return
+        time.sleep(0.1)
+    raise AssertionError('Resource cache was not synced.')
+
+
+@given('fake Kubernetes Api server sends watch events every {interval:QuotedString} ms')
+def set_watch_event_interval(step, interval):
+    world.config.user_data['api_server_config'].watch_event_interval = float(interval) / 1000
+
+
+@when('fake Kubernetes Api server compacts resource versions')
+def compact_resource_versions(step):
+    world.config.user_data['api_server_config'].compact()
+
+
+@then('fake Kubernetes Api server receives {count:d} {method:w} requests of {path:QuotedString}')
+def check_request_count(step, count, method, path):
+    # Requests are sent by background threads of the app, so expected count is awaited.
+    config = world.config.user_data['api_server_config']
+    deadline = time.monotonic() + REQUEST_COUNT_TIMEOUT_SECONDS
+    while config.get_request_count(method, path) < count and time.monotonic() < deadline:
+        time.sleep(0.1)
+    actual = config.get_request_count(method, path)
+    assert actual == count, f"Actual {method} requests of '{path}': {actual}.\n Expected: {count}"
+
+
+@then('response lists {count:d} resources')
+def check_listed_resources(step, count):
+    resources = step.context.response.json()['resources']
+    assert len(resources) == count, f"Actual resources: {resources}"
+
+
+@given('fake Kubernetes Api server responds with latency of {latency:QuotedString} ms')
+def set_latency(step, latency):
+    world.config.user_data['api_server_config'].latency = float(latency) / 1000
+
+
+@given('fake Kubernetes Api server fails next {count:d} requests with status {status:d}')
+def fail_requests(step, count, status):
+    world.config.user_data['api_server_config'].fail_requests(count, status)
+
+
+@given('fake Kubernetes Api server fails next {count:d} requests with status {status:d} and Retry-After {seconds:d}')
+def fail_requests_with_retry_after(step, count, status, seconds):
+    world.config.user_data['api_server_config'].fail_requests(count, status, seconds)
+
+
+@when('{count:d} GET requests are sent to {path:QuotedString} concurrently')
+def send_concurrent_requests(step, count, path):
+    url = f"http://localhost:{world.config.user_data['port']}{path}"
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        step.context.responses = list(executor.map(lambda _: requests.get(url), range(count)))
+    step.context.elapsed = time.monotonic() - start
+
+
+@then('all responses have status code {status_code:QuotedString}')
+def check_status_codes(step, status_code):
+    actual = [response.status_code for response in step.context.responses]
+    assert all(code == int(status_code) for code in actual), f"Actual status codes: {actual}"
+
+
+@then('requests took at least {seconds:QuotedString} seconds')
+def check_elapsed(step, seconds):
+    assert step.context.elapsed >= float(seconds), f"Requests took {step.context.elapsed:.2f} seconds"
+
+
+@when('GET request is sent to {path:QuotedString} with ETag of previous response')
+def send_conditional_request(step, path):
+    etag = step.context.response.headers['ETag']
+    step.context.response = requests.get(
+        f"http://localhost:{world.config.user_data['port']}{path}", headers={'If-None-Match': etag}
+    )
+
+
+@when('{count:d} pods are created in namespace {namespace:QuotedString} with respond-async preference')
+def create_pods_async(step, count, namespace):
+    names = world.config.user_data['created_names'] = [f'ordered-{i}' for i in range(count)]
+    for name in names:
+        step.context.response = requests.post(
+            f"http://localhost:{world.config.user_data['port']}/pod/{name}/{namespace}/",
+            json=POD_MANIFEST, headers={'Prefer': 'respond-async'}
+        )
+        assert step.context.response.status_code == 202, f"Actual status code: {step.context.response.status_code}"
+
+
+@then('fake Kubernetes Api server receives creates of pods in order of requests to {path:QuotedString}')
+def check_create_order(step, path):
+    config = world.config.user_data['api_server_config']
+    expected = world.config.user_data['created_names']
+    deadline = time.monotonic() + REQUEST_COUNT_TIMEOUT_SECONDS
+    while len(config.get_written_names('POST', path)) < len(expected) and time.monotonic() < deadline:
+        time.sleep(0.1)
+    actual = config.get_written_names('POST', path)
+    assert actual == expected, f"Actual order: {actual}.\n Expected order: {expected}"
+
+
+def start_background_thread(target):
+    """
+    Start thread joined by cleanup at the end of scenario
+    :param target: Function run by thread
+    """
+    thread = threading.Thread(target=target, daemon=True)
+    world.config.user_data.setdefault('background_threads', []).append(thread)
+    thread.start()
+
+
+@when('watch stream of {path:QuotedString} is opened')
+def open_watch_stream(step, path):
+    # Server-sent events are collected in background until the stream ends.
+    events = world.config.user_data['watch_events'] = []
+    response = requests.get(f"http://localhost:{world.config.user_data['port']}{path}", stream=True)
+    step.context.response = response
+    # Stream is closed by cleanup at the end of scenario, which also ends the reading thread.
+    world.config.user_data.setdefault('streams', []).append(response)
+
+    def read_events():
+        event_type = None
+        try:
+            for line in response.iter_lines(chunk_size=1, decode_unicode=True):
+                if line.startswith('event: '):
+                    event_type = line[len('event: '):]
+                elif line.startswith('data: '):
+                    events.append((event_type, json.loads(line[len('data: '):])))
+        except (requests.RequestException, OSError, ValueError):
+            # Stream was closed or app stopped while event was read.
+            pass
+
+    start_background_thread(read_events)
+
+
+def wait_for_watch_event(matches):
+    """
+    Wait for event received by watch stream
+    :param matches: Function called with event type and payload
+    """
+    deadline = time.monotonic() + REQUEST_COUNT_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if any(matches(event_type, payload) for event_type, payload in world.config.user_data['watch_events']):
+            return
+        time.sleep(0.1)
+    raise AssertionError(f"Received events: {world.config.user_data['watch_events']}")
+
+
+@then('watch stream receives {event_type:w} event')
+def check_watch_event(step, event_type):
+    wait_for_watch_event(lambda received_type, payload: received_type == event_type)
+
+
+@then('watch stream receives {event_type:w} event with code {code:d}')
+def check_watch_event_code(step, event_type, code):
+    wait_for_watch_event(
+        lambda received_type, payload: received_type == event_type and payload['object'].get('code') == code
+    )
+
+
+@then('response has header {name:QuotedString}')
+def check_response_header(step, name):
+    assert name in step.context.response.headers, f"Actual headers: {step.context.response.headers}"
+
+
+@when('GET request is sent to {path:QuotedString} in background')
+def send_background_request(step, path):
+    # Long-lived request, e.g. wait, is left running while following steps are executed.
+    url = f"http://localhost:{world.config.user_data['port']}{path}"
+
+    def send_request():
+        try:
+            requests.get(url, timeout=BACKGROUND_REQUEST_TIMEOUT_SECONDS)
+        except requests.RequestException:
+            # App is stopped by cleanup at the end of scenario while request may still wait.
+            pass
+
+    start_background_thread(send_request)
@@ -10,8 +10,12 @@ def wait_for_proper_proc_exist_status(proc):
     """
     Wait for proper process exit status code
     :param proc: Process
+    :return: Exit status code
     """
-    assert proc.poll() != 0, "Application process is still running"
+    # poll returns None while process runs, which must not pass as non-zero status.
+    exit_status = proc.poll()
+    assert exit_status is not None, "Application process is still running"
+    return exit_status
 
 
 @retry(requests.ConnectionError, tries=10, delay=2)
@@ -51,7 +55,8 @@ def check_status_code(step, status_code):
 
 @when('flask application finishes with non-zero exit status')
 def check_exit_status(step):
-    wait_for_proper_proc_exist_status(world.config.user_data['process'])
+    exit_status = wait_for_proper_proc_exist_status(world.config.user_data['process'])
+    assert exit_status != 0, "Application process finished with zero exit status"
 
 
 @then('{error_message:QuotedString} is logged')
@@ -1,13 +1,41 @@
 import logging
+import os
+import shutil
+import subprocess
 
 from radish import after, world
 
+BACKGROUND_THREAD_JOIN_TIMEOUT_SECONDS = 10
+
 
 @after.each_scenario()
 def cleanup(scenario):
-    """ Kill flask app process """
+    """ Close watch streams, stop app process and fake Kubernetes Api server and join background threads """
+    for response in world.config.user_data.pop('streams', []):
+        response.close()
     try:
-        world.config.user_data['process'].kill()
-        world.config.user_data['process'].communicate()
+        # Gunicorn master stops its workers on SIGTERM, killed master would leave them running.
+        world.config.user_data['process'].terminate()
+        try:
+            world.config.user_data['process'].communicate(timeout=10)
+        except subprocess.TimeoutExpired:
+            world.config.user_data['process'].kill()
+            world.config.user_data['process'].communicate()
     except ProcessLookupError as e:
         logging.warning(e)
+    except KeyError:
+        pass
+    api_server = world.config.user_data.pop('api_server', None)
+    if api_server is not None:
+        api_server.shutdown()
+        api_server.server_close()
+        os.unlink(world.config.user_data.pop('kubeconfig'))
+    world.config.user_data.pop('process', None)
+    operations_dir = world.config.user_data.pop('operations_dir', None)
+    if operations_dir is not None:
+        shutil.rmtree(operations_dir, ignore_errors=True)
+    # Requests of stopped app end right away, so threads do not outlive the scenario.
+    for thread in world.config.user_data.pop('background_threads', []):
+        thread.join(BACKGROUND_THREAD_JOIN_TIMEOUT_SECONDS)
+        if thread.is_alive():
+            logging.warning(f'Background thread {thread.name} did not finish.')
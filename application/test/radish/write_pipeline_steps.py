@@ -0,0 +1,105 @@
+from radish import given, when, then, world
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src'))
+from services.write_pipeline import OperationStore, WritePipeline  # noqa: E402
+
+OPERATION_TIMEOUT_SECONDS = 10
+OPERATION_RETENTION_SECONDS = 60
+
+
+def create_operation(events, key, index):
+    # Operation records its start and finish, random duration makes out of order runs likely if keys are not ordered.
+    # World is local to radish thread, so state is passed to workers explicitly.
+    def operation():
+        events.append(('started', key, index))
+        time.sleep(random.uniform(0.01, 0.05))
+        events.append(('finished', key, index))
+        return 200, 'OK'
+    return operation
+
+
+def create_blocked_operation(release):
+    def operation():
+        release.wait(OPERATION_TIMEOUT_SECONDS)
+        return 200, 'OK'
+    return operation
+
+
+def wait_for_operations():
+    write_pipeline = world.config.user_data['write_pipeline']
+    deadline = time.monotonic() + OPERATION_TIMEOUT_SECONDS
+    while write_pipeline.get_statistics()['pending_operations'] and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not write_pipeline.get_statistics()['pending_operations'], 'Operations did not finish in time.'
+
+
+@given('write pipeline with {max_workers:QuotedString} workers')
+def create_write_pipeline(step, max_workers):
+    world.config.user_data['events'] = []
+    world.config.user_data['release'] = threading.Event()
+    world.config.user_data['operations'] = []
+    world.config.user_data['write_pipeline'] = WritePipeline(
+        int(max_workers), 1000, OperationStore(OPERATION_RETENTION_SECONDS)
+    )
+
+
+@when('{count:QuotedString} operations are submitted for each of namespaces')
+def submit_operations(step, count):
+    write_pipeline = world.config.user_data['write_pipeline']
+    events = world.config.user_data['events']
+    world.config.user_data['keys'] = [row['namespace'] for row in step.table]
+    # Keys are interleaved, so operations of different namespaces compete for workers.
+    for index in range(int(count)):
+        for key in world.config.user_data['keys']:
+            operation = write_pipeline.submit(key, create_operation(events, key, index), {'namespace': key})
+            world.config.user_data['operations'].append(operation)
+    wait_for_operations()
+
+
+@when('blocked operation and {count:QuotedString} operations are submitted for namespace {key:QuotedString}')
+def submit_blocked_operations(step, count, key):
+    write_pipeline = world.config.user_data['write_pipeline']
+    events = world.config.user_data['events']
+    write_pipeline.submit(key, create_blocked_operation(world.config.user_data['release']), {'namespace': key})
+    for index in range(int(count)):
+        operation = write_pipeline.submit(key, create_operation(events, key, index), {'namespace': key})
+        world.config.user_data['operations'].append(operation)
+
+
+@when('write pipeline workers are shut down')
+def shut_down_workers(step):
+    world.config.user_data['write_pipeline']._executor.shutdown(wait=False)
+    world.config.user_data['release'].set()
+    wait_for_operations()
+
+
+@then('operations of each namespace run one after another in submission order')
+def check_order(step):
+    events = world.config.user_data['events']
+    for key in world.config.user_data['keys']:
+        key_events = [(event, index) for event, event_key, index in events if event_key == key]
+        expected = [(event, index) for index in range(len(key_events) // 2) for event in ('started', 'finished')]
+        assert key_events == expected, f"Actual events of '{key}': {key_events}"
+
+
+@then('operations of different namespaces run concurrently')
+def check_concurrency(step):
+    running = max_running = 0
+    for event, _, _ in world.config.user_data['events']:
+        running += 1 if event == 'started' else -1
+        max_running = max(max_running, running)
+    assert max_running > 1, 'Operations never ran concurrently.'
+
+
+@then('operations have status {status:QuotedString} and code {code:QuotedString}')
+def check_operations(step, status, code):
+    write_pipeline = world.config.user_data['write_pipeline']
+    for operation in world.config.user_data['operations']:
+        stored_operation = write_pipeline.get_operation(operation['id'])
+        assert stored_operation['status'] == status and stored_operation['code'] == int(code), \
+            f'Actual operation: {stored_operation}'